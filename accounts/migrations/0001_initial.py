@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:57
+
+import accounts.models
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('first_name', models.CharField(max_length=15)),
+                ('last_name', models.CharField(max_length=15)),
+                ('username', models.CharField(blank=True, max_length=150, null=True)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('verified', models.BooleanField(blank=True, default=False, null=True)),
+                ('role', models.CharField(choices=[('regular_user', 'Regular User'), ('investigator', 'Investigator'), ('analyst', 'Analyst'), ('custodian', 'Custodian'), ('auditor', 'Auditor')], default='investigator', max_length=20)),
+                ('profile_picture', models.ImageField(blank=True, null=True, upload_to='profile_pics/')),
+                ('phone_number', models.CharField(blank=True, help_text='Optional contact number for account recovery or alerts', max_length=20, null=True)),
+                ('two_factor_secret', models.CharField(blank=True, max_length=16, null=True)),
+                ('two_factor_enabled', models.BooleanField(default=False)),
+                ('recovery_codes', models.TextField(blank=True, null=True)),
+                ('recovery_codes_downloaded', models.BooleanField(blank=True, default=False, null=True)),
+                ('failed_login_attempts', models.IntegerField(default=0)),
+                ('last_failed_login', models.DateTimeField(blank=True, null=True)),
+                ('groups', models.ManyToManyField(blank=True, related_name='custom_user_groups', to='auth.group')),
+                ('user_permissions', models.ManyToManyField(blank=True, related_name='custom_user_permissions', to='auth.permission')),
+            ],
+            options={
+                'verbose_name': 'user',
+                'verbose_name_plural': 'users',
+                'abstract': False,
+            },
+            managers=[
+                ('objects', accounts.models.UserProfileManager()),
+            ],
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
 from cases.permissions import role_required
 from cases.models import Case, CaseAuditLog
+from evidence.forms import EvidenceFilterForm
 from evidence.models import Evidence, EvidenceAuditLog
 from custody.models import CustodyLog, EvidenceStorage
 from django.db.models import Count
@@ -35,7 +36,7 @@ def auditor_dashboard(request):
         'valid_evidence': valid_evidence,
         'invalid_evidence': invalid_evidence,
         'recent_audit_logs': recent_audit_logs,
-        'recent_cases': recent_cases,
+        'recent_cases': Case.decrypt_many(recent_cases),
     }
     return render(request, 'auditor/dashboard.html', context)
 
@@ -121,14 +122,15 @@ def case_audit_logs(request, case_id):
 def chain_of_custody_report(request):
     """Chain of custody report - shows custody chain for all evidence"""
     # Get all evidence with their custody logs
-    evidence_list = Evidence.objects.select_related(
+    filter_form = EvidenceFilterForm(request.GET)
+    evidence_list = filter_form.filter(Evidence.objects.select_related(
         'case', 'uploaded_by'
     ).prefetch_related(
         'custody_logs__user',
         'custody_logs__from_location',
         'custody_logs__to_location',
         'storage'
-    ).order_by('-date_uploaded')
+    ))
     
     # Calculate statistics
     total_evidence = evidence_list.count()
@@ -137,6 +139,7 @@ def chain_of_custody_report(request):
     
     context = {
         'evidence_list': evidence_list,
+        'filter_form': filter_form,
         'total_evidence': total_evidence,
         'evidence_with_valid_metadata': evidence_with_valid_metadata,
         'evidence_with_issues': evidence_with_issues,
@@ -149,22 +152,30 @@ def chain_of_custody_report(request):
 def evidence_integrity_check(request):
     """Integrity check view - shows evidence integrity status"""
     # Get all evidence with integrity information
-    evidence_list = Evidence.objects.select_related(
-        'case', 'uploaded_by'
-    ).order_by('-date_uploaded')
+    filter_form = EvidenceFilterForm(request.GET)
+    evidence_list = filter_form.filter(Evidence.objects.select_related(
+        'case', 'uploaded_by', 'blob'
+    ))
     
     # Count by status
-    valid_evidence = evidence_list.filter(metadata_valid=True).count()
+    valid_evidence = evidence_list.filter(
+        metadata_valid=True, metadata_status='complete'
+    ).count()
     invalid_evidence = evidence_list.filter(metadata_valid=False).count()
     pending_verification = evidence_list.filter(
-        metadata_valid__isnull=True
+        metadata_status='pending'
+    ).count()
+    fixity_failures = evidence_list.filter(
+        blob__fixity_status__in=['mismatch', 'missing']
     ).count()
     
     context = {
         'evidence_list': evidence_list,
+        'filter_form': filter_form,
         'valid_evidence': valid_evidence,
         'invalid_evidence': invalid_evidence,
         'pending_verification': pending_verification,
+        'fixity_failures': fixity_failures,
         'total_evidence': evidence_list.count(),
     }
     return render(request, 'auditor/integrity_check.html', context)
@@ -1,29 +1,72 @@
+from django import forms
 from django.contrib import admin
-from .models import Case, EncryptionKey, AssignmentRequest, CaseAuditLog
+from .models import Case, CaseTitleToken, EncryptionKey, AssignmentRequest, CaseAuditLog
+
+
+class CaseBlindIndexSearchMixin:
+    """Admin search that also matches case titles and categories by blind index.
+
+    ``case_lookup`` is the path from the admin's model to its case. Encrypted
+    columns must stay out of ``search_fields``; matching them would only
+    compare ciphertext.
+    """
+
+    case_lookup = "case"
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            cases = Case.search_title(search_term) | Case.in_category(search_term.strip())
+            results |= queryset.filter(**{f"{self.case_lookup}__in": cases.values("pk")})
+        return results, may_have_duplicates
+
+
+class CaseAdminForm(forms.ModelForm):
+    """Edits encrypted fields as plaintext; posting ciphertext back would encrypt it twice."""
+
+    class Meta:
+        model = Case
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            for name in Case.ENCRYPTED_FIELDS:
+                if name in self.fields:
+                    self.initial[name] = self.instance.decrypted(name)
 
 
 @admin.register(Case)
-class CaseAdmin(admin.ModelAdmin):
+class CaseAdmin(CaseBlindIndexSearchMixin, admin.ModelAdmin):
+    form = CaseAdminForm
+    case_lookup = "pk"
     list_display = ['id', 'get_title', 'case_status', 'case_priority', 'date_created', 'created_by']
     list_filter = ['case_status', 'case_priority', 'date_created']
-    search_fields = ['case_title', 'case_description', 'created_by__username']
+    search_fields = ['case_id', 'created_by__username']
     readonly_fields = ['date_created', 'last_modified']
 
 
 @admin.register(EncryptionKey)
 class EncryptionKeyAdmin(admin.ModelAdmin):
-    list_display = ['id', 'case', 'created_at']
+    list_display = ['id', 'case', 'master_key_id', 'created_at']
+    list_filter = ['master_key_id']
     readonly_fields = ['created_at']
 
 
 @admin.register(AssignmentRequest)
-class AssignmentRequestAdmin(admin.ModelAdmin):
+class AssignmentRequestAdmin(CaseBlindIndexSearchMixin, admin.ModelAdmin):
     list_display = ['id', 'case', 'requested_by', 'request_type', 'status', 'created_at']
     list_filter = ['request_type', 'status', 'created_at']
-    search_fields = ['case__case_title', 'requested_by__username']
+    search_fields = ['case__case_id', 'requested_by__username']
     readonly_fields = ['created_at', 'approved_at']
 
 
+@admin.register(CaseTitleToken)
+class CaseTitleTokenAdmin(admin.ModelAdmin):
+    list_display = ['id', 'case', 'token']
+    search_fields = ['token']
+
+
 @admin.register(CaseAuditLog)
 class CaseAuditLogAdmin(admin.ModelAdmin):
     list_display = ['id', 'case', 'user', 'action', 'timestamp']
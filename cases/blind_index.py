@@ -0,0 +1,46 @@
+"""HMAC blind indexes, so encrypted case fields can be matched without decrypting them.
+
+A blind index is a keyed hash of a normalized plaintext. Equal plaintexts give
+equal digests, which is what makes them searchable; it also means the database
+reveals which cases share a category or a title word, though not what it is.
+Each field hashes under its own label, so a category digest never equals a
+title-token digest for the same text.
+"""
+
+import hashlib
+import hmac
+import re
+import unicodedata
+
+from django.conf import settings
+
+DIGEST_LENGTH = 32  # hex characters, i.e. 128 bits
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _key():
+    # Derived from SECRET_KEY unless set explicitly; either way, changing it
+    # means running ``backfill_case_blind_index --rebuild``.
+    key = settings.CASE_BLIND_INDEX_KEY or settings.SECRET_KEY
+    return hashlib.sha256(b"case-blind-index:" + key.encode()).digest()
+
+
+def normalize(text):
+    return unicodedata.normalize("NFKC", text).casefold().strip()
+
+
+def digest(label, value):
+    message = f"{label}\x00{value}".encode()
+    return hmac.new(_key(), message, hashlib.sha256).hexdigest()[:DIGEST_LENGTH]
+
+
+def category_digest(category):
+    """Exact-match digest of a category; empty for no category."""
+    return digest("case_category", category) if category else ""
+
+
+def title_tokens(title):
+    """Digests of the distinct normalized words in ``title``."""
+    words = set(TOKEN_PATTERN.findall(normalize(title or "")))
+    return {digest("case_title", word) for word in words}
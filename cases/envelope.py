@@ -0,0 +1,151 @@
+"""Envelope encryption for per-case data keys.
+
+Data keys are stored wrapped (RFC 3394 AES key wrap) by a master key that
+lives outside the database, so a copy of the database alone decrypts nothing.
+Rotating the master key re-wraps the data keys; data encrypted under them is
+untouched.
+
+Master keys come from ``ENCRYPTION_MASTER_KEY_FILE``: one ``<id> <base64 key>``
+per line, the last line being the key new data keys are wrapped with.
+``ENCRYPTION_MASTER_KEY`` is a stand-in for environments without a key file,
+holding comma-separated ``<id>:<base64 key>`` entries in the same order. With
+neither set, a development key derived from ``SECRET_KEY`` is used, but only
+if ``ENCRYPTION_ALLOW_DEVELOPMENT_KEY`` is on (the default under ``DEBUG``;
+the test runner turns it on); otherwise using a data key raises ``ImproperlyConfigured``. Once a
+master key is configured the development key is no longer accepted;
+``rotate_master_key --development-key`` moves keys created under it onto the
+configured master key.
+"""
+
+import base64
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from cryptography.hazmat.primitives.keywrap import aes_key_unwrap, aes_key_wrap
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEVELOPMENT_KEY_ID = "secret-key"
+
+
+def development_key(secret_key=None):
+    secret_key = settings.SECRET_KEY if secret_key is None else secret_key
+    return hashlib.sha256(b"case-master-key:" + secret_key.encode()).digest()
+
+
+@functools.lru_cache(maxsize=4)
+def _read_keyring(path, modified, env, secret_key):
+    entries = []
+    if path:
+        with open(path) as key_file:
+            for line in key_file:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    entries.append(line.split(None, 1))
+    elif env:
+        entries = [entry.strip().split(":", 1) for entry in env.split(",") if entry.strip()]
+    else:
+        return {DEVELOPMENT_KEY_ID: development_key(secret_key)}
+
+    keyring = {}
+    for entry in entries:
+        if len(entry) != 2:
+            raise ImproperlyConfigured("Master key entries must be a key ID followed by a base64 key")
+        key = base64.b64decode(entry[1])
+        if len(key) != 32:
+            raise ImproperlyConfigured(f"Master key {entry[0]!r} is not 32 bytes")
+        keyring[entry[0]] = key
+    if not keyring:
+        raise ImproperlyConfigured("No master keys are configured")
+    return keyring
+
+
+def master_keys():
+    """``{key id: key}`` in configuration order; re-read when the key file changes."""
+    path = settings.ENCRYPTION_MASTER_KEY_FILE
+    env = settings.ENCRYPTION_MASTER_KEY
+    if not (path or env or settings.ENCRYPTION_ALLOW_DEVELOPMENT_KEY):
+        raise ImproperlyConfigured(
+            "Set ENCRYPTION_MASTER_KEY_FILE or ENCRYPTION_MASTER_KEY; "
+            "the development master key is only used when ENCRYPTION_ALLOW_DEVELOPMENT_KEY is on"
+        )
+    modified = os.stat(path).st_mtime_ns if path else None
+    return _read_keyring(path, modified, env, settings.SECRET_KEY)
+
+
+def current_master_key():
+    """The ``(key id, key)`` new data keys are wrapped with."""
+    return list(master_keys().items())[-1]
+
+
+def append_master_key(path, key_id, key=None):
+    """Add a new current master key to the key file, readable by its owner only."""
+    key = key or os.urandom(32)
+    descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    with os.fdopen(descriptor, "a") as key_file:
+        key_file.write(f"{key_id} {base64.b64encode(key).decode()}\n")
+    return key_id
+
+
+class KeyCache:
+    """A bounded, thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, self.clock() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+data_keys = KeyCache(settings.ENCRYPTION_KEY_CACHE_SIZE, settings.ENCRYPTION_KEY_CACHE_TTL)
+
+
+def wrap(data_key, master=None):
+    """Wrap ``data_key`` with ``master`` (a ``(key id, key)`` pair, default the current one)."""
+    key_id, master_key = master or current_master_key()
+    return key_id, aes_key_wrap(master_key, bytes(data_key))
+
+
+def unwrap(key_id, wrapped, use_cache=True, keyring=None):
+    """Unwrap a data key with master key ``key_id`` from ``keyring`` (default the configured master keys)."""
+    wrapped = bytes(wrapped)
+    cached = data_keys.get((key_id, wrapped)) if use_cache else None
+    if cached is not None:
+        return cached
+    try:
+        master_key = (keyring or master_keys())[key_id]
+    except KeyError:
+        raise ImproperlyConfigured(f"Master key {key_id!r} is not configured") from None
+    data_key = aes_key_unwrap(master_key, wrapped)
+    if use_cache:
+        data_keys.put((key_id, wrapped), data_key)
+    return data_key
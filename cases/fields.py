@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class Ciphertext(str):
+    """A field value known to be ciphertext, as loaded from the database or written on save."""
+
+
+class EncryptedFieldMixin:
+    """Stores its value encrypted by the model's ``encrypt_field()``.
+
+    Values read from the database come back as ``Ciphertext``. Anything assigned
+    afterwards is plain ``str`` and is treated as plaintext, so only dirty
+    values are encrypted on save and no value is ever guessed at by trial
+    decryption. Saves whose ``update_fields`` leave the field out skip it
+    entirely.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return value if value is None else Ciphertext(value)
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if not value or isinstance(value, Ciphertext):
+            return value
+        encrypted = Ciphertext(model_instance.encrypt_field(value))
+        setattr(model_instance, self.attname, encrypted)
+        return encrypted
+
+
+class EncryptedTextField(EncryptedFieldMixin, models.TextField):
+    pass
+
+
+class EncryptedCharField(EncryptedFieldMixin, models.CharField):
+    pass
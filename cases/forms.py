@@ -147,3 +147,28 @@ class AssignInvestigatorForm(forms.ModelForm):
         self.fields["assigned_investigators"].queryset = User.objects.filter(
             role="investigator", is_active=True, verified=True
         )
+
+
+class CaseFilterForm(forms.Form):
+    """Title and category filters for case listings, matched by blind index."""
+
+    title = forms.CharField(required=False, label="Title contains words")
+    category = forms.ChoiceField(required=False, choices=[("", "Any category")] + Case.CASE_CATEGORIES)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            field.widget.attrs.setdefault("class", "form-control")
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        if self.cleaned_data["title"]:
+            queryset = Case.search_title(self.cleaned_data["title"], queryset)
+        if self.cleaned_data["category"]:
+            queryset = Case.in_category(self.cleaned_data["category"], queryset)
+        return queryset
+
+    @property
+    def is_filtered(self):
+        return self.is_bound and self.is_valid() and any(self.cleaned_data.values())
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cases import blind_index
+from cases.models import Case, CaseTitleToken
+
+
+class Command(BaseCommand):
+    help = "Compute blind indexes for case titles and categories saved before they existed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Reindex every case, e.g. after changing CASE_BLIND_INDEX_KEY or SECRET_KEY",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        cases = Case.objects.order_by("pk")
+        if not options["rebuild"]:
+            cases = cases.filter(category_bidx="")
+
+        processed = 0
+        last_pk = 0
+        while True:
+            batch = Case.decrypt_many(cases.filter(pk__gt=last_pk)[: options["batch_size"]])
+            if not batch:
+                break
+            tokens = []
+            for case in batch:
+                case.category_bidx = blind_index.category_digest(case.get_category())
+                tokens.extend(CaseTitleToken(case=case, token=token) for token in blind_index.title_tokens(case.get_title()))
+            with transaction.atomic():
+                Case.objects.bulk_update(batch, ["category_bidx"])
+                CaseTitleToken.objects.filter(case__in=batch).delete()
+                CaseTitleToken.objects.bulk_create(tokens)
+            processed += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Indexed {processed} case(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {processed} case(s)"))
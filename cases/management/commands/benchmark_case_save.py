@@ -0,0 +1,94 @@
+import base64
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cases.models import Case
+
+
+def _legacy_trial_decryption(case):
+    """The pass ``Case.save`` made before encrypted fields tracked their own state.
+
+    Every non-empty field was decrypted to guess whether it was already
+    ciphertext. Replaying it before a save reproduces the old cost.
+    """
+    cipher = case.encryption_key.get_cipher()
+    for field_name in Case.ENCRYPTED_FIELDS:
+        value = getattr(case, field_name)
+        if isinstance(value, str) and value:
+            try:
+                decryptor = cipher.decryptor()
+                case._unpad_data(decryptor.update(base64.b64decode(value)) + decryptor.finalize())
+            except Exception:
+                pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark Case.save() with and without the trial decryption it used to perform"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cases", type=int, default=500)
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **options):
+        count = options["cases"]
+        self.stdout.write(f"{count} cases, rolled back afterwards")
+        self.stdout.write(f"{'scenario':<28}{'legacy saves/s':>16}{'current saves/s':>17}{'speedup':>9}")
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email="benchmark-case-save@example.invalid",
+                first_name="Benchmark",
+                last_name="User",
+                password=None,
+                role="regular_user",
+            )
+            for i in range(count):
+                Case.objects.create(
+                    case_title=f"Benchmark case {i}",
+                    case_description="Seized laptop imaged and hashed on site. " * 10,
+                    case_category="Cybercrime",
+                    case_status_notes="Awaiting analysis",
+                    final_report="Report pending",
+                    conclusion="None yet",
+                    created_by=user,
+                )
+            cases = list(Case.objects.filter(created_by=user).select_related("encryption_key"))
+
+            def edit(case):
+                case.case_status_notes = f"Reviewed {time.perf_counter()}"
+                case.save()
+
+            encrypted_fields = [Case._meta.get_field(name) for name in Case.ENCRYPTED_FIELDS]
+
+            def pre_save_only(case):
+                for field in encrypted_fields:
+                    field.pre_save(case, False)
+
+            scenarios = [
+                ("encryption step only", pre_save_only),
+                ("full save, unchanged", lambda case: case.save()),
+                ("full save, one field edited", edit),
+                ("status-only save", lambda case: case.save(update_fields=["case_status"])),
+            ]
+            for label, save in scenarios:
+                legacy, current = self._compare(
+                    cases, lambda case: (_legacy_trial_decryption(case), save(case)), save, options["rounds"]
+                )
+                self.stdout.write(f"{label:<28}{legacy:>16.0f}{current:>17.0f}{current / legacy:>8.2f}x")
+
+            transaction.set_rollback(True)
+
+    def _compare(self, cases, legacy, current, rounds):
+        """Best rate of each over ``rounds``, alternating which goes first."""
+        legacy_rates, current_rates = [], []
+        for round_number in range(rounds):
+            pair = [(legacy, legacy_rates), (current, current_rates)]
+            for func, rates in pair if round_number % 2 == 0 else reversed(pair):
+                started = time.perf_counter()
+                for case in cases:
+                    func(case)
+                rates.append(len(cases) / (time.perf_counter() - started))
+        return max(legacy_rates), max(current_rates)
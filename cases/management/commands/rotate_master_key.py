@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cases import envelope
+from cases.models import EncryptionKey
+from custody.models import CaseStorage
+
+
+class Command(BaseCommand):
+    help = "Re-wrap every case data key with the current master key; stored evidence is not re-encrypted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            action="store_true",
+            help="Append a new random master key to ENCRYPTION_MASTER_KEY_FILE and rotate to it",
+        )
+        parser.add_argument(
+            "--development-key",
+            action="store_true",
+            help="Also move data keys wrapped with the development key derived from SECRET_KEY",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["generate"]:
+            path = settings.ENCRYPTION_MASTER_KEY_FILE
+            if not path:
+                raise CommandError("--generate needs ENCRYPTION_MASTER_KEY_FILE to be set")
+            key_id = timezone.now().strftime("%Y%m%d%H%M%S")
+            try:
+                existing = envelope.master_keys()
+            except FileNotFoundError:
+                existing = {}
+            if key_id in existing:
+                raise CommandError(f"Master key {key_id} already exists")
+            envelope.append_master_key(path, key_id)
+            self.stdout.write(f"Added master key {key_id} to {path}")
+
+        master = envelope.current_master_key()
+        keyring = None
+        if options["development_key"]:
+            keyring = {envelope.DEVELOPMENT_KEY_ID: envelope.development_key(), **envelope.master_keys()}
+        started = time.monotonic()
+        total = 0
+        for model in (EncryptionKey, CaseStorage):
+            rewrapped = model.rewrap_all(master, options["batch_size"], keyring)
+            total += rewrapped
+            self.stdout.write(f"{model._meta.verbose_name_plural}: re-wrapped {rewrapped}")
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-wrapped {total} data key(s) with master key {master[0]} in {elapsed:.1f}s ({total / elapsed:.0f}/s)"
+            )
+        )
+        self.stdout.write(
+            "Keep the previous master keys until every running process has been restarted, then remove them."
+        )
+
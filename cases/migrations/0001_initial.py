@@ -0,0 +1,113 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:57
+
+import cases.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Case',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case_id', models.CharField(blank=True, editable=False, max_length=20, null=True, unique=True)),
+                ('case_title', cases.fields.EncryptedTextField()),
+                ('case_description', cases.fields.EncryptedTextField()),
+                ('case_category', cases.fields.EncryptedCharField(choices=[('Homicide', 'Homicide'), ('Assault and Violence', 'Assault and Violence'), ('Sexual Offenses', 'Sexual Offenses'), ('Theft and Property Crimes', 'Theft and Property Crimes'), ('Fraud and Financial Crimes', 'Fraud and Financial Crimes'), ('Drug Offenses', 'Drug Offenses'), ('Cybercrime', 'Cybercrime'), ('Domestic and Family Violence', 'Domestic and Family Violence'), ('Human Trafficking', 'Human Trafficking'), ('Child Abuse and Exploitation', 'Child Abuse and Exploitation'), ('Elder Abuse', 'Elder Abuse'), ('Public Order and Nuisance', 'Public Order and Nuisance'), ('Traffic and Vehicle Offenses', 'Traffic and Vehicle Offenses'), ('White Collar and Corporate Crime', 'White Collar and Corporate Crime'), ('Terrorism and National Security', 'Terrorism and National Security')], max_length=50)),
+                ('category_bidx', models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64)),
+                ('case_status', models.CharField(choices=[('Open', 'Open'), ('Pending Admin Approval', 'Pending Admin Approval'), ('Approved & Assigned', 'Approved & Assigned'), ('Under Review', 'Under Review'), ('Closed', 'Closed'), ('Archived', 'Archived'), ('Invalid', 'Invalid'), ('Withdrawn', 'Withdrawn')], default='Open', max_length=200)),
+                ('case_status_notes', cases.fields.EncryptedTextField()),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('invalid_reason', models.TextField(blank=True, null=True)),
+                ('withdraw_reason', models.TextField(blank=True, null=True)),
+                ('close_reason', models.TextField(blank=True, null=True)),
+                ('closure_approved', models.BooleanField(default=False)),
+                ('closure_creator_approved', models.BooleanField(default=False)),
+                ('case_priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], default='medium', max_length=10)),
+                ('closure_requested', models.BooleanField(default=False)),
+                ('final_report', cases.fields.EncryptedTextField(blank=True, null=True)),
+                ('conclusion', cases.fields.EncryptedTextField(blank=True, null=True)),
+                ('case_concluded_at', models.DateTimeField(blank=True, null=True)),
+                ('assigned_investigators', models.ManyToManyField(blank=True, related_name='assigned_cases', to=settings.AUTH_USER_MODEL)),
+                ('case_concluded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='concluded_cases', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cases', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AssignmentRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('assignment', 'Assignment'), ('handover', 'Handover')], default='assignment', max_length=20)),
+                ('status', models.CharField(choices=[('pending_creator', 'Pending Creator Approval'), ('pending_admin', 'Pending Admin Approval'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending_creator', max_length=20)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('assigned_users', models.ManyToManyField(related_name='assignment_requests', to=settings.AUTH_USER_MODEL)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignment_requests', to='cases.case')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CaseAuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=255)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('details', models.TextField(blank=True, null=True)),
+                ('case', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to='cases.case')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EncryptionKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wrapped_key', models.BinaryField(null=True)),
+                ('master_key_id', models.CharField(blank=True, db_index=True, editable=False, max_length=64)),
+                ('legacy_key', models.BinaryField(db_column='key', null=True)),
+                ('iv', models.BinaryField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='encryption_key', to='cases.case')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseTitleToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='title_tokens', to='cases.case')),
+            ],
+            options={
+                'unique_together': {('token', 'case')},
+            },
+        ),
+        migrations.CreateModel(
+            name='InvestigatorCaseStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('accepted', models.BooleanField(default=False)),
+                ('accepted_at', models.DateTimeField(blank=True, null=True)),
+                ('under_review', models.BooleanField(default=False)),
+                ('under_review_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='investigator_statuses', to='cases.case')),
+                ('investigator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_statuses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('case', 'investigator')},
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, prefetch_related_objects
 from django.conf import settings
 from django.utils import timezone
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -11,24 +12,94 @@ import os
 import hashlib
 from datetime import datetime
 
+from . import blind_index, envelope
+from .fields import Ciphertext, EncryptedCharField, EncryptedTextField
 
-class EncryptionKey(models.Model):
+
+class WrappedKeyModel(models.Model):
+    """Holds one data key, stored wrapped by a master key (see envelope.py).
+
+    ``legacy_key`` is where keys saved before envelope encryption sit
+    unwrapped, until ``rotate_master_key`` wraps them.
+    """
+
+    wrapped_key = models.BinaryField(null=True, editable=False)
+    master_key_id = models.CharField(max_length=64, blank=True, editable=False, db_index=True)
+    legacy_key = models.BinaryField(null=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def data_key(self):
+        if self.wrapped_key is None:
+            return None if self.legacy_key is None else bytes(self.legacy_key)
+        return envelope.unwrap(self.master_key_id, self.wrapped_key)
+
+    @data_key.setter
+    def data_key(self, key):
+        self.master_key_id, self.wrapped_key = envelope.wrap(key)
+        self.legacy_key = None
+
+    @classmethod
+    def rewrap_all(cls, master=None, batch_size=1000, keyring=None):
+        """Re-wrap every data key not yet under ``master`` (default the current master key).
+
+        Only the wrapped keys change, so this costs one unwrap and one wrap per
+        row no matter how much data the keys protect. ``keyring`` overrides the
+        master keys used for unwrapping. Returns the number of rows re-wrapped.
+        """
+        master = master or envelope.current_master_key()
+        pending = cls.objects.exclude(master_key_id=master[0], wrapped_key__isnull=False).order_by("pk")
+        pending = pending.values_list("pk", "wrapped_key", "master_key_id", "legacy_key")
+
+        # bulk_update() builds a CASE expression per row, which is slower than
+        # the key wrapping itself; one parameterized UPDATE run per row is not.
+        quote = connection.ops.quote_name
+        columns = [quote(cls._meta.get_field(name).column) for name in ("wrapped_key", "master_key_id", "legacy_key")]
+        sql = "UPDATE {} SET {} = %s, {} = %s, {} = NULL WHERE {} = %s".format(
+            quote(cls._meta.db_table), *columns, quote(cls._meta.pk.column)
+        )
+
+        rewrapped = 0
+        last_pk = 0
+        while True:
+            batch = list(pending.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            params = []
+            for pk, wrapped_key, master_key_id, legacy_key in batch:
+                if wrapped_key is None:
+                    data_key = bytes(legacy_key)
+                else:
+                    data_key = envelope.unwrap(master_key_id, wrapped_key, use_cache=False, keyring=keyring)
+                params.append((envelope.wrap(data_key, master)[1], master[0], pk))
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, params)
+            rewrapped += len(batch)
+            last_pk = batch[-1][0]
+        return rewrapped
+
+
+class EncryptionKey(WrappedKeyModel):
     case = models.OneToOneField(
         "Case", on_delete=models.CASCADE, related_name="encryption_key", unique=True
     )
-    key = models.BinaryField(editable=False)
+    legacy_key = models.BinaryField(null=True, editable=False, db_column="key")
     iv = models.BinaryField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    key = WrappedKeyModel.data_key
+
     def save(self, *args, **kwargs):
-        if not self.key:
+        if self.wrapped_key is None and self.legacy_key is None:
             self.key = os.urandom(32)
             self.iv = os.urandom(16)
         super().save(*args, **kwargs)
 
-    def get_cipher(self):
+    def get_cipher(self, iv=None):
         cipher = Cipher(
-            algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend()
+            algorithms.AES(self.key), modes.CBC(iv or self.iv), backend=default_backend()
         )
         return cipher
 
@@ -73,16 +144,19 @@ class Case(models.Model):
     ]
 
     case_id = models.CharField(max_length=20, unique=True, editable=False, null=True, blank=True)
-    case_title = models.TextField()
-    case_description = models.TextField()
-    case_category = models.CharField(max_length=50, choices=CASE_CATEGORIES)
+    case_title = EncryptedTextField()
+    case_description = EncryptedTextField()
+    case_category = EncryptedCharField(max_length=50, choices=CASE_CATEGORIES)
+    # HMAC of the category (see blind_index.py), so cases can be filtered and
+    # grouped by category without decrypting it.
+    category_bidx = models.CharField(max_length=64, blank=True, default="", db_index=True, editable=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="cases"
     )
     case_status = models.CharField(
         max_length=200, choices=STATUS_CHOICES, default="Open"
     )
-    case_status_notes = models.TextField()
+    case_status_notes = EncryptedTextField()
     date_created = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
     invalid_reason = models.TextField(blank=True, null=True)
@@ -97,13 +171,30 @@ class Case(models.Model):
         settings.AUTH_USER_MODEL, related_name="assigned_cases", blank=True
     )
     closure_requested = models.BooleanField(default=False)
-    final_report = models.TextField(blank=True, null=True)
-    conclusion = models.TextField(blank=True, null=True)
+    final_report = EncryptedTextField(blank=True, null=True)
+    conclusion = EncryptedTextField(blank=True, null=True)
     case_concluded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="concluded_cases"
     )
     case_concluded_at = models.DateTimeField(null=True, blank=True)
 
+    ENCRYPTED_FIELDS = [
+        "case_title",
+        "case_description",
+        "case_category",
+        "case_status_notes",
+        "final_report",
+        "conclusion",
+    ]
+    LIST_FIELDS = ["case_title", "case_category"]
+
+    def __getstate__(self):
+        # Neither decrypted plaintext nor the cipher belongs in a pickled case.
+        state = super().__getstate__()
+        state.pop("_decrypted", None)
+        state.pop("_cipher", None)
+        return state
+
     def __str__(self):
         title_preview = (
             self.case_title[:30] + "..."
@@ -131,8 +222,7 @@ class Case(models.Model):
     def encrypt_field(self, value):
         if value is None or value == "":
             return None
-        cipher = self.encryption_key.get_cipher()
-        encryptor = cipher.encryptor()
+        encryptor = self._field_cipher().encryptor()
 
         data = value.encode("utf-8")
         padded_data = self._pad_data(data)
@@ -140,22 +230,32 @@ class Case(models.Model):
 
         return base64.b64encode(encrypted_bytes).decode()
 
-    def encrypt_field_with_cipher(self, value, cipher):
-        if value is None or value == "":
-            return None
-        encryptor = cipher.encryptor()
-
-        data = value.encode("utf-8")
-        padded_data = self._pad_data(data)
-        encrypted_bytes = encryptor.update(padded_data) + encryptor.finalize()
-
-        return base64.b64encode(encrypted_bytes).decode()
+    def _field_cipher(self):
+        """The case cipher, built once per instance and reused for every field.
+
+        A case without a key yet gets fresh key material, which ``save`` stores
+        as its ``EncryptionKey`` once the case row exists.
+        """
+        cipher = self.__dict__.get("_cipher")
+        if cipher is None:
+            if hasattr(self, "encryption_key"):
+                cipher = self.encryption_key.get_cipher()
+            else:
+                self._temp_key = os.urandom(32)
+                self._temp_iv = os.urandom(16)
+                cipher = Cipher(
+                    algorithms.AES(self._temp_key),
+                    modes.CBC(self._temp_iv),
+                    backend=default_backend(),
+                )
+            self._cipher = cipher
+        return cipher
 
     def decrypt_field(self, encrypted_value):
         if not encrypted_value:
             return ""
         try:
-            cipher = self.encryption_key.get_cipher()
+            cipher = self._field_cipher()
             decryptor = cipher.decryptor()
 
             encrypted_bytes = base64.b64decode(encrypted_value)
@@ -170,45 +270,28 @@ class Case(models.Model):
             logger.error(f"Decryption failed for Case ID {self.id}: {e}")
             return encrypted_value  # Return the encrypted value if decryption fails
 
-    def encrypt_fields(self):
-        if hasattr(self, "encryption_key"):
-            cipher = self.encryption_key.get_cipher()
-        else:
-            self._temp_key = os.urandom(32)
-            self._temp_iv = os.urandom(16)
-            cipher = Cipher(
-                algorithms.AES(self._temp_key),
-                modes.CBC(self._temp_iv),
-                backend=default_backend(),
-            )
-
-        for field_name in [
-            "case_title",
-            "case_description",
-            "case_category",
-            "case_status_notes",
-            "final_report",
-            "conclusion",
-        ]:
-            value = getattr(self, field_name)
-            if isinstance(value, str) and value:
-                try:
-                    encrypted_bytes = base64.b64decode(value)
-                    decryptor = cipher.decryptor()
-                    padded_data = (
-                        decryptor.update(encrypted_bytes) + decryptor.finalize()
-                    )
-                    self._unpad_data(padded_data)
-                    continue
-                except Exception:
-                    encrypted = self.encrypt_field_with_cipher(value, cipher)
-                    setattr(self, field_name, encrypted)
-
     def save(self, *args, **kwargs):
         if not self.case_id:
             self.case_id = self.generate_case_id()
-        self.encrypt_fields()
+        # Encrypted fields encrypt themselves in pre_save; a new case needs its
+        # key material even when every encrypted field is empty.
+        self._field_cipher()
+        # Plain str values are the ones assigned since loading, so only those
+        # need their blind indexes recomputed.
+        update_fields = kwargs.get("update_fields")
+        reindex = {
+            name: getattr(self, name)
+            for name in ("case_title", "case_category")
+            if not isinstance(getattr(self, name), Ciphertext)
+            and (update_fields is None or name in update_fields)
+        }
+        if "case_category" in reindex:
+            self.category_bidx = blind_index.category_digest(reindex["case_category"])
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "category_bidx"}
         super().save(*args, **kwargs)
+        if "case_title" in reindex:
+            CaseTitleToken.index(self, reindex["case_title"])
         if hasattr(self, "_temp_key"):
             EncryptionKey.objects.create(
                 case=self, key=self._temp_key, iv=self._temp_iv
@@ -216,23 +299,110 @@ class Case(models.Model):
             delattr(self, "_temp_key")
             delattr(self, "_temp_iv")
 
+    def decrypted(self, field_name):
+        """Plaintext of an encrypted field, cached on the instance.
+
+        Entries are keyed by the stored ciphertext, so assigning the field a new
+        value (or saving, which re-encrypts it) invalidates the entry. A value
+        assigned since loading is not ``Ciphertext`` and is already plaintext.
+        """
+        value = getattr(self, field_name)
+        if not isinstance(value, Ciphertext):
+            return value or ""
+        cache = self.__dict__.setdefault("_decrypted", {})
+        cached = cache.get(field_name)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        plaintext = self.decrypt_field(value)
+        cache[field_name] = (value, plaintext)
+        return plaintext
+
+    @classmethod
+    def decrypt_many(cls, cases, fields=None):
+        """Decrypt ``fields`` of every case in one pass and return the cases as a list.
+
+        A queryset is joined to its encryption keys; for a list, keys not
+        already loaded are fetched with one query. Each case builds its cipher
+        once for all of its fields, and the getters then read from the
+        per-instance cache.
+        """
+        if isinstance(cases, models.QuerySet):
+            cases = cases.select_related("encryption_key")
+        cases = list(cases)
+        prefetch_related_objects(cases, "encryption_key")
+        for case in cases:
+            for field_name in fields or cls.LIST_FIELDS:
+                case.decrypted(field_name)
+        return cases
+
+    @classmethod
+    def search_title(cls, text, cases=None):
+        """Cases whose title contains every word of ``text``, matched by blind index."""
+        cases = cls.objects.all() if cases is None else cases
+        tokens = blind_index.title_tokens(text)
+        if not tokens:
+            return cases.none()
+        matching = (
+            CaseTitleToken.objects.filter(token__in=tokens)
+            .values("case")
+            .annotate(matched=Count("token"))
+            .filter(matched=len(tokens))
+            .values("case")
+        )
+        return cases.filter(pk__in=matching)
+
+    @classmethod
+    def in_category(cls, category, cases=None):
+        cases = cls.objects.all() if cases is None else cases
+        return cases.filter(category_bidx=blind_index.category_digest(category))
+
+    @classmethod
+    def category_counts(cls, cases=None):
+        """``{category: number of cases}``, grouped on the blind index column."""
+        cases = cls.objects.all() if cases is None else cases
+        labels = {blind_index.category_digest(value): value for value, _ in cls.CASE_CATEGORIES}
+        counts = cases.order_by().values_list("category_bidx").annotate(total=Count("pk"))
+        return {labels[bidx]: total for bidx, total in counts if bidx in labels}
+
     def get_title(self):
-        return self.decrypt_field(self.case_title)
+        return self.decrypted("case_title")
 
     def get_description(self):
-        return self.decrypt_field(self.case_description)
+        return self.decrypted("case_description")
 
     def get_category(self):
-        return self.decrypt_field(self.case_category)
+        return self.decrypted("case_category")
 
     def get_status_notes(self):
-        return self.decrypt_field(self.case_status_notes)
+        return self.decrypted("case_status_notes")
 
     def get_final_report(self):
-        return self.decrypt_field(self.final_report)
+        return self.decrypted("final_report")
 
     def get_conclusion(self):
-        return self.decrypt_field(self.conclusion)
+        return self.decrypted("conclusion")
+
+
+class CaseTitleToken(models.Model):
+    """One blind-indexed word of a case title."""
+
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="title_tokens")
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ["token", "case"]
+
+    def __str__(self):
+        return f"Title token {self.token[:12]} for Case {self.case_id}"
+
+    @classmethod
+    def index(cls, case, title):
+        """Replace the tokens of ``case`` with those of its plaintext ``title``."""
+        tokens = blind_index.title_tokens(title)
+        stale = cls.objects.filter(case=case).exclude(token__in=tokens)
+        stale.delete()
+        existing = set(cls.objects.filter(case=case).values_list("token", flat=True))
+        cls.objects.bulk_create(cls(case=case, token=token) for token in tokens - existing)
 
 
 class AssignmentRequest(models.Model):
@@ -1,3 +1,257 @@
-from django.test import TestCase
+import os
+import pickle
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import envelope
+from .fields import Ciphertext
+from .models import Case, CaseTitleToken, EncryptionKey
+
+User = get_user_model()
+
+
+class CaseFieldDecryptionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='creator@test.com',
+            first_name='Cara',
+            last_name='Creator',
+            password='testpass123',
+            role='regular_user',
+            is_active=True,
+            verified=True,
+        )
+        for i in range(5):
+            Case.objects.create(
+                case_title=f'Case {i}',
+                case_description=f'Description {i}',
+                case_category='Cybercrime',
+                created_by=self.user,
+            )
+
+    def test_decrypted_fields_are_cached_until_reassigned(self):
+        case = Case.objects.first()
+        with mock.patch.object(EncryptionKey, 'get_cipher', wraps=case.encryption_key.get_cipher) as get_cipher:
+            self.assertEqual(case.get_title(), case.get_title())
+            self.assertEqual(case.get_category(), 'Cybercrime')
+        self.assertEqual(get_cipher.call_count, 1)
+
+        title = case.get_title()
+        case.case_title = 'Renamed'
+        case.save()
+        self.assertEqual(case.get_title(), 'Renamed')
+        self.assertNotEqual(title, 'Renamed')
+        self.assertNotIn('_decrypted', pickle.loads(pickle.dumps(case)).__dict__)
+
+    def test_decrypt_many_loads_keys_in_one_query(self):
+        with self.assertNumQueries(1):
+            cases = Case.decrypt_many(Case.objects.order_by('id'))
+        with self.assertNumQueries(2):
+            Case.decrypt_many(list(Case.objects.order_by('id')))
+        with self.assertNumQueries(0):
+            titles = [case.get_title() for case in cases]
+            categories = {case.get_category() for case in cases}
+        self.assertEqual(titles, [f'Case {i}' for i in range(5)])
+        self.assertEqual(categories, {'Cybercrime'})
+
+
+class EncryptedFieldTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='editor@test.com',
+            first_name='Eddie',
+            last_name='Editor',
+            password='testpass123',
+            role='regular_user',
+            is_active=True,
+            verified=True,
+        )
+        self.case = Case.objects.create(
+            case_title='Original title',
+            case_description='Original description',
+            case_category='Cybercrime',
+            created_by=self.user,
+        )
+
+    def test_only_assigned_fields_are_encrypted(self):
+        case = Case.objects.get(pk=self.case.pk)
+        self.assertIsInstance(case.case_title, Ciphertext)
+        with mock.patch.object(Case, 'encrypt_field', wraps=case.encrypt_field) as encrypt_field:
+            case.save()
+            case.save(update_fields=['case_status'])
+            case.case_status_notes = 'Reviewed'
+            case.save()
+        encrypt_field.assert_called_once_with('Reviewed')
+
+    def test_assigned_plaintext_is_returned_without_decrypting(self):
+        case = Case.objects.get(pk=self.case.pk)
+        case.case_title = 'Renamed'
+        with mock.patch.object(Case, 'decrypt_field') as decrypt_field:
+            self.assertEqual(case.decrypted('case_title'), 'Renamed')
+            self.assertEqual(case.get_title(), 'Renamed')
+        decrypt_field.assert_not_called()
+
+    def test_plaintext_that_looks_like_ciphertext_is_encrypted(self):
+        case = Case.objects.get(pk=self.case.pk)
+        case.case_title = str(case.case_description)
+        case.save()
+        case = Case.objects.get(pk=self.case.pk)
+        self.assertEqual(case.get_title(), self.case.case_description)
+        self.assertEqual(case.get_description(), 'Original description')
+
+
+class CaseBlindIndexTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='searcher@test.com',
+            first_name='Sam',
+            last_name='Searcher',
+            password='testpass123',
+            role='regular_user',
+            is_active=True,
+            verified=True,
+        )
+        self.phishing = Case.objects.create(
+            case_title='Phishing campaign against Riverside Bank',
+            case_description='Description',
+            case_category='Cybercrime',
+            created_by=self.user,
+        )
+        self.burglary = Case.objects.create(
+            case_title='Burglary at Riverside warehouse',
+            case_description='Description',
+            case_category='Theft and Property Crimes',
+            created_by=self.user,
+        )
+
+    def test_title_words_match_case_insensitively(self):
+        self.assertQuerySetEqual(Case.search_title('riverside').order_by('pk'), [self.phishing, self.burglary])
+        self.assertQuerySetEqual(Case.search_title('RIVERSIDE bank'), [self.phishing])
+        self.assertQuerySetEqual(Case.search_title('riverside garage'), [])
+        self.assertNotIn('riverside', set(CaseTitleToken.objects.values_list('token', flat=True)))
+
+        case = Case.objects.get(pk=self.burglary.pk)
+        case.case_title = 'Burglary at Hillside warehouse'
+        case.save()
+        self.assertQuerySetEqual(Case.search_title('riverside'), [self.phishing])
+        self.assertQuerySetEqual(Case.search_title('hillside'), [self.burglary])
+
+    def test_category_is_matched_and_grouped_by_blind_index(self):
+        self.assertQuerySetEqual(Case.in_category('Cybercrime'), [self.phishing])
+        case = Case.objects.get(pk=self.burglary.pk)
+        case.case_category = 'Cybercrime'
+        case.save(update_fields=['case_category'])
+        self.assertEqual(Case.category_counts(), {'Cybercrime': 2})
+
+    def test_backfill_indexes_existing_cases(self):
+        Case.objects.update(category_bidx='')
+        CaseTitleToken.objects.all().delete()
+        call_command('backfill_case_blind_index', stdout=StringIO())
+        self.assertQuerySetEqual(Case.search_title('warehouse'), [self.burglary])
+        self.assertQuerySetEqual(Case.in_category('Cybercrime'), [self.phishing])
+
+    def test_case_list_filters_by_title_and_category(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('cases:case_list'), {'title': 'riverside', 'category': 'Cybercrime'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cases'], [self.phishing])
+
+
+class EnvelopeEncryptionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='keeper@test.com',
+            first_name='Kim',
+            last_name='Keeper',
+            password='testpass123',
+            role='regular_user',
+            is_active=True,
+            verified=True,
+        )
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        self.key_file = os.path.join(key_dir.name, 'master.key')
+        envelope.append_master_key(self.key_file, 'first')
+        settings_override = override_settings(ENCRYPTION_MASTER_KEY_FILE=self.key_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_case(self, title):
+        return Case.objects.create(
+            case_title=title,
+            case_description='Description',
+            case_category='Cybercrime',
+            created_by=self.user,
+        )
+
+    def test_data_keys_are_stored_wrapped(self):
+        case = self.create_case('Wrapped')
+        stored = EncryptionKey.objects.get(case=case)
+        self.assertIsNone(stored.legacy_key)
+        self.assertEqual(stored.master_key_id, 'first')
+        self.assertNotIn(stored.key, bytes(stored.wrapped_key))
+        self.assertEqual(Case.objects.get(pk=case.pk).get_title(), 'Wrapped')
+        self.assertIsNone(case.storage.legacy_key)
+        self.assertEqual(case.storage.decrypt_data(case.storage.encrypt_data('note')), 'note')
+
+    def test_rotation_rewraps_without_changing_data_keys(self):
+        case = self.create_case('Rotated')
+        legacy = self.create_case('Legacy')
+        raw_key = legacy.encryption_key.key
+        EncryptionKey.objects.filter(case=legacy).update(legacy_key=raw_key, wrapped_key=None, master_key_id='')
+        data_key = EncryptionKey.objects.get(case=case).key
+
+        call_command('rotate_master_key', '--generate', stdout=StringIO())
+        with open(self.key_file) as key_file:
+            new_id = key_file.read().splitlines()[-1].split()[0]
+
+        self.assertEqual(
+            set(EncryptionKey.objects.values_list('master_key_id', flat=True)), {new_id}
+        )
+        self.assertFalse(EncryptionKey.objects.filter(legacy_key__isnull=False).exists())
+        self.assertEqual(EncryptionKey.objects.get(case=case).key, data_key)
+        self.assertEqual(EncryptionKey.objects.get(case=legacy).key, raw_key)
+        self.assertEqual(Case.objects.get(pk=legacy.pk).get_title(), 'Legacy')
+
+    def test_development_key_is_only_used_without_a_master_key(self):
+        self.assertNotIn(envelope.DEVELOPMENT_KEY_ID, envelope.master_keys())
+        with override_settings(ENCRYPTION_MASTER_KEY_FILE='', ENCRYPTION_ALLOW_DEVELOPMENT_KEY=False):
+            with self.assertRaises(ImproperlyConfigured):
+                envelope.master_keys()
+        with override_settings(ENCRYPTION_MASTER_KEY_FILE='', ENCRYPTION_ALLOW_DEVELOPMENT_KEY=True):
+            self.assertEqual(list(envelope.master_keys()), [envelope.DEVELOPMENT_KEY_ID])
+
+    def test_rotation_moves_keys_wrapped_with_the_development_key(self):
+        case = self.create_case('Development')
+        raw_key = case.encryption_key.key
+        development = (envelope.DEVELOPMENT_KEY_ID, envelope.development_key())
+        EncryptionKey.objects.filter(case=case).update(
+            master_key_id=development[0], wrapped_key=envelope.wrap(raw_key, development)[1]
+        )
+        envelope.data_keys.clear()
+        with self.assertRaises(ImproperlyConfigured):
+            EncryptionKey.objects.get(case=case).key
+
+        call_command('rotate_master_key', '--development-key', stdout=StringIO())
+
+        stored = EncryptionKey.objects.get(case=case)
+        self.assertEqual(stored.master_key_id, 'first')
+        self.assertEqual(stored.key, raw_key)
+
+    def test_key_cache_is_bounded_and_expires(self):
+        now = [0]
+        cache = envelope.KeyCache(max_size=2, ttl=60, clock=lambda: now[0])
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        now[0] = 60
+        self.assertIsNone(cache.get('a'))
@@ -6,7 +6,7 @@ from django.db.models import Q
 from django.utils import timezone
 from .models import Case, CaseAuditLog, AssignmentRequest, InvestigatorCaseStatus
 from evidence.models import Evidence
-from .forms import CaseForm, EditCaseForm
+from .forms import CaseFilterForm, CaseForm, EditCaseForm
 from .permissions import regular_user_required, role_required, can_create_case, can_close_case
 import csv
 from django.contrib.auth import get_user_model
@@ -37,8 +37,15 @@ def case_list(request):
     else:
         return HttpResponseForbidden("You do not have permission to view cases.")
 
+    filter_form = CaseFilterForm(request.GET)
     return render(
-        request, "cases/case_list.html", {"cases": cases, "is_superuser": is_superuser}
+        request,
+        "cases/case_list.html",
+        {
+            "cases": Case.decrypt_many(filter_form.filter(cases)),
+            "is_superuser": is_superuser,
+            "filter_form": filter_form,
+        },
     )
 
 
@@ -58,7 +65,7 @@ def assigned_cases(request):
     return render(
         request,
         "cases/assigned_cases.html",
-        {"cases": cases, "is_superuser": is_superuser},
+        {"cases": Case.decrypt_many(cases), "is_superuser": is_superuser},
     )
 
 
@@ -0,0 +1,145 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('cases', '0001_initial'),
+        ('evidence', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseStorage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wrapped_key', models.BinaryField(null=True)),
+                ('master_key_id', models.CharField(blank=True, db_index=True, editable=False, max_length=64)),
+                ('storage_name', models.CharField(max_length=200, unique=True)),
+                ('storage_path', models.CharField(max_length=500)),
+                ('legacy_key', models.BinaryField(db_column='encryption_key', null=True)),
+                ('encryption_iv', models.BinaryField(null=True)),
+                ('is_locked', models.BooleanField(default=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='storage', to='cases.case')),
+            ],
+            options={
+                'verbose_name': 'Case Storage',
+                'verbose_name_plural': 'Case Storages',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustodianAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('deactivated_at', models.DateTimeField(blank=True, null=True)),
+                ('deactivation_reason', models.TextField(blank=True)),
+                ('assignment_reason', models.TextField(blank=True)),
+                ('assigned_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custodian_assignments_made', to=settings.AUTH_USER_MODEL)),
+                ('case_storage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custodian_assignments', to='custody.casestorage')),
+                ('custodian', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custodian_assignments', to=settings.AUTH_USER_MODEL)),
+                ('deactivated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custodian_assignments_deactivated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Custodian Assignment',
+                'verbose_name_plural': 'Custodian Assignments',
+                'ordering': ['-assigned_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustodyTransfer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('completed', 'Completed')], default='pending', max_length=20)),
+                ('reason', models.TextField()),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='approved_custody_transfers', to=settings.AUTH_USER_MODEL)),
+                ('evidence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_transfers', to='evidence.evidence')),
+                ('from_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_transfers_from', to=settings.AUTH_USER_MODEL)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_transfer_requests', to=settings.AUTH_USER_MODEL)),
+                ('to_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_transfers_to', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StorageLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('location_type', models.CharField(choices=[('physical', 'Physical Storage'), ('digital', 'Digital Storage'), ('cloud', 'Cloud Storage')], max_length=20)),
+                ('capacity', models.BigIntegerField(blank=True, help_text='Capacity in bytes', null=True)),
+                ('used_space', models.BigIntegerField(default=0, help_text='Used space in bytes')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('case_storage', models.ForeignKey(blank=True, help_text='Link to case-specific storage', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='storage_locations', to='custody.casestorage')),
+                ('managed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='managed_storage_locations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EvidenceStorage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stored_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed', models.DateTimeField(auto_now=True)),
+                ('access_count', models.IntegerField(default=0)),
+                ('is_immutable', models.BooleanField(default=True, editable=False)),
+                ('evidence', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='storage', to='evidence.evidence')),
+                ('storage_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence_items', to='custody.storagelocation')),
+            ],
+            options={
+                'ordering': ['-stored_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustodyLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('stored', 'Stored'), ('retrieved', 'Retrieved'), ('transferred', 'Transferred'), ('verified', 'Verified'), ('archived', 'Archived'), ('viewed', 'Viewed'), ('downloaded', 'Downloaded'), ('moved', 'Moved')], max_length=20)),
+                ('details', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_logs', to='cases.case')),
+                ('evidence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custody_logs', to='evidence.evidence')),
+                ('to_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custody_logs_received', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custody_logs', to=settings.AUTH_USER_MODEL)),
+                ('from_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custody_logs_from', to='custody.storagelocation')),
+                ('to_location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custody_logs_to', to='custody.storagelocation')),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StorageLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('created', 'Storage Created'), ('upload', 'Evidence Uploaded'), ('access', 'Evidence Accessed'), ('lock', 'Storage Locked'), ('unlock', 'Storage Unlocked'), ('custodian_change', 'Custodian Changed'), ('transfer', 'Custody Transferred'), ('delete_attempt', 'Delete Attempt')], max_length=30)),
+                ('details', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('storage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='storage_logs', to='custody.casestorage')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='storage_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+            },
+        ),
+    ]
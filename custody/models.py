@@ -10,14 +10,16 @@ from cryptography.hazmat.backends import default_backend
 import base64
 import os
 
+from cases.models import WrappedKeyModel
 
-class CaseStorage(models.Model):
+
+class CaseStorage(WrappedKeyModel):
     case = models.OneToOneField(
         "cases.Case", on_delete=models.CASCADE, related_name="storage"
     )
     storage_name = models.CharField(max_length=200, unique=True)
     storage_path = models.CharField(max_length=500)
-    encryption_key = models.BinaryField(editable=False, null=True)
+    legacy_key = models.BinaryField(editable=False, null=True, db_column="encryption_key")
     encryption_iv = models.BinaryField(editable=False, null=True)
     is_locked = models.BooleanField(default=True)
     is_active = models.BooleanField(default=True)
@@ -32,8 +34,10 @@ class CaseStorage(models.Model):
     def __str__(self):
         return f'{self.storage_name} - {"Locked" if self.is_locked else "Unlocked"}'
 
+    encryption_key = WrappedKeyModel.data_key
+
     def save(self, *args, **kwargs):
-        if not self.encryption_key:
+        if self.wrapped_key is None and self.legacy_key is None:
             self.encryption_key = os.urandom(32)
             self.encryption_iv = os.urandom(16)
         super().save(*args, **kwargs)
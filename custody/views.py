@@ -2,7 +2,7 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from cases.permissions import custodian_required, custodian_or_auditor_required
 from cases.models import Case
-from evidence.models import Evidence
+from evidence.models import Evidence, EvidenceBlob
 from .models import (
     StorageLocation,
     EvidenceStorage,
@@ -70,6 +70,10 @@ def evidence_inventory(request):
     """Storage inventory page - shows storages custodians can manage"""
     case_storages = CaseStorage.objects.filter(is_active=True).select_related("case")
 
+    saved_bytes = EvidenceBlob.saved_bytes_by_case()
+    for storage in case_storages:
+        storage.dedup_saved_bytes = saved_bytes.get(storage.case_id, 0)
+
     context = {
         "case_storages": case_storages,
         "is_superuser": request.user.is_superuser,
@@ -99,6 +103,7 @@ def view_case_storage(request, case_id):
         "evidence_in_storage": evidence_in_storage,
         "current_custodian": current_custodian,
         "assignment_history": assignment_history,
+        "storage_stats": EvidenceBlob.storage_stats(case),
     }
     return render(request, "custody/view_case_storage.html", context)
 
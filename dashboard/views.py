@@ -123,7 +123,7 @@ def dashboard(request):
             'under_review_cases': Case.objects.filter(case_status='Under Review').count(),
             'closed_cases': Case.objects.filter(case_status='Closed').count(),
             'total_users': User.objects.count(),
-            'recent_cases': Case.objects.all().order_by('-date_created')[:5],
+            'recent_cases': Case.decrypt_many(Case.objects.order_by('-date_created')[:5]),
             'recent_audit_logs': CaseAuditLog.objects.all().order_by('-timestamp')[:5],
             'pending_approval_cases': pending_approval_cases,
             'cases_without_investigators': cases_without_investigators,
@@ -159,7 +159,7 @@ def dashboard(request):
             'open_cases': user_cases.filter(case_status='Open').count(),
             'under_review_cases': user_cases.filter(case_status='Under Review').count(),
             'closed_cases': user_cases.filter(case_status='Closed').count(),
-            'recent_cases': user_cases.order_by('-date_created')[:5],
+            'recent_cases': Case.decrypt_many(user_cases.order_by('-date_created')[:5]),
             'recent_audit_logs': CaseAuditLog.objects.filter(
                 case__created_by=request.user
             ).order_by('-timestamp')[:5],
@@ -189,7 +189,7 @@ def dashboard(request):
             'open_cases': assigned_cases.filter(case_status='Open').count(),
             'under_review_cases': assigned_cases.filter(case_status='Under Review').count(),
             'closed_cases': assigned_cases.filter(case_status='Closed').count(),
-            'recent_cases': assigned_cases.order_by('-date_created')[:5],
+            'recent_cases': Case.decrypt_many(assigned_cases.order_by('-date_created')[:5]),
             'recent_audit_logs': CaseAuditLog.objects.filter(
                 case__assigned_investigators=request.user
             ).order_by('-timestamp')[:5],
@@ -217,12 +217,12 @@ def dashboard(request):
             'open_cases': Case.objects.filter(case_status='Open').count(),
             'under_review_cases': Case.objects.filter(case_status='Under Review').count(),
             'closed_cases': Case.objects.filter(case_status='Closed').count(),
-            'recent_cases': Case.objects.all().order_by('-date_created')[:5],
+            'recent_cases': Case.decrypt_many(Case.objects.order_by('-date_created')[:5]),
         })
     elif user_role == 'custodian':
         context.update({
             'total_cases': Case.objects.count(),
-            'recent_cases': Case.objects.all().order_by('-date_created')[:5],
+            'recent_cases': Case.decrypt_many(Case.objects.order_by('-date_created')[:5]),
         })
     elif user_role == 'auditor':
         context.update({
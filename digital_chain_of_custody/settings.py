@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from decouple import config
 
@@ -27,6 +28,7 @@ INSTALLED_APPS = [
     "reports",
     "dashboard",
     "auditor",
+    "search",
 ]
 
 MIDDLEWARE = [
@@ -117,9 +119,40 @@ WHITENOISE_AUTOREFRESH = True
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+EVIDENCE_MAX_UPLOAD_SIZE = config(
+    "EVIDENCE_MAX_UPLOAD_SIZE", default=16 * 1024 * 1024 * 1024, cast=int
+)
+EVIDENCE_CHUNK_SIZE = config("EVIDENCE_CHUNK_SIZE", default=1024 * 1024, cast=int)
+EVIDENCE_CRYPTO_WORKERS = config(
+    "EVIDENCE_CRYPTO_WORKERS", default=min(4, os.cpu_count() or 1), cast=int
+)
+FILE_UPLOAD_TEMP_DIR = config("FILE_UPLOAD_TEMP_DIR", default=None)
+EVIDENCE_ASYNC_METADATA = config("EVIDENCE_ASYNC_METADATA", default=True, cast=bool)
+EVIDENCE_UPLOAD_CHUNK_SIZE = config(
+    "EVIDENCE_UPLOAD_CHUNK_SIZE", default=8 * 1024 * 1024, cast=int
+)
+EVIDENCE_UPLOAD_STAGING_DIR = config(
+    "EVIDENCE_UPLOAD_STAGING_DIR", default=str(BASE_DIR / "upload_staging")
+)
+EVIDENCE_BATCH_WORKERS = config(
+    "EVIDENCE_BATCH_WORKERS", default=min(4, os.cpu_count() or 1), cast=int
+)
+EVIDENCE_BATCH_MAX_FILES = config("EVIDENCE_BATCH_MAX_FILES", default=1000, cast=int)
+DATA_UPLOAD_MAX_NUMBER_FILES = EVIDENCE_BATCH_MAX_FILES
+EVIDENCE_METADATA_CACHE_SIZE = config("EVIDENCE_METADATA_CACHE_SIZE", default=10000, cast=int)
+EVIDENCE_FIXITY_RATE_MB = config("EVIDENCE_FIXITY_RATE_MB", default=400, cast=float)
+CASE_BLIND_INDEX_KEY = config("CASE_BLIND_INDEX_KEY", default="")
+ENCRYPTION_MASTER_KEY_FILE = config("ENCRYPTION_MASTER_KEY_FILE", default="")
+ENCRYPTION_MASTER_KEY = config("ENCRYPTION_MASTER_KEY", default="")
+ENCRYPTION_ALLOW_DEVELOPMENT_KEY = config("ENCRYPTION_ALLOW_DEVELOPMENT_KEY", default=DEBUG, cast=bool)
+ENCRYPTION_KEY_CACHE_SIZE = config("ENCRYPTION_KEY_CACHE_SIZE", default=1024, cast=int)
+ENCRYPTION_KEY_CACHE_TTL = config("ENCRYPTION_KEY_CACHE_TTL", default=300, cast=int)
+
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+TEST_RUNNER = "digital_chain_of_custody.test_runner.TestRunner"
+
 LOGIN_URL = "accounts:login"
 LOGIN_REDIRECT_URL = "dashboard:dashboard"
 LOGOUT_REDIRECT_URL = "accounts:logout"
@@ -0,0 +1,19 @@
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Runs the suite with the development master key allowed.
+
+    Tests that need a configured master key, or none at all, override the
+    encryption settings themselves.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.development_key = override_settings(ENCRYPTION_ALLOW_DEVELOPMENT_KEY=True)
+        self.development_key.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.development_key.disable()
+        super().teardown_test_environment(**kwargs)
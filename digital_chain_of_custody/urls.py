@@ -13,6 +13,7 @@ urlpatterns = [
     path("evidence/", include("evidence.urls")),
     path("reports/", include("reports.urls")),
     path("auditor/", include("auditor.urls")),
+    path("search/", include("search.urls")),
 ]
 
 if settings.DEBUG:
@@ -1,12 +1,26 @@
 from django.contrib import admin
-from .models import Evidence, EvidenceAuditLog
+
+from cases.admin import CaseBlindIndexSearchMixin
+from .models import (
+    Evidence,
+    EvidenceAuditLog,
+    EvidenceBlob,
+    EvidenceMerkleTree,
+    EvidencePreview,
+    FixitySweepRun,
+    ImageFingerprint,
+    MetadataCacheEntry,
+    MetadataExtractionJob,
+    MetadataRevalidationRun,
+    UploadSession,
+)
 
 
 @admin.register(Evidence)
-class EvidenceAdmin(admin.ModelAdmin):
+class EvidenceAdmin(CaseBlindIndexSearchMixin, admin.ModelAdmin):
     list_display = ['id', 'case', 'description', 'media_type', 'media_status', 'date_uploaded', 'uploaded_by']
     list_filter = ['media_type', 'media_status', 'date_uploaded']
-    search_fields = ['description', 'case__case_title']
+    search_fields = ['description', 'case__case_id']
     readonly_fields = ['date_uploaded']
 
 
@@ -16,3 +30,67 @@ class EvidenceAuditLogAdmin(admin.ModelAdmin):
     list_filter = ['action', 'timestamp']
     search_fields = ['action', 'details', 'user__username']
     readonly_fields = ['timestamp']
+
+
+@admin.register(MetadataExtractionJob)
+class MetadataExtractionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'evidence', 'status', 'attempts', 'worker', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'case', 'user', 'original_filename', 'status', 'received_bytes', 'total_size', 'updated_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(EvidenceBlob)
+class EvidenceBlobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'case', 'sha256', 'plaintext_size', 'stored_size', 'ref_count', 'fixity_status', 'fixity_checked_at', 'created_at']
+    list_filter = ['fixity_status']
+    search_fields = ['sha256', 'ciphertext_sha256']
+    readonly_fields = ['created_at', 'ciphertext_sha256']
+
+
+@admin.register(EvidenceMerkleTree)
+class EvidenceMerkleTreeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'evidence', 'chunk_size', 'leaf_count']
+    exclude = ['leaves']
+
+
+@admin.register(EvidencePreview)
+class EvidencePreviewAdmin(admin.ModelAdmin):
+    list_display = ['id', 'evidence', 'size', 'width', 'height', 'created_at']
+    list_filter = ['size']
+    readonly_fields = ['created_at']
+
+
+@admin.register(ImageFingerprint)
+class ImageFingerprintAdmin(admin.ModelAdmin):
+    list_display = ['id', 'evidence', 'dhash', 'created_at']
+    search_fields = ['dhash']
+    readonly_fields = ['dhash', 'band_0', 'band_1', 'band_2', 'band_3', 'created_at']
+
+
+@admin.register(MetadataCacheEntry)
+class MetadataCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'extractor_version', 'metadata_valid', 'hits', 'last_used_at']
+    list_filter = ['extractor_version', 'metadata_valid']
+    search_fields = ['sha256']
+    readonly_fields = ['created_at', 'last_used_at']
+
+
+@admin.register(MetadataRevalidationRun)
+class MetadataRevalidationRunAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'processed', 'changed', 'last_pk', 'started_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['started_at', 'updated_at', 'finished_at']
+
+
+@admin.register(FixitySweepRun)
+class FixitySweepRunAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'checked', 'failures', 'bytes_read', 'last_pk', 'started_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['started_at', 'updated_at', 'finished_at']
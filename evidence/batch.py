@@ -0,0 +1,358 @@
+import mimetypes
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from PIL import UnidentifiedImageError
+
+from . import merkle, perceptual_hash
+from .crypto import SegmentedBlobWriter
+from .forms import detect_media_type
+from .ingest import IngestResult
+from .metadata_extractor import MetadataExtractor
+from .models import (
+    Evidence,
+    EvidenceAuditLog,
+    EvidenceBlob,
+    EvidenceMerkleTree,
+    ImageFingerprint,
+    MetadataCacheEntry,
+)
+
+ARCHIVE_COPY_SIZE = 1024 * 1024
+
+
+# Pool workers. These run in child processes and must only touch the files they
+# are given: no ORM access and no settings lookups.
+
+def _digest_and_extract(path, original_filename, media_type):
+    with open(path, 'rb') as f:
+        metadata = MetadataExtractor.extract_all_metadata(f, original_filename)
+        dhash = None
+        if media_type == 'image':
+            f.seek(0)
+            try:
+                dhash = perceptual_hash.dhash(f)
+            except (UnidentifiedImageError, OSError):
+                pass
+        # The pool already spreads files across cores, so leaves hash inline.
+        f.seek(0)
+        tree = merkle.MerkleBuilder()
+        for chunk in iter(lambda: f.read(merkle.CHUNK_SIZE), b''):
+            tree.update(chunk)
+    return metadata, dhash, tree.finish()
+
+
+def _encrypt_to(path, case_key, out_path, chunk_size):
+    with open(path, 'rb') as src, open(out_path, 'wb') as out:
+        writer = SegmentedBlobWriter(case_key, out)
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            writer.write(chunk)
+        writer.close()
+    return out_path
+
+
+@dataclass
+class BatchItem:
+    path: str
+    original_filename: str
+    media_type: str
+    metadata: Dict = field(default_factory=dict)
+    dhash: Optional[int] = None
+    merkle_leaves: List[bytes] = field(default_factory=list)
+
+    @property
+    def sha256(self):
+        return self.metadata['file_level']['hashes']['sha256']
+
+    @property
+    def md5(self):
+        return self.metadata['file_level']['hashes']['md5']
+
+    @property
+    def size(self):
+        return self.metadata['file_level']['file_size']
+
+
+class BatchEvidenceIngest:
+    """Ingests many evidence files for one case with a bounded process pool.
+
+    Files are staged on local disk, then hashed, metadata-extracted and
+    perceptually hashed in the pool. Content already stored for the case, or
+    repeated within the batch, is linked to its existing blob; only new content
+    goes through a second pool pass for encryption. Every row the single-file
+    upload writes (evidence, audit, storage and custody logs, fingerprints, Merkle
+    trees) is then inserted with ``bulk_create`` in one transaction. New blob files
+    are written to storage before it opens and deleted if it rolls back.
+    """
+
+    def __init__(self, case, user, description, workers=None):
+        self.case = case
+        self.user = user
+        self.description = description
+        self.workers = workers or settings.EVIDENCE_BATCH_WORKERS
+        self.staging = tempfile.TemporaryDirectory(dir=settings.FILE_UPLOAD_TEMP_DIR)
+        self.items: List[BatchItem] = []
+        self.total_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.staging.cleanup()
+
+    def _stage_path(self):
+        return os.path.join(self.staging.name, str(len(self.items)))
+
+    def _check_limits(self, size):
+        if len(self.items) >= settings.EVIDENCE_BATCH_MAX_FILES:
+            raise ValidationError(
+                f"A batch cannot contain more than {settings.EVIDENCE_BATCH_MAX_FILES} files"
+            )
+        self.total_size += size
+        if size > settings.EVIDENCE_MAX_UPLOAD_SIZE or self.total_size > settings.EVIDENCE_MAX_UPLOAD_SIZE:
+            raise ValidationError(
+                f"Batch exceeds the {MetadataExtractor.human_readable_size(settings.EVIDENCE_MAX_UPLOAD_SIZE)} upload limit"
+            )
+
+    def add_upload(self, uploaded_file):
+        """Stage an uploaded file as one evidence item."""
+        self._check_limits(uploaded_file.size)
+        path = self._stage_path()
+        with open(path, 'wb') as out:
+            for chunk in uploaded_file.chunks():
+                out.write(chunk)
+        self.items.append(BatchItem(
+            path=path,
+            original_filename=os.path.basename(uploaded_file.name),
+            media_type=detect_media_type(uploaded_file.content_type, uploaded_file.name),
+        ))
+
+    def add_archive(self, uploaded_file):
+        """Expand a ZIP archive, staging each regular member as an evidence item."""
+        try:
+            archive = zipfile.ZipFile(uploaded_file)
+        except zipfile.BadZipFile:
+            raise ValidationError(f"{uploaded_file.name} is not a valid ZIP archive")
+
+        with archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or info.filename.startswith('__MACOSX/'):
+                    continue
+                self._check_limits(info.file_size)
+                path = self._stage_path()
+                # Limits are checked against the declared sizes; zipfile stops reading
+                # at the declared size and verifies the CRC, so a forged header
+                # cannot write more than was accounted for.
+                try:
+                    with archive.open(info) as src, open(path, 'wb') as out:
+                        shutil.copyfileobj(src, out, ARCHIVE_COPY_SIZE)
+                except zipfile.BadZipFile:
+                    raise ValidationError(f"Archive member {info.filename} is corrupt")
+                self.items.append(BatchItem(
+                    path=path,
+                    original_filename=name,
+                    media_type=detect_media_type(mimetypes.guess_type(name)[0], name),
+                ))
+
+    def _map(self, executor, fn, *iterables):
+        if executor is None:
+            return list(map(fn, *iterables))
+        return list(executor.map(fn, *iterables))
+
+    def run(self) -> List[Evidence]:
+        if not self.items:
+            raise ValidationError("No files were provided")
+
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            results = self._map(
+                executor,
+                _digest_and_extract,
+                [item.path for item in self.items],
+                [item.original_filename for item in self.items],
+                [item.media_type for item in self.items],
+            )
+            for item, (item_metadata, dhash, merkle_leaves) in zip(self.items, results):
+                item.metadata = item_metadata
+                item.dhash = dhash
+                item.merkle_leaves = merkle_leaves
+
+            refs: Dict[str, List[BatchItem]] = {}
+            for item in self.items:
+                refs.setdefault(item.sha256, []).append(item)
+            ciphertexts = self._encrypt_new_content(executor, refs)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        prepared = self._write_new_blobs(refs, ciphertexts)
+        try:
+            with transaction.atomic():
+                blobs = self._link_blobs(refs, prepared)
+                return self._create_evidence(blobs)
+        except BaseException:
+            # The rows are gone with the rollback; take the files with them.
+            self._discard(prepared)
+            raise
+
+    def _encrypt_new_content(self, executor, refs) -> Dict[str, str]:
+        """Encrypt one copy of every digest the case does not store yet."""
+        stored = set(
+            EvidenceBlob.objects.filter(case=self.case, sha256__in=refs).values_list('sha256', flat=True)
+        )
+        new_content = [items[0] for sha256, items in refs.items() if sha256 not in stored]
+        key = self.case.encryption_key.key
+        paths = self._map(
+            executor,
+            _encrypt_to,
+            [item.path for item in new_content],
+            [key] * len(new_content),
+            [f"{item.path}.enc" for item in new_content],
+            [settings.EVIDENCE_CHUNK_SIZE] * len(new_content),
+        )
+        return {item.sha256: path for item, path in zip(new_content, paths)}
+
+    def _write_new_blobs(self, refs, ciphertexts) -> Dict[str, EvidenceBlob]:
+        """Write every new ciphertext to storage, before the transaction opens."""
+        prepared: Dict[str, EvidenceBlob] = {}
+        try:
+            for sha256, path in ciphertexts.items():
+                prepared[sha256] = self._prepare_blob(refs[sha256], path)
+        except BaseException:
+            self._discard(prepared)
+            raise
+        return prepared
+
+    def _prepare_blob(self, items, path) -> EvidenceBlob:
+        item = items[0]
+        digests = IngestResult(sha256=item.sha256, md5=item.md5, size=item.size)
+        with open(path, 'rb') as ciphertext:
+            return EvidenceBlob.prepare(self.case, digests, File(ciphertext), refs=len(items))
+
+    def _discard(self, prepared):
+        for blob in prepared.values():
+            blob.file.delete(save=False)
+
+    def _link_blobs(self, refs, prepared) -> Dict[str, EvidenceBlob]:
+        blobs: Dict[str, EvidenceBlob] = {}
+        for sha256, items in refs.items():
+            blob = EvidenceBlob.acquire(self.case, sha256, refs=len(items))
+            if blob is None:
+                if sha256 not in prepared:
+                    # The blob was released since the content was checked.
+                    item = items[0]
+                    path = _encrypt_to(
+                        item.path, self.case.encryption_key.key, f"{item.path}.enc", settings.EVIDENCE_CHUNK_SIZE
+                    )
+                    prepared[sha256] = self._prepare_blob(items, path)
+                blob = prepared[sha256].insert()
+            elif sha256 in prepared:
+                # A concurrent upload stored the content first.
+                prepared[sha256].file.delete(save=False)
+            blobs[sha256] = blob
+        return blobs
+
+    def _create_evidence(self, blobs) -> List[Evidence]:
+        from custody.models import CustodyLog, EvidenceStorage, StorageLog
+
+        evidence = []
+        results = []
+        for item in self.items:
+            is_valid, issues = MetadataExtractor.validate_metadata_integrity(item.metadata)
+            results.append((item.metadata, is_valid, issues))
+            blob = blobs[item.sha256]
+            row = Evidence(
+                case=self.case,
+                media=blob.file.name,
+                blob=blob,
+                description=self.description,
+                media_type=item.media_type,
+                media_status='Valid' if is_valid else 'Invalid',
+                uploaded_by=self.user,
+                original_filename=item.original_filename,
+                sha256_hash=item.sha256,
+                md5_hash=item.md5,
+                file_size=item.size,
+                metadata=item.metadata,
+                metadata_valid=is_valid,
+                metadata_issues=issues,
+                metadata_status='complete',
+                merkle_root=merkle.root(item.merkle_leaves).hex(),
+            )
+            row.populate_indexed_metadata()
+            evidence.append(row)
+        evidence = Evidence.objects.bulk_create(evidence)
+        MetadataCacheEntry.store(results)
+
+        EvidenceAuditLog.objects.bulk_create([
+            EvidenceAuditLog(
+                user=self.user,
+                evidence=item,
+                action="Evidence Uploaded",
+                details=f"File: {item.original_filename}, SHA256: {item.sha256_hash}, batch of {len(evidence)}",
+            )
+            for item in evidence
+        ])
+
+        EvidenceMerkleTree.objects.bulk_create([
+            EvidenceMerkleTree(evidence=row, leaves=merkle.pack(item.merkle_leaves))
+            for row, item in zip(evidence, self.items)
+        ])
+
+        ImageFingerprint.objects.bulk_create([
+            ImageFingerprint.from_hash(row, item.dhash)
+            for row, item in zip(evidence, self.items)
+            if item.dhash is not None
+        ])
+
+        case_storage = getattr(self.case, 'storage', None)
+        storage_location = case_storage.storage_locations.first() if case_storage else None
+        if storage_location:
+            EvidenceStorage.objects.bulk_create([
+                EvidenceStorage(evidence=item, storage_location=storage_location)
+                for item in evidence
+            ])
+            StorageLog.objects.bulk_create([
+                StorageLog(
+                    storage=case_storage,
+                    user=self.user,
+                    action="upload",
+                    details=f"Evidence {item.original_filename} uploaded to {case_storage.storage_name}",
+                )
+                for item in evidence
+            ])
+            CustodyLog.objects.bulk_create([
+                CustodyLog(
+                    case=self.case,
+                    evidence=item,
+                    user=self.user,
+                    action="stored",
+                    details=f"Evidence {item.original_filename} stored in {case_storage.storage_name}",
+                    to_location=storage_location,
+                )
+                for item in evidence
+            ])
+
+        return evidence
+
+
+def detect_archive(uploaded_file) -> bool:
+    """Return whether ``uploaded_file`` should be expanded as a ZIP archive."""
+    if not uploaded_file.name.lower().endswith('.zip'):
+        return False
+    is_zip = zipfile.is_zipfile(uploaded_file)
+    uploaded_file.seek(0)
+    return is_zip
@@ -0,0 +1,249 @@
+"""Evidence blob formats.
+
+Version 1 blobs are a single AES-256-CBC/PKCS7 stream under the case key and IV.
+
+Version 2 blobs are a segmented container::
+
+    header   magic (8) | version (1) | reserved (3) | segment size (4) | salt (16)
+    segment  AES-256-GCM ciphertext of up to ``segment size`` bytes | tag (16)
+    ...
+
+Each blob gets its own AES-GCM key, derived from the case key and the random salt
+with HKDF, so segment nonces can simply be the segment index. The header, the
+segment index and a final-segment flag are bound into every tag, which makes
+segments tamper-evident individually and stops reordering or truncation.
+"""
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+BLOCK_SIZE = 16
+
+V2_MAGIC = b'DCOCBLOB'
+V2_VERSION = 2
+V2_HEADER = struct.Struct('>8sB3xI16s')
+V2_TAG_SIZE = 16
+V2_DEFAULT_SEGMENT_SIZE = 1024 * 1024
+
+
+class SegmentIntegrityError(Exception):
+    """Raised when a v2 segment fails authentication."""
+
+    def __init__(self, segment_index):
+        self.segment_index = segment_index
+        super().__init__(f'Evidence blob segment {segment_index} failed integrity check')
+
+
+def detect_format(encrypted_file: BinaryIO) -> int:
+    """Return the blob format version of ``encrypted_file`` and rewind it."""
+    encrypted_file.seek(0)
+    magic = encrypted_file.read(len(V2_MAGIC))
+    encrypted_file.seek(0)
+    return V2_VERSION if magic == V2_MAGIC else 1
+
+
+# Version 1: AES-CBC --------------------------------------------------------
+
+def iter_decrypt(encrypted_file: BinaryIO, cipher, chunk_size: int) -> Iterator[bytes]:
+    """Yield plaintext from an AES-CBC/PKCS7 blob as it is decrypted.
+
+    The final cipher block is held back until the end of the stream so that the
+    PKCS7 padding is only stripped once, from the last block.
+    """
+    decryptor = cipher.decryptor()
+    pending = b''
+
+    while True:
+        chunk = encrypted_file.read(chunk_size)
+        if not chunk:
+            break
+        pending += decryptor.update(chunk)
+        if len(pending) > BLOCK_SIZE:
+            yield pending[:-BLOCK_SIZE]
+            pending = pending[-BLOCK_SIZE:]
+
+    unpadder = padding.PKCS7(128).unpadder()
+    final = unpadder.update(pending + decryptor.finalize()) + unpadder.finalize()
+    if final:
+        yield final
+
+
+def iter_decrypt_range(encrypted_file: BinaryIO, make_cipher, start: int, end: int,
+                       chunk_size: int) -> Iterator[bytes]:
+    """Yield plaintext bytes ``start``..``end`` (inclusive) of an AES-CBC blob.
+
+    CBC decryption of block ``n`` only needs ciphertext block ``n - 1`` as its IV,
+    so the stream seeks straight to the block containing ``start`` instead of
+    decrypting from offset zero. ``make_cipher(iv)`` builds a cipher for the case
+    key with the given IV, or with the stored IV when ``iv`` is ``None``. Callers
+    clamp ``end`` to the plaintext size, so the padding block is never returned.
+    """
+    first_block = start // BLOCK_SIZE
+    last_block = end // BLOCK_SIZE
+
+    iv = None
+    if first_block > 0:
+        encrypted_file.seek((first_block - 1) * BLOCK_SIZE)
+        iv = encrypted_file.read(BLOCK_SIZE)
+    else:
+        encrypted_file.seek(0)
+    decryptor = make_cipher(iv).decryptor()
+
+    skip = start - first_block * BLOCK_SIZE
+    remaining = end - start + 1
+    to_read = (last_block - first_block + 1) * BLOCK_SIZE
+    chunk_size -= chunk_size % BLOCK_SIZE
+
+    while remaining > 0 and to_read > 0:
+        chunk = encrypted_file.read(min(chunk_size, to_read))
+        if not chunk:
+            break
+        to_read -= len(chunk)
+        plaintext = decryptor.update(chunk)[skip:]
+        skip = 0
+        plaintext = plaintext[:remaining]
+        remaining -= len(plaintext)
+        if plaintext:
+            yield plaintext
+
+
+# Version 2: segmented AES-GCM ---------------------------------------------
+
+def _derive_blob_key(case_key: bytes, salt: bytes) -> AESGCM:
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b'dcoc-evidence-blob-v2')
+    return AESGCM(hkdf.derive(case_key))
+
+
+def _segment_nonce(index: int) -> bytes:
+    return index.to_bytes(12, 'big')
+
+
+def _segment_aad(header: bytes, index: int, final: bool) -> bytes:
+    return header + struct.pack('>Q?', index, final)
+
+
+class SegmentedBlobWriter:
+    """Writes a v2 evidence blob, encrypting segments across a thread pool.
+
+    At most ``workers * 2`` segments are buffered, so memory stays bounded by the
+    segment size no matter how large the evidence is.
+    """
+
+    def __init__(self, case_key: bytes, out: BinaryIO, segment_size: int = V2_DEFAULT_SEGMENT_SIZE,
+                 workers: int = 1):
+        self.out = out
+        self.segment_size = segment_size
+        self.workers = max(1, workers)
+        salt = os.urandom(16)
+        self.header = V2_HEADER.pack(V2_MAGIC, V2_VERSION, segment_size, salt)
+        self.aead = _derive_blob_key(case_key, salt)
+        self.buffer = bytearray()
+        self.pending: List[bytes] = []
+        self.index = 0
+        self.executor = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        out.write(self.header)
+
+    def _encrypt(self, job):
+        index, data, final = job
+        return self.aead.encrypt(_segment_nonce(index), data, _segment_aad(self.header, index, final))
+
+    def _flush(self, final=False):
+        jobs = []
+        for position, data in enumerate(self.pending):
+            is_final = final and position == len(self.pending) - 1
+            jobs.append((self.index, data, is_final))
+            self.index += 1
+        self.pending = []
+        mapper = self.executor.map if self.executor else map
+        for segment in mapper(self._encrypt, jobs):
+            self.out.write(segment)
+
+    def write(self, data: bytes):
+        self.buffer += data
+        # Keep at least one byte back: only close() knows which segment is final.
+        while len(self.buffer) > self.segment_size:
+            self.pending.append(bytes(self.buffer[:self.segment_size]))
+            del self.buffer[:self.segment_size]
+            if len(self.pending) >= self.workers * 2:
+                self._flush()
+
+    def close(self):
+        self.pending.append(bytes(self.buffer))
+        self.buffer = bytearray()
+        self._flush(final=True)
+        if self.executor:
+            self.executor.shutdown()
+
+
+class SegmentedBlobReader:
+    """Random-access reader for v2 evidence blobs."""
+
+    def __init__(self, case_key: bytes, encrypted_file: BinaryIO, workers: int = 1):
+        self.file = encrypted_file
+        self.workers = max(1, workers)
+        encrypted_file.seek(0)
+        self.header = encrypted_file.read(V2_HEADER.size)
+        magic, version, self.segment_size, salt = V2_HEADER.unpack(self.header)
+        if magic != V2_MAGIC or version != V2_VERSION:
+            raise ValueError('Not a version 2 evidence blob')
+        self.aead = _derive_blob_key(case_key, salt)
+
+        encrypted_file.seek(0, os.SEEK_END)
+        body_size = encrypted_file.tell() - V2_HEADER.size
+        stored_segment = self.segment_size + V2_TAG_SIZE
+        self.segment_count = max(1, -(-body_size // stored_segment))
+        self.plaintext_size = body_size - self.segment_count * V2_TAG_SIZE
+
+    def _read_segment(self, index: int) -> bytes:
+        self.file.seek(V2_HEADER.size + index * (self.segment_size + V2_TAG_SIZE))
+        return self.file.read(self.segment_size + V2_TAG_SIZE)
+
+    def _decrypt(self, job) -> bytes:
+        index, stored = job
+        final = index == self.segment_count - 1
+        try:
+            return self.aead.decrypt(_segment_nonce(index), stored, _segment_aad(self.header, index, final))
+        except InvalidTag:
+            raise SegmentIntegrityError(index) from None
+
+    def iter_segments(self, first: int = 0, last: int = None) -> Iterator[bytes]:
+        """Yield decrypted segments ``first``..``last``, decrypting a window in parallel."""
+        last = self.segment_count - 1 if last is None else last
+        window = self.workers * 2
+        executor = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            for batch_start in range(first, last + 1, window):
+                batch_end = min(batch_start + window, last + 1)
+                jobs = [(index, self._read_segment(index)) for index in range(batch_start, batch_end)]
+                mapper = executor.map if executor else map
+                yield from mapper(self._decrypt, jobs)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def iter_range(self, start: int, end: int) -> Iterator[bytes]:
+        """Yield plaintext bytes ``start``..``end`` (inclusive), decrypting only the segments they span."""
+        first = start // self.segment_size
+        last = end // self.segment_size
+        offset = first * self.segment_size
+        for segment in self.iter_segments(first, last):
+            piece = segment[max(start - offset, 0):end - offset + 1]
+            offset += len(segment)
+            if piece:
+                yield piece
+
+    def corrupted_segments(self) -> List[int]:
+        """Return the indices of every segment that fails authentication."""
+        corrupted = []
+        for index in range(self.segment_count):
+            try:
+                self._decrypt((index, self._read_segment(index)))
+            except SegmentIntegrityError:
+                corrupted.append(index)
+        return corrupted
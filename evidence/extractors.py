@@ -0,0 +1,613 @@
+"""Format-specific metadata extractors for non-image evidence.
+
+Each extractor recognises its format from the first bytes of the file and then
+reads only the structures it needs, seeking over everything else, so even very
+large recordings or documents are never read in full. Extractors register
+themselves with ``register`` and are tried in registration order.
+"""
+import codecs
+import re
+import struct
+import zipfile
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+EXTRACTORS: List[type] = []
+
+
+def register(extractor):
+    EXTRACTORS.append(extractor)
+    return extractor
+
+
+def find_extractor(header: bytes) -> Tuple[Optional[str], Optional[type]]:
+    """Return the detected format name and the extractor that handles ``header``."""
+    for extractor in EXTRACTORS:
+        file_format = extractor.match(header)
+        if file_format:
+            return file_format, extractor
+    return None, None
+
+
+class FormatExtractor:
+    """Base class: ``match`` inspects the header, ``extract`` reads a seekable stream."""
+
+    @classmethod
+    def match(cls, header: bytes) -> Optional[str]:
+        raise NotImplementedError
+
+    @classmethod
+    def extract(cls, stream, file_size: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+def _read_at(stream, offset: int, size: int) -> bytes:
+    stream.seek(offset)
+    return stream.read(size)
+
+
+# ISO base media (MP4, MOV, M4A, HEIC) ---------------------------------------
+
+MAC_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+BMFF_CONTAINERS = {b'moov', b'trak', b'mdia', b'udta'}
+BMFF_MAX_LEAF = 64 * 1024
+
+
+@register
+class IsoMediaExtractor(FormatExtractor):
+    """Walks MP4/QuickTime atoms, reading only the movie and track headers."""
+
+    BRANDS = {
+        b'qt  ': 'MOV',
+        b'M4A ': 'M4A',
+        b'M4V ': 'M4V',
+        b'heic': 'HEIC',
+        b'heix': 'HEIC',
+        b'mif1': 'HEIF',
+        b'3gp4': '3GP',
+        b'3gp5': '3GP',
+    }
+
+    @classmethod
+    def match(cls, header):
+        if header[4:8] != b'ftyp':
+            return None
+        return cls.BRANDS.get(header[8:12], 'MP4')
+
+    @classmethod
+    def extract(cls, stream, file_size):
+        details = {'track_count': 0, 'has_video': False, 'has_audio': False}
+        ftyp = cls._boxes(stream, 0, file_size)
+        for box_type, payload_start, payload_size in ftyp:
+            if box_type == b'ftyp':
+                data = _read_at(stream, payload_start, min(payload_size, 256))
+                details['major_brand'] = data[:4].decode('latin-1').strip()
+                details['compatible_brands'] = ', '.join(
+                    data[i:i + 4].decode('latin-1').strip() for i in range(8, len(data) - 3, 4)
+                )
+            elif box_type == b'moov':
+                cls._walk(stream, payload_start, payload_start + payload_size, details, {})
+        return details
+
+    @staticmethod
+    def _boxes(stream, start, end):
+        offset = start
+        while offset + 8 <= end:
+            header = _read_at(stream, offset, 16)
+            if len(header) < 8:
+                return
+            size, box_type = struct.unpack('>I4s', header[:8])
+            header_size = 8
+            if size == 1:
+                if len(header) < 16:
+                    return
+                size = struct.unpack('>Q', header[8:16])[0]
+                header_size = 16
+            elif size == 0:
+                size = end - offset
+            if size < header_size:
+                return
+            yield box_type, offset + header_size, size - header_size
+            offset += size
+
+    @classmethod
+    def _walk(cls, stream, start, end, details, track):
+        for box_type, payload_start, payload_size in cls._boxes(stream, start, end):
+            if box_type in BMFF_CONTAINERS:
+                child_track = {} if box_type == b'trak' else track
+                cls._walk(stream, payload_start, payload_start + payload_size, details, child_track)
+                if box_type == b'trak':
+                    cls._add_track(details, child_track)
+            elif payload_size <= BMFF_MAX_LEAF:
+                parser = getattr(cls, f"_parse_{box_type.decode('latin-1').strip().replace(chr(0xA9), 'c')}", None)
+                if parser:
+                    parser(_read_at(stream, payload_start, payload_size), details, track)
+
+    @staticmethod
+    def _mac_time(seconds):
+        if not seconds:
+            return None
+        return (MAC_EPOCH + timedelta(seconds=seconds)).isoformat()
+
+    @classmethod
+    def _parse_mvhd(cls, data, details, track):
+        if data[0] == 1:
+            created, modified, timescale, duration = struct.unpack('>QQIQ', data[4:32])
+        else:
+            created, modified, timescale, duration = struct.unpack('>IIII', data[4:20])
+        details['creation_time'] = cls._mac_time(created)
+        details['modification_time'] = cls._mac_time(modified)
+        if timescale:
+            details['duration_seconds'] = round(duration / timescale, 3)
+
+    @staticmethod
+    def _parse_tkhd(data, details, track):
+        offset = 4 + (84 if data[0] == 1 else 72)
+        if len(data) >= offset + 8:
+            width, height = struct.unpack('>II', data[offset:offset + 8])
+            track['width'] = width >> 16
+            track['height'] = height >> 16
+
+    @staticmethod
+    def _parse_hdlr(data, details, track):
+        track['handler'] = data[8:12]
+
+    @staticmethod
+    def _parse_cxyz(data, details, track):
+        # QuickTime location: 16-bit length, 16-bit language, ISO 6709 string.
+        length = struct.unpack('>H', data[:2])[0]
+        details['location'] = data[4:4 + length].decode('utf-8', 'replace')
+
+    @staticmethod
+    def _add_track(details, track):
+        details['track_count'] += 1
+        if track.get('handler') == b'vide':
+            details['has_video'] = True
+            if track.get('width'):
+                details['video_width'] = track['width']
+                details['video_height'] = track['height']
+        elif track.get('handler') == b'soun':
+            details['has_audio'] = True
+
+
+# RIFF (WAV, AVI) -------------------------------------------------------------
+
+RIFF_INFO_TAGS = {
+    b'INAM': 'title',
+    b'IART': 'artist',
+    b'ICRD': 'creation_date',
+    b'ISFT': 'software',
+    b'ICMT': 'comment',
+}
+
+
+@register
+class RiffExtractor(FormatExtractor):
+    """Reads RIFF chunk headers; the ``fmt`` and ``LIST/INFO`` chunks are the only ones loaded."""
+
+    FORMS = {b'WAVE': 'WAV', b'AVI ': 'AVI'}
+
+    @classmethod
+    def match(cls, header):
+        if header[:4] != b'RIFF':
+            return None
+        return cls.FORMS.get(header[8:12])
+
+    @classmethod
+    def extract(cls, stream, file_size):
+        header = _read_at(stream, 0, 12)
+        details = {'riff_form': header[8:12].decode('latin-1').strip()}
+        declared = struct.unpack('<I', header[4:8])[0] + 8
+        if declared != file_size:
+            details['declared_size_mismatch'] = True
+
+        offset = 12
+        while offset + 8 <= file_size:
+            chunk_id, size = struct.unpack('<4sI', _read_at(stream, offset, 8))
+            payload = offset + 8
+            if chunk_id == b'fmt ':
+                cls._parse_fmt(_read_at(stream, payload, min(size, 64)), details)
+            elif chunk_id == b'data':
+                details['data_bytes'] = size
+            elif chunk_id == b'LIST' and size <= BMFF_MAX_LEAF:
+                cls._parse_list(_read_at(stream, payload, size), details)
+            offset = payload + size + (size & 1)
+
+        if details.get('data_bytes') and details.get('byte_rate'):
+            details['duration_seconds'] = round(details['data_bytes'] / details['byte_rate'], 3)
+        return details
+
+    @staticmethod
+    def _parse_fmt(data, details):
+        if len(data) < 16:
+            return
+        audio_format, channels, sample_rate, byte_rate, _, bits = struct.unpack('<HHIIHH', data[:16])
+        details.update({
+            'audio_format': audio_format,
+            'channels': channels,
+            'sample_rate': sample_rate,
+            'byte_rate': byte_rate,
+            'bits_per_sample': bits,
+        })
+
+    @staticmethod
+    def _parse_list(data, details):
+        if data[:4] != b'INFO':
+            return
+        offset = 4
+        while offset + 8 <= len(data):
+            tag, size = struct.unpack('<4sI', data[offset:offset + 8])
+            if tag in RIFF_INFO_TAGS:
+                value = data[offset + 8:offset + 8 + size].split(b'\x00', 1)[0]
+                details[RIFF_INFO_TAGS[tag]] = value.decode('latin-1')
+            offset += 8 + size + (size & 1)
+
+
+# PDF -------------------------------------------------------------------------
+
+PDF_TAIL_SIZE = 2048
+PDF_OBJECT_READ = 8192
+PDF_MAX_XREF_STREAM = 4 * 1024 * 1024
+PDF_MAX_XREF_ROWS_SIZE = 16 * 1024 * 1024  # decompressed, so a crafted stream cannot inflate without bound
+PDF_MAX_REVISIONS = 256
+PDF_INFO_KEYS = ('Title', 'Author', 'Subject', 'Creator', 'Producer', 'CreationDate', 'ModDate')
+
+
+@register
+class PdfExtractor(FormatExtractor):
+    """Follows the trailer and cross-reference chain from the end of the file.
+
+    Only the tail, each cross-reference section header and the document
+    information object are read. The number of cross-reference sections is the
+    number of times the file was saved incrementally.
+    """
+
+    @classmethod
+    def match(cls, header):
+        return 'PDF' if header.startswith(b'%PDF-') else None
+
+    @classmethod
+    def extract(cls, stream, file_size):
+        header = _read_at(stream, 0, 16)
+        details = {'version': header[5:8].decode('latin-1')}
+
+        tail = _read_at(stream, max(0, file_size - PDF_TAIL_SIZE), PDF_TAIL_SIZE)
+        match = re.search(rb'startxref\s+(\d+)', tail[tail.rfind(b'startxref'):]) if b'startxref' in tail else None
+        if not match:
+            details['error'] = 'startxref not found'
+            return details
+
+        trailer, sections, seen = {}, 0, set()
+        offset = int(match.group(1))
+        while offset is not None and offset not in seen and sections < PDF_MAX_REVISIONS:
+            seen.add(offset)
+            section = cls._read_xref_section(stream, offset)
+            if section is None:
+                break
+            sections += 1
+            for key, value in section['trailer'].items():
+                trailer.setdefault(key, value)
+            if 'info_offset' not in trailer and section['trailer'].get('Info') is not None:
+                info_offset = section['lookup'](section['trailer']['Info'])
+                if info_offset is not None:
+                    trailer['info_offset'] = info_offset
+            offset = section['trailer'].get('Prev')
+
+        details['revisions'] = sections
+        details['incremental_updates'] = max(0, sections - 1)
+        details['xref_type'] = trailer.get('xref_type')
+        details['encrypted'] = 'Encrypt' in trailer
+        if 'Size' in trailer:
+            details['object_count'] = trailer['Size']
+        if 'info_offset' in trailer:
+            details.update(cls._read_info(stream, trailer['info_offset']))
+        return details
+
+    @staticmethod
+    def _parse_dict(data: bytes) -> Dict[str, Any]:
+        values = {}
+        for key in ('Size', 'Prev'):
+            found = re.search(rb'/' + key.encode() + rb'\s+(\d+)', data)
+            if found:
+                values[key] = int(found.group(1))
+        info = re.search(rb'/Info\s+(\d+)\s+(\d+)\s+R', data)
+        if info:
+            values['Info'] = int(info.group(1))
+        if b'/Encrypt' in data:
+            values['Encrypt'] = True
+        return values
+
+    @classmethod
+    def _read_xref_section(cls, stream, offset):
+        data = _read_at(stream, offset, PDF_OBJECT_READ)
+        if data.startswith(b'xref'):
+            return cls._read_xref_table(stream, offset, data)
+        if re.match(rb'\d+\s+\d+\s+obj', data):
+            return cls._read_xref_stream(stream, offset, data)
+        return None
+
+    @classmethod
+    def _read_xref_table(cls, stream, offset, data):
+        subsections = []
+        position = offset + 4
+        while True:
+            line = re.match(rb'\s*(\d+)\s+(\d+)\s*?\r?\n', _read_at(stream, position, 64))
+            if not line:
+                break
+            first, count = int(line.group(1)), int(line.group(2))
+            entries_start = position + line.end()
+            subsections.append((first, count, entries_start))
+            position = entries_start + count * 20
+
+        trailer_data = _read_at(stream, position, PDF_OBJECT_READ)
+        trailer = cls._parse_dict(trailer_data[:trailer_data.find(b'>>', trailer_data.find(b'trailer')) + 2])
+        trailer['xref_type'] = 'table'
+
+        def lookup(object_number):
+            for first, count, entries_start in subsections:
+                if first <= object_number < first + count:
+                    entry = _read_at(stream, entries_start + (object_number - first) * 20, 20)
+                    fields = entry.split()
+                    if len(fields) >= 3 and fields[2] == b'n':
+                        return int(fields[0])
+            return None
+
+        return {'trailer': trailer, 'lookup': lookup}
+
+    @classmethod
+    def _read_xref_stream(cls, stream, offset, data):
+        dict_end = data.find(b'stream')
+        if dict_end < 0:
+            return None
+        object_dict = data[:dict_end]
+        trailer = cls._parse_dict(object_dict)
+        trailer['xref_type'] = 'stream'
+
+        length = re.search(rb'/Length\s+(\d+)', object_dict)
+        widths = re.search(rb'/W\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s*\]', object_dict)
+        if not length or not widths or int(length.group(1)) > PDF_MAX_XREF_STREAM:
+            return {'trailer': trailer, 'lookup': lambda object_number: None}
+
+        data_start = offset + dict_end + len(b'stream')
+        raw = _read_at(stream, data_start, int(length.group(1)) + 2).lstrip(b'\r\n')[:int(length.group(1))]
+        widths = [int(w) for w in widths.groups()]
+        index = re.search(rb'/Index\s*\[([\d\s]+)\]', object_dict)
+        if index:
+            numbers = [int(n) for n in index.group(1).split()]
+            ranges = list(zip(numbers[::2], numbers[1::2]))
+        else:
+            ranges = [(0, trailer.get('Size', 0))]
+        columns = re.search(rb'/Columns\s+(\d+)', object_dict)
+        predictor = re.search(rb'/Predictor\s+(\d+)', object_dict)
+
+        try:
+            if b'/FlateDecode' in object_dict:
+                inflater = zlib.decompressobj()
+                rows = inflater.decompress(raw, PDF_MAX_XREF_ROWS_SIZE)
+                if inflater.unconsumed_tail:
+                    raise zlib.error('cross-reference stream exceeds the size limit')
+            else:
+                rows = raw
+        except zlib.error:
+            return {'trailer': trailer, 'lookup': lambda object_number: None}
+        row_size = sum(widths)
+        if predictor and int(predictor.group(1)) >= 10:
+            rows = cls._undo_png_predictor(rows, int(columns.group(1)) if columns else row_size)
+
+        def lookup(object_number):
+            position = 0
+            for first, count in ranges:
+                if first <= object_number < first + count:
+                    start = (position + object_number - first) * row_size
+                    row = rows[start:start + row_size]
+                    if len(row) < row_size:
+                        return None
+                    fields, cursor = [], 0
+                    for width in widths:
+                        fields.append(int.from_bytes(row[cursor:cursor + width], 'big') if width else 1)
+                        cursor += width
+                    # Type 2 entries live inside compressed object streams, which are not read.
+                    return fields[1] if fields[0] == 1 else None
+                position += count
+            return None
+
+        return {'trailer': trailer, 'lookup': lookup}
+
+    @staticmethod
+    def _undo_png_predictor(data, columns):
+        rows, previous = [], bytearray(columns)
+        for start in range(0, len(data), columns + 1):
+            filter_type, row = data[start], bytearray(data[start + 1:start + 1 + columns])
+            if filter_type == 2:
+                for i in range(len(row)):
+                    row[i] = (row[i] + previous[i]) & 0xFF
+            elif filter_type != 0:
+                # Only None and Up are used for cross-reference streams in practice.
+                return b''
+            rows.append(bytes(row))
+            previous = row
+        return b''.join(rows)
+
+    @classmethod
+    def _read_info(cls, stream, offset):
+        data = _read_at(stream, offset, PDF_OBJECT_READ)
+        start, end = data.find(b'<<'), data.find(b'endobj')
+        body = data[start:end if end > 0 else len(data)]
+        info = {}
+        for key in PDF_INFO_KEYS:
+            found = re.search(rb'/' + key.encode() + rb'\s*([(<])', body)
+            if found:
+                value = cls._read_string(body, found.start(1))
+                if value is not None:
+                    info[re.sub(r'(?<!^)(?=[A-Z])', '_', key).lower()] = value
+        return info
+
+    @staticmethod
+    def _read_string(body, start):
+        if body[start:start + 1] == b'<':
+            end = body.find(b'>', start)
+            try:
+                raw = bytes.fromhex(body[start + 1:end].decode('latin-1'))
+            except ValueError:
+                return None
+        else:
+            raw, depth, i = bytearray(), 0, start
+            while i < len(body):
+                char = body[i:i + 1]
+                if char == b'\\' and i + 1 < len(body):
+                    escaped = body[i + 1:i + 2]
+                    raw += {b'n': b'\n', b'r': b'\r', b't': b'\t'}.get(escaped, escaped)
+                    i += 2
+                    continue
+                if char == b'(':
+                    depth += 1
+                    if depth == 1:
+                        i += 1
+                        continue
+                elif char == b')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                raw += char
+                i += 1
+            raw = bytes(raw)
+        if raw.startswith(codecs.BOM_UTF16_BE):
+            return raw[2:].decode('utf-16-be', 'replace')
+        return raw.decode('latin-1')
+
+
+# Office Open XML and other ZIP containers -------------------------------------
+
+OFFICE_PART_LIMIT = 1024 * 1024
+OFFICE_NAMESPACES = {
+    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dcterms': 'http://purl.org/dc/terms/',
+    'ep': 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties',
+}
+OFFICE_CORE_FIELDS = {
+    'dc:title': 'title',
+    'dc:creator': 'creator',
+    'cp:lastModifiedBy': 'last_modified_by',
+    'cp:revision': 'revision',
+    'dcterms:created': 'created',
+    'dcterms:modified': 'modified',
+}
+OFFICE_APP_FIELDS = {
+    'ep:Application': 'application',
+    'ep:AppVersion': 'app_version',
+    'ep:Pages': 'pages',
+    'ep:Words': 'words',
+    'ep:Slides': 'slides',
+}
+
+
+@register
+class ZipContainerExtractor(FormatExtractor):
+    """Reads the ZIP central directory and the small Office property parts only."""
+
+    KINDS = (('word/', 'DOCX'), ('xl/', 'XLSX'), ('ppt/', 'PPTX'))
+
+    @classmethod
+    def match(cls, header):
+        return 'ZIP' if header.startswith(b'PK\x03\x04') else None
+
+    @classmethod
+    def extract(cls, stream, file_size):
+        with zipfile.ZipFile(stream) as archive:
+            names = archive.namelist()
+            details = {'entry_count': len(names), 'container': 'ZIP'}
+            if '[Content_Types].xml' in names:
+                for prefix, kind in cls.KINDS:
+                    if any(name.startswith(prefix) for name in names):
+                        details['container'] = kind
+                        break
+                details.update(cls._properties(archive, 'docProps/core.xml', OFFICE_CORE_FIELDS))
+                details.update(cls._properties(archive, 'docProps/app.xml', OFFICE_APP_FIELDS))
+                details['has_macros'] = any(name.endswith('vbaProject.bin') for name in names)
+        return details
+
+    @staticmethod
+    def _properties(archive, part, fields):
+        try:
+            info = archive.getinfo(part)
+        except KeyError:
+            return {}
+        if info.file_size > OFFICE_PART_LIMIT:
+            return {}
+        root = ElementTree.fromstring(archive.read(info))
+        values = {}
+        for path, name in fields.items():
+            element = root.find(path, OFFICE_NAMESPACES)
+            if element is not None and element.text:
+                values[name] = element.text.strip()
+        return values
+
+
+# Plain text --------------------------------------------------------------------
+
+TEXT_READ_SIZE = 64 * 1024
+TEXT_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+@register
+class TextExtractor(FormatExtractor):
+    """Decodes text incrementally to report its encoding, line count and line endings."""
+
+    @classmethod
+    def _encoding(cls, header):
+        for bom, encoding in TEXT_BOMS:
+            if header.startswith(bom):
+                return encoding
+        return None
+
+    @classmethod
+    def match(cls, header):
+        if not header:
+            return None
+        if cls._encoding(header):
+            return 'TXT'
+        if b'\x00' in header:
+            return None
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(header, final=False)
+        except UnicodeDecodeError:
+            return None
+        return 'TXT'
+
+    @classmethod
+    def extract(cls, stream, file_size):
+        stream.seek(0)
+        encoding = cls._encoding(stream.read(4)) or 'utf-8'
+        stream.seek(0)
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        lines = characters = crlf = 0
+        last = ''
+        while True:
+            chunk = stream.read(TEXT_READ_SIZE)
+            try:
+                text = decoder.decode(chunk, final=not chunk)
+            except UnicodeDecodeError:
+                return {'encoding': 'unknown', 'note': f'Not valid {encoding} text'}
+            if not chunk:
+                break
+            characters += len(text)
+            lines += text.count('\n')
+            crlf += (last + text).count('\r\n')
+            last = text[-1:] if text else last
+        if characters and last != '\n':
+            lines += 1
+
+        return {
+            'encoding': encoding,
+            'characters': characters,
+            'lines': lines,
+            'line_endings': 'CRLF' if crlf and crlf * 2 >= lines else 'LF',
+        }
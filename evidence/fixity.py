@@ -0,0 +1,59 @@
+import hashlib
+import os
+import time
+
+READ_SIZE = 1024 * 1024
+
+
+class RateLimiter:
+    """Sleeps just enough to keep the average read rate at or below ``bytes_per_second``.
+
+    A rate of zero disables limiting.
+    """
+
+    def __init__(self, bytes_per_second, clock=time.monotonic, sleep=time.sleep):
+        self.bytes_per_second = bytes_per_second
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.consumed = 0
+
+    def consume(self, size):
+        self.consumed += size
+        if not self.bytes_per_second:
+            return
+        ahead = self.consumed / self.bytes_per_second - (self.clock() - self.started)
+        if ahead > 0:
+            self.sleep(ahead)
+
+
+def _advise(file_obj, advice):
+    try:
+        os.posix_fadvise(file_obj.fileno(), 0, 0, getattr(os, advice))
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+def sha256_file(file_obj, limiter=None, read_size=READ_SIZE):
+    """Return the SHA-256 hex digest and size of ``file_obj`` read sequentially from the start.
+
+    Reads go into one reusable buffer. On local files the kernel is told the
+    access is sequential, and the pages are dropped afterwards, so a sweep
+    does not evict the page cache that live traffic relies on.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(read_size)
+    view = memoryview(buffer)
+    size = 0
+    file_obj.seek(0)
+    _advise(file_obj, 'POSIX_FADV_SEQUENTIAL')
+    while True:
+        count = file_obj.readinto(buffer)
+        if not count:
+            break
+        digest.update(view[:count])
+        size += count
+        if limiter:
+            limiter.consume(count)
+    _advise(file_obj, 'POSIX_FADV_DONTNEED')
+    return digest.hexdigest(), size
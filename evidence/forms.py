@@ -1,4 +1,6 @@
 from django import forms
+from django.conf import settings
+from .metadata_extractor import MetadataExtractor
 from .models import Evidence
 
 
@@ -25,8 +27,11 @@ class EvidenceUploadForm(forms.ModelForm):
     def clean_media(self):
         media = self.cleaned_data.get('media')
         if media:
-            if media.size > 50 * 1024 * 1024:
-                raise forms.ValidationError('File size cannot exceed 50MB')
+            max_size = settings.EVIDENCE_MAX_UPLOAD_SIZE
+            if media.size > max_size:
+                raise forms.ValidationError(
+                    f'File size cannot exceed {MetadataExtractor.human_readable_size(max_size)}'
+                )
             self.cleaned_data['original_filename'] = media.name
         return media
     
@@ -41,20 +46,130 @@ class EvidenceUploadForm(forms.ModelForm):
         return cleaned_data
     
     def _detect_media_type(self, media):
-        file_type = media.content_type.lower()
-        filename = media.name.lower()
-        
-        if file_type.startswith('image/'):
-            return 'image'
-        elif file_type.startswith('video/'):
-            return 'video'
-        elif file_type.startswith('audio/'):
-            return 'audio'
-        elif 'pdf' in file_type or filename.endswith('.pdf'):
-            return 'document'
-        elif filename.endswith(('.doc', '.docx')):
-            return 'document'
-        elif filename.endswith('.txt'):
-            return 'document'
-        else:
-            return 'other'
\ No newline at end of file
+        return detect_media_type(media.content_type, media.name)
+
+
+def detect_media_type(content_type, filename):
+    file_type = (content_type or '').lower()
+    filename = filename.lower()
+    
+    if file_type.startswith('image/'):
+        return 'image'
+    elif file_type.startswith('video/'):
+        return 'video'
+    elif file_type.startswith('audio/'):
+        return 'audio'
+    elif 'pdf' in file_type or filename.endswith('.pdf'):
+        return 'document'
+    elif filename.endswith(('.doc', '.docx')):
+        return 'document'
+    elif filename.endswith('.txt'):
+        return 'document'
+    else:
+        return 'other'
+
+
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput(attrs={'class': 'form-control'}))
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        single_file_clean = super().clean
+        if isinstance(data, (list, tuple)):
+            return [single_file_clean(d, initial) for d in data]
+        return [single_file_clean(data, initial)]
+
+
+class BatchEvidenceUploadForm(forms.Form):
+    media = MultipleFileField()
+    description = forms.CharField(
+        max_length=255,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Describe the seizure these files come from'
+        }),
+    )
+    expand_archives = forms.BooleanField(required=False, initial=True)
+
+    def clean_media(self):
+        files = self.cleaned_data.get('media') or []
+        if len(files) > settings.EVIDENCE_BATCH_MAX_FILES:
+            raise forms.ValidationError(
+                f'A batch cannot contain more than {settings.EVIDENCE_BATCH_MAX_FILES} files'
+            )
+        return files
+
+
+class EvidenceFilterForm(forms.Form):
+    """Filters and sort order for evidence listings, on the indexed metadata columns.
+
+    Text filters are exact matches, except ``software`` which matches a prefix as
+    a range so it can still use the index.
+    """
+
+    SORT_CHOICES = [
+        ('-date_uploaded', 'Newest upload'),
+        ('date_uploaded', 'Oldest upload'),
+        ('-captured_at', 'Newest capture'),
+        ('captured_at', 'Oldest capture'),
+        ('-file_size', 'Largest file'),
+        ('file_size', 'Smallest file'),
+        ('-pixel_width', 'Widest image'),
+        ('camera_make', 'Camera'),
+    ]
+
+    camera_make = forms.CharField(required=False, label='Make')
+    camera_model = forms.CharField(required=False, label='Model')
+    camera_serial = forms.CharField(required=False, label='Serial')
+    software = forms.CharField(required=False, label='Software starts with')
+    file_format = forms.CharField(required=False, label='Format')
+    captured_after = forms.DateTimeField(required=False, widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}))
+    captured_before = forms.DateTimeField(required=False, widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}))
+    min_width = forms.IntegerField(required=False, min_value=0, label='Min width (px)')
+    min_height = forms.IntegerField(required=False, min_value=0, label='Min height (px)')
+    min_size = forms.IntegerField(required=False, min_value=0, label='Min size (bytes)')
+    max_size = forms.IntegerField(required=False, min_value=0, label='Max size (bytes)')
+    sort = forms.ChoiceField(required=False, choices=SORT_CHOICES)
+
+    EXACT_FILTERS = ['camera_make', 'camera_model', 'camera_serial', 'file_format']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            field.widget.attrs.setdefault('class', 'form-control')
+
+    def filter(self, queryset):
+        """Apply the submitted filters; invalid input leaves the listing unfiltered."""
+        if not self.is_valid():
+            return queryset.order_by('-date_uploaded')
+        data = self.cleaned_data
+
+        lookups = {field: data[field] for field in self.EXACT_FILTERS if data[field]}
+        if data['software']:
+            lookups['software__gte'] = data['software']
+            lookups['software__lt'] = data['software'] + '\uffff'
+        if data['captured_after']:
+            lookups['captured_at__gte'] = data['captured_after']
+        if data['captured_before']:
+            lookups['captured_at__lt'] = data['captured_before']
+        if data['min_width'] is not None:
+            lookups['pixel_width__gte'] = data['min_width']
+        if data['min_height'] is not None:
+            lookups['pixel_height__gte'] = data['min_height']
+        if data['min_size'] is not None:
+            lookups['file_size__gte'] = data['min_size']
+        if data['max_size'] is not None:
+            lookups['file_size__lte'] = data['max_size']
+
+        return queryset.filter(**lookups).order_by(data['sort'] or '-date_uploaded', '-id')
+
+    @property
+    def is_filtered(self):
+        return self.is_bound and self.is_valid() and any(
+            value not in (None, '') for name, value in self.cleaned_data.items() if name != 'sort'
+        )
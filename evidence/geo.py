@@ -0,0 +1,187 @@
+import math
+import re
+
+from django.db.models import Avg, Count, FloatField, Q
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt, Substr
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+MAX_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+MAX_COVER_CELLS = 32
+MIN_COVER_PRECISION = 3
+
+ISO6709 = re.compile(r'^([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)')
+
+
+def valid_coordinates(latitude, longitude):
+    return (
+        latitude is not None
+        and longitude is not None
+        and math.isfinite(latitude)
+        and math.isfinite(longitude)
+        and -90 <= latitude <= 90
+        and -180 <= longitude <= 180
+    )
+
+
+def parse_iso6709(value):
+    """Return ``(latitude, longitude)`` from a decimal ISO 6709 string such as ``+37.33-122.03/``."""
+    match = ISO6709.match(value or '')
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def encode(latitude, longitude, precision=MAX_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return ``(height, width)`` in degrees of a geohash cell at ``precision``."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lon_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def cell_count(south, west, north, east, precision):
+    height, width = cell_size(precision)
+    last_row, last_col = round(180 / height) - 1, round(360 / width) - 1
+    rows = min(math.floor((north + 90) / height), last_row) - math.floor((south + 90) / height) + 1
+    cols = min(math.floor((east + 180) / width), last_col) - math.floor((west + 180) / width) + 1
+    return rows * cols
+
+
+def precision_for(south, west, north, east, max_cells):
+    """The finest precision at which at most ``max_cells`` cells span the box."""
+    for precision in range(MAX_PRECISION, 0, -1):
+        if cell_count(south, west, north, east, precision) <= max_cells:
+            return precision
+    return 1
+
+
+def cover(south, west, north, east, max_cells=MAX_COVER_CELLS, precision=None):
+    """Geohash prefixes whose cells together contain the box (which must not cross 180°)."""
+    precision = precision or precision_for(south, west, north, east, max_cells)
+    height, width = cell_size(precision)
+    cells = set()
+    row = math.floor((south + 90) / height)
+    while row * height - 90 <= north and row * height < 180:
+        col = math.floor((west + 180) / width)
+        while col * width - 180 <= east and col * width < 360:
+            cells.add(encode(row * height - 90 + height / 2, col * width - 180 + width / 2, precision))
+            col += 1
+        row += 1
+    return sorted(cells)
+
+
+def prefix_upper_bound(prefix):
+    """The smallest string greater than every geohash starting with ``prefix``."""
+    return prefix + '~'
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """A ``(south, west, north, east)`` box enclosing the circle.
+
+    Longitudes wrap, so near the antimeridian ``west > east``; a circle over a
+    pole spans every longitude.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(-90.0, latitude - dlat), min(90.0, latitude + dlat)
+    cos_lat = math.cos(math.radians(latitude))
+    dlon = 180.0 if cos_lat < 1e-9 else dlat / cos_lat
+    if dlon >= 180.0 or south == -90.0 or north == 90.0:
+        return south, -180.0, north, 180.0
+    west, east = longitude - dlon, longitude + dlon
+    if west < -180.0:
+        west += 360.0
+    if east > 180.0:
+        east -= 360.0
+    return south, west, north, east
+
+
+def split_bbox(south, west, north, east):
+    """The box as a list of boxes that do not cross the antimeridian."""
+    if west > east:
+        return [(south, west, north, 180.0), (south, -180.0, north, east)]
+    return [(south, west, north, east)]
+
+
+def filter_bbox(queryset, south, west, north, east):
+    """Evidence inside the box. A box with ``west > east`` crosses the antimeridian."""
+    if west > east:
+        first, second = split_bbox(south, west, north, east)
+        return filter_bbox(queryset, *first) | filter_bbox(queryset, *second)
+    cells = Q()
+    # Coarse cells would match most of the index anyway; a plain scan is cheaper.
+    if precision_for(south, west, north, east, MAX_COVER_CELLS) >= MIN_COVER_PRECISION:
+        for prefix in cover(south, west, north, east):
+            cells |= Q(geohash__gte=prefix, geohash__lt=prefix_upper_bound(prefix))
+    bounds = {}
+    if south > -90:
+        bounds['gps_latitude__gte'] = south
+    if north < 90:
+        bounds['gps_latitude__lte'] = north
+    if west > -180:
+        bounds['gps_longitude__gte'] = west
+    if east < 180:
+        bounds['gps_longitude__lte'] = east
+    return queryset.filter(cells, **bounds)
+
+
+def filter_radius(queryset, latitude, longitude, radius_km):
+    """Evidence within ``radius_km`` great-circle distance, annotated with ``distance_km``."""
+    phi = math.radians(latitude)
+    a = Power(Sin((Radians('gps_latitude') - phi) / 2), 2) + math.cos(phi) * Cos(Radians('gps_latitude')) * Power(
+        Sin((Radians('gps_longitude') - math.radians(longitude)) / 2), 2
+    )
+    distance = 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+    return filter_bbox(queryset, *radius_bbox(latitude, longitude, radius_km)).annotate(
+        distance_km=distance
+    ).filter(distance_km__lte=radius_km)
+
+
+def cluster(queryset, precision, cells=None):
+    """Group evidence by geohash cell, with the count and centroid of each cell.
+
+    With ``cells`` (the prefixes spanning the query area) each cell is
+    aggregated by its own range scan of the geohash index. For a few coarse
+    cells over a large table that avoids sorting every row for the ``GROUP BY``.
+    """
+    aggregates = {
+        'count': Count('id'),
+        'latitude': Avg('gps_latitude', output_field=FloatField()),
+        'longitude': Avg('gps_longitude', output_field=FloatField()),
+    }
+    if cells is None:
+        return list(
+            queryset.annotate(cell=Substr('geohash', 1, precision))
+            .values('cell')
+            .annotate(**aggregates)
+            .order_by('-count', 'cell')
+        )
+    clusters = []
+    for prefix in cells:
+        stats = queryset.filter(geohash__gte=prefix, geohash__lt=prefix_upper_bound(prefix)).aggregate(**aggregates)
+        if stats['count']:
+            clusters.append({'cell': prefix, **stats})
+    return sorted(clusters, key=lambda item: (-item['count'], item['cell']))
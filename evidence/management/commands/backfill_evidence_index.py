@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from evidence.models import Evidence
+
+
+class Command(BaseCommand):
+    help = "Copy indexed columns (GPS, capture time, camera, software, dimensions, format) out of existing evidence metadata"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--case", help="Only process evidence in this case ID")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        evidence_list = Evidence.objects.only("id", "metadata", *Evidence.INDEXED_METADATA_FIELDS).order_by("pk")
+        if options["case"]:
+            evidence_list = evidence_list.filter(case__case_id=options["case"])
+
+        processed = located = 0
+        last_pk = 0
+        while True:
+            batch = list(evidence_list.filter(pk__gt=last_pk)[: options["batch_size"]])
+            if not batch:
+                break
+            for evidence in batch:
+                evidence.populate_indexed_metadata()
+                located += evidence.geohash is not None
+            Evidence.objects.bulk_update(batch, Evidence.INDEXED_METADATA_FIELDS)
+            processed += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Indexed {processed} evidence item(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {processed} evidence item(s), {located} with GPS coordinates"))
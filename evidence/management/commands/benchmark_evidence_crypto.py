@@ -0,0 +1,70 @@
+import io
+import os
+import time
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from django.core.management.base import BaseCommand
+
+from evidence.crypto import SegmentedBlobReader, SegmentedBlobWriter, iter_decrypt
+
+
+class Command(BaseCommand):
+    help = "Benchmark v1 (AES-CBC) against v2 (segmented AES-GCM) evidence blob throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=int, default=256, help="Size of the synthetic evidence file")
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+        parser.add_argument("--chunk-size", type=int, default=1024 * 1024)
+
+    def handle(self, *args, **options):
+        size = options["size_mb"] * 1024 * 1024
+        chunk_size = options["chunk_size"]
+        key = os.urandom(32)
+        block = os.urandom(chunk_size)
+        chunks = [block] * (size // chunk_size)
+
+        self.stdout.write(f"{options['size_mb']} MB synthetic evidence, {os.cpu_count()} CPU(s)")
+        self.stdout.write(f"{'format':<22}{'encrypt MB/s':>14}{'decrypt MB/s':>14}")
+
+        cipher = Cipher(algorithms.AES(key), modes.CBC(os.urandom(16)), backend=default_backend())
+        encrypt_seconds, blob = self._time(lambda: self._encrypt_v1(cipher, chunks))
+        decrypt_seconds, _ = self._time(
+            lambda: sum(len(piece) for piece in iter_decrypt(io.BytesIO(blob), cipher, chunk_size))
+        )
+        self._report("v1 AES-CBC", size, encrypt_seconds, decrypt_seconds)
+
+        for workers in options["workers"]:
+            encrypt_seconds, blob = self._time(lambda: self._encrypt_v2(key, chunks, workers))
+            reader = SegmentedBlobReader(key, io.BytesIO(blob), workers=workers)
+            decrypt_seconds, _ = self._time(lambda: sum(len(piece) for piece in reader.iter_segments()))
+            self._report(f"v2 AES-GCM x{workers}", size, encrypt_seconds, decrypt_seconds)
+
+    def _encrypt_v1(self, cipher, chunks):
+        out = io.BytesIO()
+        padder = padding.PKCS7(128).padder()
+        encryptor = cipher.encryptor()
+        for chunk in chunks:
+            out.write(encryptor.update(padder.update(chunk)))
+        out.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+        return out.getvalue()
+
+    def _encrypt_v2(self, key, chunks, workers):
+        out = io.BytesIO()
+        writer = SegmentedBlobWriter(key, out, workers=workers)
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.close()
+        return out.getvalue()
+
+    def _time(self, func):
+        started = time.perf_counter()
+        result = func()
+        return time.perf_counter() - started, result
+
+    def _report(self, label, size, encrypt_seconds, decrypt_seconds):
+        megabytes = size / (1024 * 1024)
+        self.stdout.write(
+            f"{label:<22}{megabytes / encrypt_seconds:>14.1f}{megabytes / decrypt_seconds:>14.1f}"
+        )
@@ -0,0 +1,79 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from PIL import ExifTags, Image
+
+from evidence.metadata_extractor import MetadataExtractor
+
+FORMATS = ["JPEG", "PNG", "TIFF", "WEBP"]
+RESOLUTIONS = {"640x480": (640, 480), "1920x1080": (1920, 1080), "4032x3024": (4032, 3024)}
+
+
+def _legacy_extract(data, original_filename):
+    """The extraction path before header-only parsing, kept for comparison.
+
+    It read the whole file into memory, called ``_getexif`` once for the EXIF
+    fields and again for the authenticity checks, and decoded every pixel to
+    build and re-encode a 128x128 thumbnail.
+    """
+    file_obj = io.BytesIO(data)
+    content = file_obj.read()
+    MetadataExtractor._detect_file_format(content)
+    image = Image.open(io.BytesIO(content))
+    for _ in range(2):
+        getexif = getattr(image, "_getexif", None)
+        if getexif:
+            getexif()
+    image.thumbnail((128, 128))
+    image.convert("RGB").save(io.BytesIO(), format="JPEG")
+
+
+class Command(BaseCommand):
+    help = "Benchmark metadata extraction latency across image formats and resolutions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per sample")
+        parser.add_argument("--formats", nargs="+", default=FORMATS, choices=FORMATS)
+        parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'sample':<20}{'size':>10}{'legacy ms':>12}{'header ms':>12}{'speedup':>10}")
+        for image_format in options["formats"]:
+            for label in options["resolutions"]:
+                data = self._sample(image_format, RESOLUTIONS[label])
+                name = f"sample.{image_format.lower()}"
+                legacy = self._median_ms(lambda: _legacy_extract(data, name), options["repeat"])
+                # Hashes come from the ingest pipeline in production, so neither path times them.
+                hashes = {"md5": "", "sha256": ""}
+                current = self._median_ms(
+                    lambda: MetadataExtractor.extract_all_metadata(
+                        io.BytesIO(data), name, hashes=hashes, file_size=len(data)
+                    ),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{image_format + ' ' + label:<20}{len(data) // 1024:>8}KB"
+                    f"{legacy:>12.2f}{current:>12.2f}{legacy / current:>9.1f}x"
+                )
+
+    def _sample(self, image_format, size):
+        exif = Image.Exif()
+        exif[0x010F] = "Benchmark"
+        exif[0x0110] = "Camera"
+        exif[0x0132] = "2024:01:01 12:00:00"
+        exif.get_ifd(ExifTags.IFD.Exif)[0x9003] = "2024:01:01 12:00:00"
+        # A gradient rather than noise keeps the encoded sizes realistic.
+        image = Image.linear_gradient("L").resize(size).convert("RGB")
+        out = io.BytesIO()
+        image.save(out, format=image_format, exif=exif)
+        return out.getvalue()
+
+    def _median_ms(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,34 @@
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from evidence.models import Evidence, ImageFingerprint
+
+
+class Command(BaseCommand):
+    help = "Compute perceptual hashes for image evidence uploaded before fingerprinting"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--case", help="Only process evidence in this case ID")
+        parser.add_argument("--all", action="store_true", help="Recompute existing fingerprints too")
+
+    def handle(self, *args, **options):
+        evidence_list = Evidence.objects.filter(media_type="image").select_related("case__encryption_key")
+        if options["case"]:
+            evidence_list = evidence_list.filter(case__case_id=options["case"])
+        if not options["all"]:
+            evidence_list = evidence_list.filter(fingerprint__isnull=True)
+
+        computed = skipped = 0
+        for evidence in evidence_list.iterator():
+            with tempfile.TemporaryFile(dir=settings.FILE_UPLOAD_TEMP_DIR) as plaintext:
+                for chunk in evidence.iter_decrypted_chunks():
+                    plaintext.write(chunk)
+                fingerprint = ImageFingerprint.record(evidence, plaintext)
+            if fingerprint is None:
+                skipped += 1
+                self.stdout.write(self.style.WARNING(f"Evidence {evidence.id}: not a readable image"))
+            else:
+                computed += 1
+        self.stdout.write(self.style.SUCCESS(f"Computed {computed} fingerprint(s), skipped {skipped}"))
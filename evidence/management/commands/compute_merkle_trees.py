@@ -0,0 +1,39 @@
+import hashlib
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from evidence import merkle
+from evidence.models import Evidence, EvidenceMerkleTree
+
+
+class Command(BaseCommand):
+    help = "Compute Merkle trees for evidence uploaded before chunk digests were recorded"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--case", help="Only process evidence in this case ID")
+
+    def handle(self, *args, **options):
+        evidence_list = Evidence.objects.filter(merkle_tree__isnull=True).select_related("case__encryption_key")
+        if options["case"]:
+            evidence_list = evidence_list.filter(case__case_id=options["case"])
+
+        computed = skipped = 0
+        for evidence in evidence_list.iterator():
+            sha256 = hashlib.sha256()
+            tree = merkle.MerkleBuilder(workers=settings.EVIDENCE_CRYPTO_WORKERS)
+            for chunk in evidence.iter_decrypted_chunks():
+                sha256.update(chunk)
+                tree.update(chunk)
+            leaves = tree.finish()
+            # A tree is only anchored to content that still matches its recorded hash.
+            if sha256.hexdigest() != evidence.sha256_hash:
+                skipped += 1
+                self.stdout.write(self.style.WARNING(f"Evidence {evidence.id}: content does not match its SHA-256"))
+                continue
+            with transaction.atomic():
+                EvidenceMerkleTree.objects.create(evidence=evidence, leaves=merkle.pack(leaves))
+                Evidence.objects.filter(pk=evidence.pk).update(merkle_root=merkle.root(leaves).hex())
+            computed += 1
+        self.stdout.write(self.style.SUCCESS(f"Computed {computed} Merkle tree(s), skipped {skipped}"))
@@ -0,0 +1,74 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from evidence.fixity import RateLimiter
+from evidence.models import EvidenceAuditLog, EvidenceBlob, FixitySweepRun
+
+
+class Command(BaseCommand):
+    help = "Rehash stored evidence ciphertext and flag blobs whose digest no longer matches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rate", type=float, default=settings.EVIDENCE_FIXITY_RATE_MB,
+            help="Read limit in MB/s (0 for unlimited)",
+        )
+        parser.add_argument(
+            "--max-duration", type=float, default=0,
+            help="Stop after this many minutes; the next run resumes where this one stopped",
+        )
+        parser.add_argument("--restart", action="store_true", help="Ignore an unfinished sweep and start from the beginning")
+
+    def handle(self, *args, **options):
+        run = FixitySweepRun.objects.filter(status="running").first()
+        if run and options["restart"]:
+            run.delete()
+            run = None
+        if run:
+            self.stdout.write(f"Resuming sweep {run.id} after blob {run.last_pk} ({run.checked} checked)")
+        else:
+            run = FixitySweepRun.objects.create()
+
+        limiter = RateLimiter(options["rate"] * 1024 * 1024)
+        deadline = time.monotonic() + options["max_duration"] * 60 if options["max_duration"] else None
+        started = time.monotonic()
+        bytes_at_start = run.bytes_read
+
+        blobs = EvidenceBlob.objects.filter(pk__gt=run.last_pk).order_by("pk").iterator(chunk_size=500)
+        for blob in blobs:
+            if deadline and time.monotonic() >= deadline:
+                self.stdout.write(f"Time limit reached; stopped after blob {run.last_pk}")
+                break
+            outcome = blob.check_fixity(limiter)
+            with transaction.atomic():
+                if outcome in ("mismatch", "missing"):
+                    self._flag(blob, outcome)
+                run.last_pk = blob.pk
+                run.checked += 1
+                run.failures += outcome in ("mismatch", "missing")
+                run.bytes_read += blob.stored_size if outcome != "missing" else 0
+                run.save(update_fields=["last_pk", "checked", "failures", "bytes_read", "updated_at"])
+        else:
+            run.status = "complete"
+            run.finished_at = timezone.now()
+            run.save(update_fields=["status", "finished_at", "updated_at"])
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = (run.bytes_read - bytes_at_start) / (1024 * 1024) / elapsed
+        summary = f"Checked {run.checked} blob(s), {run.failures} failed ({rate:.1f} MB/s this run)"
+        self.stdout.write(self.style.SUCCESS(summary) if not run.failures else self.style.ERROR(summary))
+
+    def _flag(self, blob, outcome):
+        details = (
+            f"Fixity sweep: stored ciphertext {blob.file.name} is {outcome}"
+            f" (expected SHA-256 {blob.ciphertext_sha256})"
+        )
+        self.stderr.write(details)
+        EvidenceAuditLog.objects.bulk_create([
+            EvidenceAuditLog(evidence_id=evidence_id, action="Fixity Check Failed", details=details)
+            for evidence_id in blob.evidence.values_list("id", flat=True)
+        ])
@@ -0,0 +1,47 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from evidence.models import MetadataExtractionJob
+
+
+class Command(BaseCommand):
+    help = "Run queued evidence metadata extraction jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when idle")
+        parser.add_argument("--max-attempts", type=int, default=3)
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Requeue running jobs whose worker has sent no heartbeat for this many seconds",
+        )
+
+    def handle(self, *args, **options):
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        stale_after = timedelta(seconds=options["stale_after"])
+        self.stdout.write(f"Metadata worker {worker} started")
+
+        while True:
+            requeued = MetadataExtractionJob.requeue_stale(stale_after)
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+            job = MetadataExtractionJob.claim_next(worker)
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            status = job.run(max_attempts=options["max_attempts"])
+            message = f"Job {job.id} for evidence {job.evidence_id}: {status}"
+            if status == "done":
+                self.stdout.write(self.style.SUCCESS(message))
+            else:
+                self.stdout.write(self.style.WARNING(f"{message} ({job.last_error})"))
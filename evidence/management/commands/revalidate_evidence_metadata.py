@@ -0,0 +1,147 @@
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from evidence.metadata_extractor import MetadataExtractor
+from evidence.models import Evidence, EvidenceAuditLog, MetadataRevalidationRun
+
+
+def _revalidate_batch(rows):
+    """Pool worker: decode, validate and diff one batch. No ORM access.
+
+    ``rows`` are ``(pk, metadata_json, valid, issues_json, media_status)``;
+    returns ``(pk, valid, issues, media_status, details)`` for changed rows only.
+    """
+    changes = []
+    for pk, metadata, old_valid, old_issues, media_status in rows:
+        old_issues = json.loads(old_issues) if old_issues else []
+        is_valid, issues = MetadataExtractor.validate_metadata_integrity(json.loads(metadata) if metadata else {})
+        if (is_valid, issues) == (old_valid, old_issues):
+            continue
+        if not is_valid and media_status == "Valid":
+            media_status = "Invalid"
+        elif is_valid and media_status == "Invalid":
+            media_status = "Valid"
+        added = [issue for issue in issues if issue not in old_issues]
+        removed = [issue for issue in old_issues if issue not in issues]
+        details = f"Valid: {old_valid} -> {is_valid}; added: {added or 'none'}; removed: {removed or 'none'}"
+        changes.append((pk, is_valid, issues, media_status, details))
+    return changes
+
+
+def _run_inline(fn, *args):
+    future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+class Command(BaseCommand):
+    help = "Re-run metadata validation over all evidence and store the new results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=settings.EVIDENCE_BATCH_WORKERS)
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+        parser.add_argument("--show", type=int, default=20, help="Changes to print in a dry run")
+        parser.add_argument("--restart", action="store_true", help="Ignore an unfinished run and start from the beginning")
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.show = options["show"]
+        workers = max(1, options["workers"])
+
+        run = None
+        if not self.dry_run:
+            run = MetadataRevalidationRun.objects.filter(status="running").first()
+            if run and options["restart"]:
+                run.delete()
+                run = None
+            if run:
+                self.stdout.write(f"Resuming run {run.id} after evidence {run.last_pk} ({run.processed} done)")
+            else:
+                run = MetadataRevalidationRun.objects.create()
+        last_pk = run.last_pk if run else 0
+
+        # JSON columns are fetched as text so that decoding happens in the workers.
+        evidence_list = (
+            Evidence.objects.filter(metadata_status="complete")
+            .order_by("pk")
+            .values_list(
+                "pk",
+                Cast("metadata", TextField()),
+                "metadata_valid",
+                Cast("metadata_issues", TextField()),
+                "media_status",
+            )
+        )
+        executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        # Results are applied in submission order so the checkpoint only moves past
+        # committed batches; two batches per worker in flight bounds memory.
+        pending = deque()
+        processed = changed = 0
+        started = time.monotonic()
+        try:
+            while True:
+                rows = list(evidence_list.filter(pk__gt=last_pk)[: options["batch_size"]])
+                if rows:
+                    last_pk = rows[-1][0]
+                    if executor:
+                        future = executor.submit(_revalidate_batch, rows)
+                    else:
+                        future = _run_inline(_revalidate_batch, rows)
+                    pending.append((last_pk, len(rows), future))
+                if pending and (not rows or len(pending) >= 2 * workers):
+                    batch_last_pk, count, future = pending.popleft()
+                    changed += self._apply(run, batch_last_pk, count, future.result())
+                    processed += count
+                    rate = processed / max(time.monotonic() - started, 1e-6)
+                    self.stdout.write(f"Processed {processed} evidence item(s), {changed} changed ({rate:.0f}/s)")
+                if not rows and not pending:
+                    break
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        if run:
+            run.status = "complete"
+            run.finished_at = timezone.now()
+            run.save(update_fields=["status", "finished_at", "updated_at"])
+        verb = "would change" if self.dry_run else "changed"
+        self.stdout.write(self.style.SUCCESS(f"Revalidated {processed} evidence item(s); {changed} {verb}"))
+
+    def _apply(self, run, batch_last_pk, count, changes):
+        if self.dry_run:
+            for pk, _, _, _, details in changes[: max(self.show, 0)]:
+                self.stdout.write(f"  evidence {pk}: {details}")
+            self.show -= len(changes)
+            return len(changes)
+
+        # Rows whose new results are identical share one UPDATE; revalidation
+        # tends to produce few distinct outcomes, and this is far cheaper than a
+        # per-row CASE from bulk_update.
+        groups = defaultdict(list)
+        for pk, is_valid, issues, media_status, _ in changes:
+            groups[(is_valid, json.dumps(issues), media_status)].append(pk)
+
+        with transaction.atomic():
+            for (is_valid, issues, media_status), pks in groups.items():
+                Evidence.objects.filter(pk__in=pks).update(
+                    metadata_valid=is_valid, metadata_issues=json.loads(issues), media_status=media_status
+                )
+            EvidenceAuditLog.objects.bulk_create([
+                EvidenceAuditLog(evidence_id=pk, action="Metadata Revalidated", details=details)
+                for pk, _, _, _, details in changes
+            ])
+            run.last_pk = batch_last_pk
+            run.processed += count
+            run.changed += len(changes)
+            run.save(update_fields=["last_pk", "processed", "changed", "updated_at"])
+        return len(changes)
@@ -0,0 +1,119 @@
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Matches the v2 segment size, so a chunk decrypts from a single segment.
+CHUNK_SIZE = 1024 * 1024
+HASH_SIZE = 32
+
+# Leaves and interior nodes are hashed under different prefixes (as in RFC 6962),
+# so an interior node can never be passed off as a leaf.
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def leaf_hash(data):
+    digest = hashlib.sha256(LEAF_PREFIX)
+    digest.update(data)
+    return digest.digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _parents(level):
+    # An unpaired last node is promoted unchanged rather than hashed with a
+    # copy of itself, which would let two different leaf lists share a root.
+    parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def root(leaves):
+    level = list(leaves)
+    while len(level) > 1:
+        level = _parents(level)
+    return level[0]
+
+
+def proof(leaves, index):
+    """The sibling hashes from leaf ``index`` up to the root, as ``(hash, side)`` pairs."""
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"Chunk {index} is out of range")
+    path = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append((level[sibling], 'left' if sibling < index else 'right'))
+        level = _parents(level)
+        index //= 2
+    return path
+
+
+def verify_proof(leaf, path, expected_root):
+    node = leaf
+    for sibling, side in path:
+        node = node_hash(sibling, node) if side == 'left' else node_hash(node, sibling)
+    return node == expected_root
+
+
+def pack(leaves):
+    return b''.join(leaves)
+
+
+def unpack(data):
+    data = bytes(data)
+    return [data[i:i + HASH_SIZE] for i in range(0, len(data), HASH_SIZE)]
+
+
+def chunk_span(start, end, chunk_size=CHUNK_SIZE):
+    """The chunk indices covering bytes ``start`` to ``end`` inclusive."""
+    return range(start // chunk_size, end // chunk_size + 1)
+
+
+class MerkleBuilder:
+    """Splits a stream into ``chunk_size`` leaves and hashes them on a thread pool.
+
+    hashlib releases the GIL while hashing large buffers, so leaves are hashed
+    on other cores while the caller keeps reading. At most ``2 * workers``
+    chunks are in flight. An empty stream has a single empty leaf.
+    """
+
+    def __init__(self, workers=1, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(workers) if workers > 1 else None
+        self.pending = deque()
+        self.leaves = []
+        self.buffer = bytearray()
+
+    def update(self, data):
+        if not self.buffer and len(data) == self.chunk_size:
+            self._submit(bytes(data))
+            return
+        self.buffer += data
+        while len(self.buffer) >= self.chunk_size:
+            self._submit(bytes(self.buffer[:self.chunk_size]))
+            del self.buffer[:self.chunk_size]
+
+    def _submit(self, chunk):
+        if self.executor is None:
+            self.leaves.append(leaf_hash(chunk))
+            return
+        self.pending.append(self.executor.submit(leaf_hash, chunk))
+        while len(self.pending) > 2 * self.workers:
+            self.leaves.append(self.pending.popleft().result())
+
+    def finish(self):
+        """Hash the final partial chunk and return the leaf hashes in order."""
+        if self.buffer or not (self.leaves or self.pending):
+            self._submit(bytes(self.buffer))
+            self.buffer.clear()
+        while self.pending:
+            self.leaves.append(self.pending.popleft().result())
+        if self.executor:
+            self.executor.shutdown()
+        return self.leaves
@@ -1,61 +1,173 @@
 import hashlib
-import io
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Tuple
 from PIL import Image, ExifTags
 from PIL.ExifTags import TAGS, GPSTAGS
+from PIL.Image import Exif
 import struct
 
+from .extractors import find_extractor
+
+# Bump whenever extraction or validation output changes; cached results
+# recorded under another version are then ignored.
+EXTRACTOR_VERSION = '1'
+
+JPEG_INTERCHANGE_FORMAT_LENGTH = 0x0202
+IMAGE_FORMATS = {'JPG', 'PNG', 'WEBP', 'TIFF', 'GIF', 'BMP'}
+
 
 class MetadataExtractor:
     """Extracts comprehensive metadata from evidence files for chain of custody."""
     
+    HEADER_SIZE = 64
+    HASH_CHUNK_SIZE = 64 * 1024
+
     @staticmethod
-    def extract_all_metadata(file_obj, original_filename: str) -> Dict[str, Any]:
-        """Extract all metadata from an evidence file."""
+    def extract_all_metadata(file_obj, original_filename: str, hashes: Optional[Dict[str, str]] = None,
+                             file_size: Optional[int] = None) -> Dict[str, Any]:
+        """Extract all metadata from an evidence file.
+
+        When the ingest pipeline has already computed ``hashes`` and ``file_size``
+        the file is not hashed again; only its header is read for format detection.
+        Images are parsed from their header and metadata segments only; pixel data
+        is decoded later, when previews are rendered (see ``record_pixel_error``).
+        """
+        if hashes is None or file_size is None:
+            hashes, file_size = MetadataExtractor._hash_file(file_obj)
+
         file_obj.seek(0)
-        file_content = file_obj.read()
+        header = file_obj.read(MetadataExtractor.HEADER_SIZE)
         file_obj.seek(0)
         
         metadata = {
-            'file_level': MetadataExtractor._extract_file_level_metadata(file_content, original_filename),
+            'file_level': MetadataExtractor._extract_file_level_metadata(header, file_size, hashes, original_filename),
             'exif': {},
             'authenticity': {}
         }
         
+        file_format, extractor = find_extractor(header)
+        if extractor is not None and file_format not in IMAGE_FORMATS:
+            try:
+                metadata['format'] = extractor.extract(file_obj, file_size)
+            except Exception as e:
+                metadata['format'] = {'error': str(e)}
+            finally:
+                file_obj.seek(0)
+            metadata['exif']['note'] = f'EXIF is not extracted from {file_format} files'
+            return metadata
+        
         try:
-            image = Image.open(io.BytesIO(file_content))
-            metadata['exif'] = MetadataExtractor._extract_exif_metadata(image)
-            metadata['authenticity'] = MetadataExtractor._validate_authenticity(image, metadata['exif'])
+            image = Image.open(file_obj)
+            exif = MetadataExtractor._read_exif(image)
+            metadata['exif'] = MetadataExtractor._extract_exif_metadata(image, exif)
+            metadata['authenticity'] = MetadataExtractor._validate_authenticity(
+                image, metadata['exif'], exif
+            )
         except Exception as e:
             metadata['exif']['error'] = str(e)
             metadata['authenticity']['error'] = str(e)
+        finally:
+            file_obj.seek(0)
         
         return metadata
     
     @staticmethod
-    def _extract_file_level_metadata(file_content: bytes, original_filename: str) -> Dict[str, Any]:
-        """Extract file-level metadata."""
-        file_size = len(file_content)
-        file_format = MetadataExtractor._detect_file_format(file_content)
+    def _hash_file(file_obj) -> Tuple[Dict[str, str], int]:
+        """Hash a file in fixed-size chunks without loading it into memory."""
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        file_size = 0
         
-        hashes = {
-            'md5': hashlib.md5(file_content).hexdigest(),
-            'sha256': hashlib.sha256(file_content).hexdigest()
-        }
+        file_obj.seek(0)
+        while True:
+            chunk = file_obj.read(MetadataExtractor.HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            md5.update(chunk)
+            sha256.update(chunk)
+            file_size += len(chunk)
+        file_obj.seek(0)
+        
+        return {'md5': md5.hexdigest(), 'sha256': sha256.hexdigest()}, file_size
+    
+    @staticmethod
+    def _extract_file_level_metadata(header: bytes, file_size: int, hashes: Dict[str, str],
+                                     original_filename: str) -> Dict[str, Any]:
+        """Extract file-level metadata."""
+        file_format = MetadataExtractor._detect_file_format(header)
         
         return {
             'original_filename': original_filename,
             'file_format': file_format,
             'file_size': file_size,
-            'file_size_human': MetadataExtractor._human_readable_size(file_size),
+            'file_size_human': MetadataExtractor.human_readable_size(file_size),
             'hashes': hashes,
             'timestamp': datetime.utcnow().isoformat()
         }
+
+    @staticmethod
+    def indexed_fields(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Typed values for the indexed evidence columns, taken from extracted metadata.
+
+        EXIF timestamps carry no UTC offset, so they are returned naive and
+        read as camera wall-clock time; container timestamps are UTC.
+        """
+        exif = metadata.get('exif') or {}
+        details = metadata.get('format') or {}
+        basic = exif.get('basic') or {}
+        camera = exif.get('camera') or {}
+        properties = exif.get('image_properties') or {}
+
+        captured_at = None
+        for value in (basic.get('date_time_original'), basic.get('date_time_digitized')):
+            try:
+                captured_at = datetime.strptime(value or '', '%Y:%m:%d %H:%M:%S')
+                break
+            except ValueError:
+                continue
+        if captured_at is None and details.get('creation_time'):
+            try:
+                captured_at = datetime.fromisoformat(details['creation_time'])
+            except ValueError:
+                pass
+            else:
+                if captured_at.tzinfo is None:
+                    captured_at = captured_at.replace(tzinfo=timezone.utc)
+
+        width = height = None
+        size = re.match(r'\((\d+), (\d+)\)$', properties.get('size') or '')
+        if size:
+            width, height = int(size.group(1)), int(size.group(2))
+        elif details.get('video_width'):
+            width, height = details['video_width'], details['video_height']
+
+        def text(value, max_length):
+            value = str(value).strip('\x00 ') if value is not None else ''
+            return value[:max_length] or None
+
+        return {
+            'captured_at': captured_at,
+            'camera_make': text(camera.get('make'), 100),
+            'camera_model': text(camera.get('model'), 100),
+            'camera_serial': text(camera.get('serial_number'), 100),
+            'software': text((exif.get('software') or {}).get('name') or details.get('software')
+                             or details.get('producer'), 255),
+            'pixel_width': width,
+            'pixel_height': height,
+            'file_format': text((metadata.get('file_level') or {}).get('file_format'), 20),
+        }
+
+    @staticmethod
+    def restamp(metadata: Dict[str, Any], original_filename: str) -> Dict[str, Any]:
+        """Point previously extracted metadata at a new upload of the same content."""
+        metadata['file_level']['original_filename'] = original_filename
+        metadata['file_level']['timestamp'] = datetime.utcnow().isoformat()
+        return metadata
     
     @staticmethod
     def _detect_file_format(file_content: bytes) -> str:
-        """Detect file format from magic bytes."""
+        """Detect file format from magic bytes, falling back to the extractor registry."""
         if file_content.startswith(b'\xFF\xD8\xFF'):
             return 'JPG'
         elif file_content.startswith(b'\x89PNG\r\n\x1A\n'):
@@ -64,17 +176,15 @@ class MetadataExtractor:
             return 'WEBP'
         elif file_content.startswith(b'II*\x00') or file_content.startswith(b'MM\x00*'):
             return 'TIFF'
-        elif file_content.startswith(b'ftyp'):
-            return 'HEIC'
         elif file_content.startswith(b'GIF8'):
             return 'GIF'
         elif file_content.startswith(b'BM'):
             return 'BMP'
         else:
-            return 'Unknown'
+            return find_extractor(file_content)[0] or 'Unknown'
     
     @staticmethod
-    def _human_readable_size(size: int) -> str:
+    def human_readable_size(size: int) -> str:
         """Convert file size to human-readable format."""
         for unit in ['B', 'KB', 'MB', 'GB']:
             if size < 1024.0:
@@ -83,7 +193,32 @@ class MetadataExtractor:
         return f"{size:.2f} TB"
     
     @staticmethod
-    def _extract_exif_metadata(image: Image.Image) -> Dict[str, Any]:
+    def _read_exif(image: Image.Image) -> Optional[Exif]:
+        """Return the image's EXIF tags, or ``None`` if it has none.
+
+        Only the metadata already parsed by ``Image.open`` is used. PNG would
+        otherwise decode the whole image looking for an eXIf chunk after IDAT,
+        which the PNG specification does not allow anyway.
+        """
+        if image.format == 'PNG' and 'exif' not in image.info:
+            return None
+        exif = image.getexif()
+        return exif if len(exif) else None
+
+    @staticmethod
+    def _flatten_exif(exif: Exif) -> Dict[int, Any]:
+        """Merge the Exif sub-IFD and GPS IFD into one tag dict, as ``_getexif`` did."""
+        tags = dict(exif)
+        tags.pop(ExifTags.IFD.Exif, None)
+        tags.pop(ExifTags.IFD.GPSInfo, None)
+        tags.update(exif.get_ifd(ExifTags.IFD.Exif))
+        gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+        if gps:
+            tags[ExifTags.IFD.GPSInfo] = gps
+        return tags
+
+    @staticmethod
+    def _extract_exif_metadata(image: Image.Image, exif: Optional[Exif]) -> Dict[str, Any]:
         """Extract EXIF metadata from image."""
         exif_data = {
             'basic': {},
@@ -94,12 +229,11 @@ class MetadataExtractor:
         }
         
         try:
-            exif = image._getexif()
             if exif is None:
                 exif_data['basic']['note'] = 'No EXIF data found'
                 return exif_data
             
-            for tag_id, value in exif.items():
+            for tag_id, value in MetadataExtractor._flatten_exif(exif).items():
                 tag_name = TAGS.get(tag_id, tag_id)
                 
                 if tag_name == 'DateTimeOriginal':
@@ -188,7 +322,7 @@ class MetadataExtractor:
         return gps_data
     
     @staticmethod
-    def _validate_authenticity(image: Image.Image, exif_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_authenticity(image: Image.Image, exif_data: Dict[str, Any], exif: Optional[Exif]) -> Dict[str, Any]:
         """Validate authenticity indicators."""
         authenticity = {
             'metadata_consistency': True,
@@ -199,8 +333,6 @@ class MetadataExtractor:
         }
         
         try:
-            exif = image._getexif()
-            
             if exif is None:
                 authenticity['missing_exif'].append('All EXIF data')
                 authenticity['warnings'].append('No EXIF data found - file may have been stripped')
@@ -248,16 +380,7 @@ class MetadataExtractor:
                             authenticity['warnings'].append(f'Image may have been edited with {sw}')
                             break
             
-            try:
-                if hasattr(image, 'thumbnail'):
-                    thumb_io = io.BytesIO()
-                    image.thumbnail((128, 128))
-                    image.save(thumb_io, format='JPEG')
-                    thumb_size = len(thumb_io.getvalue())
-                    authenticity['thumbnail_check']['thumbnail_generated'] = True
-                    authenticity['thumbnail_check']['thumbnail_size'] = thumb_size
-            except Exception as e:
-                authenticity['thumbnail_check']['error'] = str(e)
+            authenticity['thumbnail_check'] = MetadataExtractor._check_thumbnail(exif)
             
             if not authenticity['signs_of_editing'] and not authenticity['missing_exif']:
                 authenticity['status'] = 'Likely Authentic'
@@ -274,6 +397,25 @@ class MetadataExtractor:
         
         return authenticity
     
+    @staticmethod
+    def _check_thumbnail(exif: Optional[Exif]) -> Dict[str, Any]:
+        """Report the embedded EXIF thumbnail."""
+        thumbnail_check = {}
+        try:
+            ifd1 = exif.get_ifd(ExifTags.IFD.IFD1) if exif is not None else {}
+            thumbnail_length = ifd1.get(JPEG_INTERCHANGE_FORMAT_LENGTH)
+            thumbnail_check['embedded_thumbnail'] = bool(thumbnail_length)
+            if thumbnail_length:
+                thumbnail_check['embedded_thumbnail_size'] = thumbnail_length
+        except Exception as e:
+            thumbnail_check['error'] = str(e)
+        return thumbnail_check
+
+    @staticmethod
+    def record_pixel_error(metadata: Dict[str, Any], error: Exception) -> None:
+        """Note in ``metadata`` that the image's pixel data failed to decode, e.g. because it is truncated."""
+        metadata.setdefault('authenticity', {})['pixel_check'] = {'decoded': False, 'error': str(error)}
+
     @staticmethod
     def validate_metadata_integrity(metadata: Dict[str, Any]) -> Tuple[bool, list]:
         """Validate metadata integrity and return status with issues."""
@@ -296,6 +438,11 @@ class MetadataExtractor:
             issues.append('Signs of editing detected in metadata')
             is_valid = False
         
+        pixel_error = authenticity.get('pixel_check', {}).get('error')
+        if pixel_error:
+            issues.append(f'Image data could not be decoded: {pixel_error}')
+            is_valid = False
+
         if authenticity.get('signs_of_editing'):
             for sign in authenticity['signs_of_editing']:
                 issues.append(f'Editing sign: {sign}')
@@ -0,0 +1,238 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:57
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('cases', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FixitySweepRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('complete', 'Complete')], default='running', max_length=20)),
+                ('last_pk', models.BigIntegerField(default=0)),
+                ('checked', models.BigIntegerField(default=0)),
+                ('failures', models.BigIntegerField(default=0)),
+                ('bytes_read', models.BigIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MetadataRevalidationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('complete', 'Complete')], default='running', max_length=20)),
+                ('last_pk', models.BigIntegerField(default=0)),
+                ('processed', models.BigIntegerField(default=0)),
+                ('changed', models.BigIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Evidence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('media', models.FileField(max_length=500, upload_to='')),
+                ('description', models.CharField(max_length=255)),
+                ('media_type', models.CharField(choices=[('image', 'Image'), ('video', 'Video'), ('audio', 'Audio'), ('document', 'Document'), ('text', 'Text'), ('other', 'Other')], max_length=50)),
+                ('date_uploaded', models.DateTimeField(auto_now_add=True)),
+                ('media_status', models.CharField(choices=[('Valid', 'Valid'), ('Invalid', 'Invalid'), ('Archived', 'Archived')], default='Valid', max_length=20)),
+                ('sha256_hash', models.CharField(editable=False, max_length=64, null=True)),
+                ('is_immutable', models.BooleanField(default=True, editable=False)),
+                ('metadata', models.JSONField(default=dict, editable=False)),
+                ('original_filename', models.CharField(editable=False, max_length=255, null=True)),
+                ('md5_hash', models.CharField(editable=False, max_length=32, null=True)),
+                ('metadata_valid', models.BooleanField(default=True, editable=False)),
+                ('metadata_issues', models.JSONField(default=list, editable=False)),
+                ('file_size', models.BigIntegerField(editable=False, null=True)),
+                ('metadata_status', models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='complete', editable=False, max_length=20)),
+                ('gps_latitude', models.FloatField(blank=True, editable=False, null=True)),
+                ('gps_longitude', models.FloatField(blank=True, editable=False, null=True)),
+                ('geohash', models.CharField(blank=True, editable=False, max_length=12, null=True)),
+                ('captured_at', models.DateTimeField(blank=True, db_index=True, editable=False, null=True)),
+                ('camera_make', models.CharField(blank=True, editable=False, max_length=100, null=True)),
+                ('camera_model', models.CharField(blank=True, editable=False, max_length=100, null=True)),
+                ('camera_serial', models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True)),
+                ('software', models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True)),
+                ('pixel_width', models.PositiveIntegerField(blank=True, editable=False, null=True)),
+                ('pixel_height', models.PositiveIntegerField(blank=True, editable=False, null=True)),
+                ('file_format', models.CharField(blank=True, db_index=True, editable=False, max_length=20, null=True)),
+                ('merkle_root', models.CharField(blank=True, editable=False, max_length=64, null=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence', to='cases.case')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_evidence', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EvidenceAuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=255)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('details', models.TextField(blank=True, null=True)),
+                ('evidence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to='evidence.evidence')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EvidenceBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('file', models.FileField(max_length=500, upload_to='')),
+                ('plaintext_size', models.BigIntegerField()),
+                ('stored_size', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ciphertext_sha256', models.CharField(blank=True, editable=False, max_length=64, null=True)),
+                ('fixity_status', models.CharField(blank=True, choices=[('ok', 'OK'), ('mismatch', 'Mismatch'), ('missing', 'Missing')], db_index=True, max_length=20, null=True)),
+                ('fixity_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence_blobs', to='cases.case')),
+            ],
+            options={
+                'unique_together': {('case', 'sha256')},
+            },
+        ),
+        migrations.AddField(
+            model_name='evidence',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='evidence', to='evidence.evidenceblob'),
+        ),
+        migrations.CreateModel(
+            name='EvidenceMerkleTree',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_size', models.PositiveIntegerField(default=1048576)),
+                ('leaves', models.BinaryField()),
+                ('evidence', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='merkle_tree', to='evidence.evidence')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EvidencePreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveSmallIntegerField()),
+                ('file', models.FileField(max_length=500, upload_to='')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('evidence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='previews', to='evidence.evidence')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ImageFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dhash', models.CharField(max_length=16)),
+                ('band_0', models.PositiveIntegerField(db_index=True)),
+                ('band_1', models.PositiveIntegerField(db_index=True)),
+                ('band_2', models.PositiveIntegerField(db_index=True)),
+                ('band_3', models.PositiveIntegerField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('evidence', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprint', to='evidence.evidence')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MetadataCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('extractor_version', models.CharField(max_length=20)),
+                ('metadata', models.JSONField()),
+                ('metadata_valid', models.BooleanField()),
+                ('metadata_issues', models.JSONField(default=list)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'unique_together': {('sha256', 'extractor_version')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MetadataExtractionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('evidence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metadata_jobs', to='evidence.evidence')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('original_filename', models.CharField(max_length=255)),
+                ('description', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('total_size', models.BigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('received_bytes', models.BigIntegerField(default=0)),
+                ('next_chunk', models.PositiveIntegerField(default=0)),
+                ('chunk_digests', models.JSONField(default=list, editable=False)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('finalizing', 'Finalizing'), ('completed', 'Completed'), ('aborted', 'Aborted')], default='active', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='cases.case')),
+                ('evidence', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_session', to='evidence.evidence')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['geohash', 'gps_latitude', 'gps_longitude'], name='evidence_geo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['camera_make', 'camera_model'], name='evidence_camera_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['pixel_width', 'pixel_height'], name='evidence_dimensions_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['file_size'], name='evidence_file_size_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['date_uploaded'], name='evidence_uploaded_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='evidencepreview',
+            unique_together={('evidence', 'size')},
+        ),
+    ]
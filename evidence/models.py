@@ -1,14 +1,170 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.conf import settings
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.backends import default_backend
-from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.core.files.base import ContentFile, File
 from django.core.exceptions import ValidationError
-import base64
+import functools
 import os
 import hashlib
-import json
+import io
+import tempfile
+import time
+import uuid
+
+from .crypto import (
+    V2_VERSION,
+    SegmentIntegrityError,
+    SegmentedBlobReader,
+    SegmentedBlobWriter,
+    detect_format,
+    iter_decrypt,
+    iter_decrypt_range,
+)
+from . import merkle, perceptual_hash
+from .ingest import IntegrityCheck
+
+
+class EvidenceBlob(models.Model):
+    """Encrypted content shared by every evidence item in a case with the same plaintext.
+
+    Blobs are addressed by plaintext SHA-256 within a case, since the case key is
+    the encryption domain. ``ref_count`` tracks how many evidence rows point at
+    the blob; the stored file is removed once it drops to zero.
+
+    ``ciphertext_sha256`` is the digest of the stored file itself, so fixity
+    sweeps can detect bit rot without the case key or any decryption.
+    """
+
+    FIXITY_STATUS_CHOICES = [
+        ('ok', 'OK'),
+        ('mismatch', 'Mismatch'),
+        ('missing', 'Missing'),
+    ]
+
+    case = models.ForeignKey('cases.Case', on_delete=models.CASCADE, related_name='evidence_blobs')
+    sha256 = models.CharField(max_length=64)
+    file = models.FileField(max_length=500)
+    plaintext_size = models.BigIntegerField()
+    stored_size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    ciphertext_sha256 = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    fixity_status = models.CharField(max_length=20, choices=FIXITY_STATUS_CHOICES, null=True, blank=True, db_index=True)
+    fixity_checked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['case', 'sha256']
+
+    def __str__(self):
+        return f"Blob {self.sha256[:12]} for Case {self.case_id} ({self.ref_count} refs)"
+
+    @classmethod
+    def acquire(cls, case, sha256, refs=1):
+        """Take ``refs`` references to the existing blob for ``sha256``, or return ``None``."""
+        updated = cls.objects.filter(case=case, sha256=sha256).update(ref_count=F('ref_count') + refs)
+        if not updated:
+            return None
+        return cls.objects.get(case=case, sha256=sha256)
+
+    @classmethod
+    def store(cls, case, digests, ciphertext, refs=1):
+        """Save ``ciphertext`` as a new blob holding ``refs`` references."""
+        return cls.prepare(case, digests, ciphertext, refs=refs).insert()
+
+    @classmethod
+    def prepare(cls, case, digests, ciphertext, refs=1):
+        """Write ``ciphertext`` to storage and return the blob for it, unsaved."""
+        ciphertext.seek(0)
+        ciphertext_sha256 = hashlib.file_digest(ciphertext, 'sha256').hexdigest()
+        ciphertext.seek(0)
+        blob = cls(
+            case=case,
+            sha256=digests.sha256,
+            plaintext_size=digests.size,
+            stored_size=ciphertext.size,
+            ref_count=refs,
+            ciphertext_sha256=ciphertext_sha256,
+        )
+        blob.file.save(f"blobs/{case.case_id}/{digests.sha256}", ciphertext, save=False)
+        return blob
+
+    def insert(self):
+        """Save a prepared blob.
+
+        If a concurrent upload stored the same content first, its blob is used and
+        the file written here is discarded.
+        """
+        try:
+            with transaction.atomic():
+                self.save()
+        except IntegrityError:
+            self.file.delete(save=False)
+            return EvidenceBlob.acquire(self.case, self.sha256, refs=self.ref_count)
+        return self
+
+    def release(self):
+        """Drop one reference, deleting the blob with the last one."""
+        EvidenceBlob.objects.filter(pk=self.pk).update(ref_count=F('ref_count') - 1)
+        EvidenceBlob.objects.filter(pk=self.pk, ref_count=0).delete()
+
+    def check_fixity(self, limiter=None):
+        """Rehash the stored ciphertext and record the outcome.
+
+        Returns ``'ok'``, ``'mismatch'``, ``'missing'`` or ``'recorded'`` for blobs
+        stored before ciphertext digests existed, whose first digest becomes the
+        baseline.
+        """
+        from .fixity import sha256_file
+
+        try:
+            with self.file.open('rb') as stored:
+                digest, size = sha256_file(stored, limiter)
+        except FileNotFoundError:
+            outcome = 'missing'
+        else:
+            if self.ciphertext_sha256 is None:
+                self.ciphertext_sha256 = digest
+                outcome = 'recorded'
+            elif digest == self.ciphertext_sha256 and size == self.stored_size:
+                outcome = 'ok'
+            else:
+                outcome = 'mismatch'
+        self.fixity_status = 'ok' if outcome == 'recorded' else outcome
+        self.fixity_checked_at = timezone.now()
+        EvidenceBlob.objects.filter(pk=self.pk).update(
+            ciphertext_sha256=self.ciphertext_sha256,
+            fixity_status=self.fixity_status,
+            fixity_checked_at=self.fixity_checked_at,
+        )
+        return outcome
+
+    @classmethod
+    def saved_bytes_by_case(cls):
+        """Map case primary keys to the bytes deduplication has saved for them."""
+        rows = cls.objects.filter(ref_count__gt=1).values('case').annotate(
+            saved=Sum(F('stored_size') * (F('ref_count') - 1))
+        )
+        return {row['case']: row['saved'] for row in rows}
+
+    @classmethod
+    def storage_stats(cls, case):
+        """Return logical, stored and saved bytes for the deduplicated evidence of ``case``."""
+        totals = cls.objects.filter(case=case).aggregate(
+            stored=Sum('stored_size'),
+            logical=Sum(F('stored_size') * F('ref_count')),
+            duplicates=Sum(F('ref_count') - 1),
+        )
+        stored = totals['stored'] or 0
+        logical = totals['logical'] or 0
+        return {
+            'stored_bytes': stored,
+            'logical_bytes': logical,
+            'saved_bytes': logical - stored,
+            'duplicate_count': totals['duplicates'] or 0,
+        }
 
 
 class Evidence(models.Model):
@@ -27,6 +183,12 @@ class Evidence(models.Model):
         ('Archived', 'Archived')
     ]
 
+    METADATA_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
     case = models.ForeignKey('cases.Case', on_delete=models.CASCADE, related_name='evidence')
     media = models.FileField(max_length=500)
     description = models.CharField(max_length=255)
@@ -41,75 +203,603 @@ class Evidence(models.Model):
     md5_hash = models.CharField(max_length=32, editable=False, null=True)
     metadata_valid = models.BooleanField(default=True, editable=False)
     metadata_issues = models.JSONField(default=list, editable=False)
+    file_size = models.BigIntegerField(editable=False, null=True)
+    metadata_status = models.CharField(max_length=20, choices=METADATA_STATUS_CHOICES, default='complete', editable=False)
+    blob = models.ForeignKey(EvidenceBlob, on_delete=models.RESTRICT, null=True, blank=True, editable=False, related_name='evidence')
+    gps_latitude = models.FloatField(null=True, blank=True, editable=False)
+    gps_longitude = models.FloatField(null=True, blank=True, editable=False)
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
+    captured_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    camera_make = models.CharField(max_length=100, null=True, blank=True, editable=False)
+    camera_model = models.CharField(max_length=100, null=True, blank=True, editable=False)
+    camera_serial = models.CharField(max_length=100, null=True, blank=True, editable=False, db_index=True)
+    software = models.CharField(max_length=255, null=True, blank=True, editable=False, db_index=True)
+    pixel_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    pixel_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_format = models.CharField(max_length=20, null=True, blank=True, editable=False, db_index=True)
+    merkle_root = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    # Columns copied out of ``metadata`` so they can be indexed and queried.
+    INDEXED_METADATA_FIELDS = [
+        'gps_latitude', 'gps_longitude', 'geohash', 'captured_at', 'camera_make', 'camera_model',
+        'camera_serial', 'software', 'pixel_width', 'pixel_height', 'file_format',
+    ]
+
+    class Meta:
+        indexes = [
+            # Covers map queries, so clustering never reads the metadata column.
+            models.Index(fields=['geohash', 'gps_latitude', 'gps_longitude'], name='evidence_geo_idx'),
+            models.Index(fields=['camera_make', 'camera_model'], name='evidence_camera_idx'),
+            models.Index(fields=['pixel_width', 'pixel_height'], name='evidence_dimensions_idx'),
+            models.Index(fields=['file_size'], name='evidence_file_size_idx'),
+            models.Index(fields=['date_uploaded'], name='evidence_uploaded_idx'),
+        ]
 
     def __str__(self):
         return f"Evidence for Case {self.case.id} - {self.description}"
 
-    def _pad_data(self, data):
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(data) + padder.finalize()
-        return padded_data
+    def populate_indexed_metadata(self):
+        """Fill the indexed columns from ``metadata``.
 
-    def _unpad_data(self, padded_data):
-        unpadder = padding.PKCS7(128).unpadder()
-        data = unpadder.update(padded_data) + unpadder.finalize()
-        return data
+        Coordinates come from EXIF GPS tags, or from the QuickTime location of
+        MP4/MOV files; anything out of range is left empty.
+        """
+        from . import geo
+        from .metadata_extractor import MetadataExtractor
 
-    def compute_sha256(self, file_obj):
-        sha256 = hashlib.sha256()
-        for chunk in file_obj.chunks():
-            sha256.update(chunk)
-        file_obj.seek(0)
-        return sha256.hexdigest()
+        for field, value in MetadataExtractor.indexed_fields(self.metadata).items():
+            if field == 'captured_at' and value is not None and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            setattr(self, field, value)
 
-    def encrypt_file(self, file_obj, cipher):
-        encryptor = cipher.encryptor()
-        file_content = file_obj.read()
-        padded_data = self._pad_data(file_content)
-        encrypted_data = encryptor.update(padded_data) + encryptor.finalize()
-        return encrypted_data
+        gps = self.metadata.get('exif', {}).get('gps') or {}
+        latitude, longitude = gps.get('latitude'), gps.get('longitude')
+        if latitude is None or longitude is None:
+            latitude, longitude = geo.parse_iso6709((self.metadata.get('format') or {}).get('location')) or (None, None)
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            latitude = longitude = None
 
-    def decrypt_file(self, encrypted_file, cipher):
-        decryptor = cipher.decryptor()
-        encrypted_data = encrypted_file.read()
-        decrypted_data = decryptor.update(encrypted_data) + decryptor.finalize()
-        return self._unpad_data(decrypted_data)
+        if geo.valid_coordinates(latitude, longitude):
+            self.gps_latitude = latitude
+            self.gps_longitude = longitude
+            self.geohash = geo.encode(latitude, longitude)
+        else:
+            self.gps_latitude = self.gps_longitude = self.geohash = None
 
     def save(self, *args, **kwargs):
-        if self.media and not self.pk:
-            from .metadata_extractor import MetadataExtractor
-            
-            file_obj = self.media
-            self.sha256_hash = self.compute_sha256(file_obj)
-            
-            file_obj.seek(0)
-            file_content = file_obj.read()
-            self.md5_hash = hashlib.md5(file_content).hexdigest()
-            file_obj.seek(0)
-            
-            metadata = MetadataExtractor.extract_all_metadata(file_obj, self.original_filename)
-            self.metadata = metadata
-            
-            is_valid, issues = MetadataExtractor.validate_metadata_integrity(metadata)
-            self.metadata_valid = is_valid
-            self.metadata_issues = issues
-            
-            if not is_valid:
-                self.media_status = 'Invalid'
-            
-            cipher = self.case.encryption_key.get_cipher()
-            encrypted_data = self.encrypt_file(file_obj, cipher)
-            
-            encrypted_filename = f"encrypted_{file_obj.name}"
-            self.media.save(encrypted_filename, ContentFile(encrypted_data), save=False)
+        if not (self.media and not self.pk):
+            super().save(*args, **kwargs)
+            return
+
+        from .ingest import EvidenceIngestPipeline, is_seekable
+
+        file_obj = self.media
+        pipeline = EvidenceIngestPipeline(self.case.encryption_key.key)
+        if is_seekable(file_obj):
+            # Encrypted below only if it is not a duplicate of an existing blob.
+            digests = pipeline.digest(file_obj)
+        else:
+            # Read once: hash and encrypt together, dropping the ciphertext of a duplicate.
+            digests = pipeline.run(file_obj)
+        self.sha256_hash = digests.sha256
+        self.md5_hash = digests.md5
+        self.file_size = digests.size
+        self.merkle_root = digests.merkle_root
+
+        try:
+            queue_metadata = settings.EVIDENCE_ASYNC_METADATA
+            if queue_metadata:
+                self.metadata_status = 'pending'
+            else:
+                self.apply_metadata(file_obj)
+
+            with transaction.atomic():
+                blob = EvidenceBlob.acquire(self.case, digests.sha256)
+                if blob is None:
+                    with digests.ciphertext or pipeline.encrypt(file_obj) as ciphertext:
+                        blob = EvidenceBlob.store(self.case, digests, ciphertext)
+                self.blob = blob
+                self.media = blob.file.name
+                super().save(*args, **kwargs)
+                EvidenceMerkleTree.objects.create(evidence=self, leaves=merkle.pack(digests.merkle_leaves))
+        finally:
+            if digests.ciphertext is not None:
+                digests.ciphertext.close()
+
+        if queue_metadata:
+            MetadataExtractionJob.enqueue(self)
+        elif self.media_type == 'image':
+            if self.generate_previews(file_obj):
+                self.save(update_fields=['metadata', 'metadata_valid', 'metadata_issues', 'media_status'])
+            ImageFingerprint.record(self, file_obj)
+
+    def apply_metadata(self, file_obj, cached=None):
+        metadata, is_valid, issues = cached or MetadataCacheEntry.extract(
+            file_obj,
+            self.original_filename,
+            hashes={'md5': self.md5_hash, 'sha256': self.sha256_hash},
+            file_size=self.file_size,
+        )
+        self.metadata = metadata
+        self.metadata_valid = is_valid
+        self.metadata_issues = issues
+        self.metadata_status = 'complete'
+        self.populate_indexed_metadata()
         
-        super().save(*args, **kwargs)
+        if not is_valid:
+            self.media_status = 'Invalid'
 
-    def get_decrypted_file(self):
-        cipher = self.case.encryption_key.get_cipher()
+    def extract_metadata_from_storage(self, heartbeat=None):
+        """Decrypt the stored blob to a temporary file and extract its metadata.
+
+        Cached results for non-image content are applied without decrypting;
+        images are always decrypted because their previews and fingerprint need
+        the pixels. ``heartbeat`` is called as decryption and each later step
+        make progress.
+        """
+        heartbeat = heartbeat or (lambda: None)
+        update_fields = [
+            'metadata', 'metadata_valid', 'metadata_issues', 'metadata_status', 'media_status',
+            *self.INDEXED_METADATA_FIELDS,
+        ]
+        if self.media_type != 'image':
+            cached = MetadataCacheEntry.lookup(self.sha256_hash, self.original_filename)
+            if cached is not None:
+                self.apply_metadata(None, cached=cached)
+                self.save(update_fields=update_fields)
+                return
+
+        with tempfile.TemporaryFile(dir=settings.FILE_UPLOAD_TEMP_DIR) as plaintext:
+            for chunk in self.iter_decrypted_chunks():
+                plaintext.write(chunk)
+                heartbeat()
+            plaintext.seek(0)
+            self.apply_metadata(File(plaintext))
+            heartbeat()
+            if self.media_type == 'image':
+                self.generate_previews(plaintext)
+                heartbeat()
+                ImageFingerprint.record(self, plaintext)
+        self.save(update_fields=update_fields)
+
+    def generate_previews(self, plaintext):
+        """Store previews from a decrypted copy.
+
+        Rendering is where the pixel data is first decoded, so an image that
+        fails here, e.g. a truncated one, is marked invalid; files PIL cannot
+        identify at all simply get no previews. Returns whether it was marked.
+        """
+        from PIL import UnidentifiedImageError
+
+        from .metadata_extractor import MetadataExtractor
+
+        plaintext.seek(0)
+        try:
+            EvidencePreview.generate(self, plaintext)
+        except UnidentifiedImageError:
+            return False
+        except OSError as e:
+            MetadataExtractor.record_pixel_error(self.metadata, e)
+            self.metadata_valid, self.metadata_issues = MetadataExtractor.validate_metadata_integrity(self.metadata)
+            self.media_status = 'Invalid'
+            return True
+        return False
+
+    @property
+    def format_details(self):
+        """Container-level metadata from the format extractors, as display rows."""
+        details = self.metadata.get('format') or {}
+        return [(key.replace('_', ' ').capitalize(), value) for key, value in details.items()]
+
+    @property
+    def plaintext_size(self):
+        if self.file_size is not None:
+            return self.file_size
+        return self.metadata.get('file_level', {}).get('file_size')
+
+    def iter_decrypted_chunks(self, chunk_size=None):
+        encryption_key = self.case.encryption_key
+        chunk_size = chunk_size or settings.EVIDENCE_CHUNK_SIZE
+        with self.media.open('rb') as encrypted_file:
+            if detect_format(encrypted_file) == V2_VERSION:
+                reader = SegmentedBlobReader(
+                    encryption_key.key, encrypted_file, workers=settings.EVIDENCE_CRYPTO_WORKERS
+                )
+                yield from reader.iter_segments()
+            else:
+                yield from iter_decrypt(encrypted_file, encryption_key.get_cipher(), chunk_size)
+
+    def iter_decrypted_range(self, start, end, chunk_size=None):
+        encryption_key = self.case.encryption_key
+        chunk_size = chunk_size or settings.EVIDENCE_CHUNK_SIZE
+        with self.media.open('rb') as encrypted_file:
+            if detect_format(encrypted_file) == V2_VERSION:
+                reader = SegmentedBlobReader(
+                    encryption_key.key, encrypted_file, workers=settings.EVIDENCE_CRYPTO_WORKERS
+                )
+                yield from reader.iter_range(start, end)
+            else:
+                yield from iter_decrypt_range(
+                    encrypted_file, encryption_key.get_cipher, start, end, chunk_size
+                )
+
+    def find_corrupted_segments(self):
+        """Return the indices of damaged segments, or ``None`` for v1 blobs which carry no tags."""
         with self.media.open('rb') as encrypted_file:
-            decrypted_data = self.decrypt_file(encrypted_file, cipher)
-        return ContentFile(decrypted_data, name=self.media.name.replace('encrypted_', ''))
+            if detect_format(encrypted_file) != V2_VERSION:
+                return None
+            reader = SegmentedBlobReader(self.case.encryption_key.key, encrypted_file)
+            return reader.corrupted_segments()
+
+    def verify_integrity(self):
+        """Stream-decrypt the stored content and compare its digests with the recorded hashes.
+
+        SHA-256 and MD5 are computed in the same pass, so memory use is bounded
+        by the chunk size regardless of the evidence size.
+        """
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        size = 0
+        error = None
+        started = time.monotonic()
+        try:
+            for chunk in self.iter_decrypted_chunks():
+                sha256.update(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+        except (SegmentIntegrityError, ValueError, OSError) as exc:
+            error = str(exc)
+        passed = (
+            error is None
+            and sha256.hexdigest() == self.sha256_hash
+            and md5.hexdigest() == self.md5_hash
+        )
+        return IntegrityCheck(
+            passed=passed,
+            sha256=sha256.hexdigest(),
+            md5=md5.hexdigest(),
+            size=size,
+            duration=time.monotonic() - started,
+            error=error,
+        )
+
+    def verify_chunks(self, start, end):
+        """Check the stored content of bytes ``start``..``end`` against the Merkle tree.
+
+        Only the chunks covering the range are decrypted. Returns the indices of
+        chunks whose hash differs from the recorded leaf; raises ``ValueError``
+        if the recorded leaves no longer hash to ``merkle_root``.
+        """
+        tree = self.merkle_tree
+        leaves = tree.leaf_hashes()
+        if merkle.root(leaves).hex() != self.merkle_root:
+            raise ValueError("Recorded Merkle leaves do not match the evidence root")
+        span = merkle.chunk_span(start, end, tree.chunk_size)
+        first = span.start * tree.chunk_size
+        last = min(span.stop * tree.chunk_size, self.file_size) - 1
+        builder = merkle.MerkleBuilder(chunk_size=tree.chunk_size)
+        try:
+            for chunk in self.iter_decrypted_range(first, last):
+                builder.update(chunk)
+        except SegmentIntegrityError as exc:
+            return [exc.segment_index]
+        computed = builder.finish()
+        return [index for index, leaf in zip(span, computed) if leaf != leaves[index]]
+
+    def get_decrypted_file(self):
+        decrypted_data = b''.join(self.iter_decrypted_chunks())
+        return ContentFile(decrypted_data, name=self.original_filename or os.path.basename(self.media.name))
+
+
+class EvidenceMerkleTree(models.Model):
+    """Leaf hashes of an evidence file's fixed-size chunks; the root is ``Evidence.merkle_root``.
+
+    Kept out of the evidence row because a multi-GB file has thousands of leaves.
+    """
+
+    evidence = models.OneToOneField(Evidence, on_delete=models.CASCADE, related_name='merkle_tree')
+    chunk_size = models.PositiveIntegerField(default=merkle.CHUNK_SIZE)
+    leaves = models.BinaryField()
+
+    def __str__(self):
+        return f"Merkle tree for Evidence {self.evidence_id} ({self.leaf_count} chunks)"
+
+    @property
+    def leaf_count(self):
+        return len(self.leaves) // merkle.HASH_SIZE
+
+    def leaf_hashes(self):
+        return merkle.unpack(self.leaves)
+
+
+class EvidencePreview(models.Model):
+    """A downscaled JPEG rendition of image evidence, encrypted under the case key.
+
+    Previews let listings show what an image looks like without decrypting the
+    original. They are generated by the metadata worker, which already holds a
+    decrypted copy, or on first request.
+    """
+
+    SIZES = (128, 512)
+
+    evidence = models.ForeignKey(Evidence, on_delete=models.CASCADE, related_name='previews')
+    size = models.PositiveSmallIntegerField()
+    file = models.FileField(max_length=500)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['evidence', 'size']
+
+    def __str__(self):
+        return f"{self.size}px preview of Evidence {self.evidence_id}"
+
+    @classmethod
+    def get_or_generate(cls, evidence, size):
+        """Return the stored preview, rendering it from the decrypted original if needed."""
+        preview = cls.objects.filter(evidence=evidence, size=size).first()
+        if preview is not None:
+            return preview
+        with tempfile.TemporaryFile(dir=settings.FILE_UPLOAD_TEMP_DIR) as plaintext:
+            for chunk in evidence.iter_decrypted_chunks():
+                plaintext.write(chunk)
+            plaintext.seek(0)
+            return cls.generate(evidence, plaintext, sizes=[size])[0]
+
+    @classmethod
+    def generate(cls, evidence, plaintext, sizes=None):
+        """Render and store previews of ``plaintext`` at ``sizes``, largest first."""
+        from PIL import Image, ImageOps
+
+        key = evidence.case.encryption_key.key
+        previews = []
+        image = Image.open(plaintext)
+        image.draft('RGB', (max(sizes or cls.SIZES),) * 2)
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        for size in sorted(sizes or cls.SIZES, reverse=True):
+            image.thumbnail((size, size))
+            rendered = io.BytesIO()
+            image.save(rendered, format='JPEG', quality=80)
+
+            encrypted = io.BytesIO()
+            writer = SegmentedBlobWriter(key, encrypted)
+            writer.write(rendered.getvalue())
+            writer.close()
+
+            preview = cls(evidence=evidence, size=size, width=image.width, height=image.height)
+            preview.file.save(
+                f"previews/{evidence.case.case_id}/{evidence.id}_{size}",
+                ContentFile(encrypted.getvalue()),
+                save=False,
+            )
+            try:
+                with transaction.atomic():
+                    preview.save()
+            except IntegrityError:
+                preview.file.delete(save=False)
+                preview = cls.objects.get(evidence=evidence, size=size)
+            previews.append(preview)
+        return previews
+
+    def read(self):
+        """Return the decrypted JPEG bytes."""
+        with self.file.open('rb') as encrypted_file:
+            reader = SegmentedBlobReader(self.evidence.case.encryption_key.key, encrypted_file)
+            return b''.join(reader.iter_segments())
+
+
+class ImageFingerprint(models.Model):
+    """Perceptual hash of image evidence, for finding resized or re-encoded copies.
+
+    The 64-bit dHash is also stored as four indexed 16-bit bands (multi-index
+    hashing). Two hashes within distance ``k`` must agree to within ``k // 4``
+    bits on at least one band, so a query looks up the band neighbours on the
+    indexes and only checks the full distance on those candidates.
+    """
+
+    MAX_DISTANCE = 10
+
+    evidence = models.OneToOneField(Evidence, on_delete=models.CASCADE, related_name='fingerprint')
+    dhash = models.CharField(max_length=16)
+    band_0 = models.PositiveIntegerField(db_index=True)
+    band_1 = models.PositiveIntegerField(db_index=True)
+    band_2 = models.PositiveIntegerField(db_index=True)
+    band_3 = models.PositiveIntegerField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"dHash {self.dhash} of Evidence {self.evidence_id}"
+
+    @classmethod
+    def from_hash(cls, evidence, value):
+        """Build an unsaved fingerprint, for ``bulk_create``."""
+        band_0, band_1, band_2, band_3 = perceptual_hash.bands(value)
+        return cls(
+            evidence=evidence,
+            dhash=perceptual_hash.to_hex(value),
+            band_0=band_0,
+            band_1=band_1,
+            band_2=band_2,
+            band_3=band_3,
+        )
+
+    @classmethod
+    def record(cls, evidence, file_obj):
+        """Hash ``file_obj`` and store it for ``evidence``; unreadable images are skipped."""
+        from PIL import UnidentifiedImageError
+
+        file_obj.seek(0)
+        try:
+            value = perceptual_hash.dhash(file_obj)
+        except (UnidentifiedImageError, OSError):
+            return None
+        fingerprint = cls.from_hash(evidence, value)
+        cls.objects.filter(evidence=evidence).delete()
+        fingerprint.save()
+        return fingerprint
+
+    @property
+    def value(self):
+        return int(self.dhash, 16)
+
+    def similar(self, max_distance=6, queryset=None):
+        """Return ``(fingerprint, distance)`` pairs within ``max_distance``, nearest first."""
+        if not 0 <= max_distance <= self.MAX_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {self.MAX_DISTANCE}")
+        radius = max_distance // perceptual_hash.BANDS
+        match = models.Q()
+        for i, band in enumerate(perceptual_hash.bands(self.value)):
+            match |= models.Q(**{f'band_{i}__in': perceptual_hash.band_neighbours(band, radius)})
+
+        queryset = ImageFingerprint.objects.all() if queryset is None else queryset
+        candidates = queryset.filter(match).exclude(evidence_id=self.evidence_id).values_list('pk', 'dhash')
+        distances = {}
+        for pk, dhash in candidates:
+            distance = perceptual_hash.hamming(self.value, int(dhash, 16))
+            if distance <= max_distance:
+                distances[pk] = distance
+        matches = ImageFingerprint.objects.filter(pk__in=distances).select_related('evidence__case')
+        return sorted(
+            ((fingerprint, distances[fingerprint.pk]) for fingerprint in matches),
+            key=lambda pair: (pair[1], pair[0].evidence_id),
+        )
+
+
+class MetadataCacheEntry(models.Model):
+    """Extraction and validation results for content that has been seen before.
+
+    Entries are keyed by SHA-256 and extractor version, so a repeat upload of the
+    same bytes skips extraction and a version bump invalidates everything. Only
+    content-derived fields are reused; the filename and timestamp are restamped
+    per upload. The table is capped at ``EVIDENCE_METADATA_CACHE_SIZE`` rows and
+    the least recently used entries are evicted first.
+    """
+
+    sha256 = models.CharField(max_length=64)
+    extractor_version = models.CharField(max_length=20)
+    metadata = models.JSONField()
+    metadata_valid = models.BooleanField()
+    metadata_issues = models.JSONField(default=list)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        unique_together = ['sha256', 'extractor_version']
+
+    def __str__(self):
+        return f"Metadata for {self.sha256[:12]} (extractor v{self.extractor_version})"
+
+    @classmethod
+    def extract(cls, file_obj, original_filename, hashes, file_size):
+        """Return ``(metadata, is_valid, issues)``, from the cache when the content is known."""
+        from .metadata_extractor import MetadataExtractor
+
+        cached = cls.lookup(hashes['sha256'], original_filename)
+        if cached is not None:
+            return cached
+
+        metadata = MetadataExtractor.extract_all_metadata(
+            file_obj, original_filename, hashes=hashes, file_size=file_size
+        )
+        is_valid, issues = MetadataExtractor.validate_metadata_integrity(metadata)
+        cls.store([(metadata, is_valid, issues)])
+        return metadata, is_valid, issues
+
+    @classmethod
+    def lookup(cls, sha256, original_filename):
+        """Return cached ``(metadata, is_valid, issues)`` for ``sha256``, or ``None``."""
+        from .metadata_extractor import EXTRACTOR_VERSION, MetadataExtractor
+
+        entry = cls.objects.filter(sha256=sha256, extractor_version=EXTRACTOR_VERSION).first()
+        if entry is None:
+            return None
+        cls.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+        metadata = MetadataExtractor.restamp(entry.metadata, original_filename)
+        return metadata, entry.metadata_valid, entry.metadata_issues
+
+    @classmethod
+    def store(cls, results):
+        """Cache ``(metadata, is_valid, issues)`` results, then evict down to the size limit."""
+        from .metadata_extractor import EXTRACTOR_VERSION
+
+        cls.objects.bulk_create(
+            [
+                cls(
+                    sha256=metadata['file_level']['hashes']['sha256'],
+                    extractor_version=EXTRACTOR_VERSION,
+                    metadata=metadata,
+                    metadata_valid=is_valid,
+                    metadata_issues=issues,
+                )
+                for metadata, is_valid, issues in results
+            ],
+            ignore_conflicts=True,
+        )
+        cls.evict()
+
+    @classmethod
+    def evict(cls, limit=None):
+        from .metadata_extractor import EXTRACTOR_VERSION
+
+        limit = settings.EVIDENCE_METADATA_CACHE_SIZE if limit is None else limit
+        cls.objects.exclude(extractor_version=EXTRACTOR_VERSION).delete()
+        stale = cls.objects.order_by('-last_used_at', '-pk').values_list('pk', flat=True)[limit:]
+        return cls.objects.filter(pk__in=list(stale)).delete()[0]
+
+
+class MetadataRevalidationRun(models.Model):
+    """Progress of a ``revalidate_evidence_metadata`` pass, so an interrupted run can resume.
+
+    Evidence is processed in primary-key order and ``last_pk`` only advances once
+    a batch's results are committed.
+    """
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('complete', 'Complete'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    last_pk = models.BigIntegerField(default=0)
+    processed = models.BigIntegerField(default=0)
+    changed = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Revalidation {self.id} ({self.status}, {self.processed} processed, {self.changed} changed)"
+
+
+class FixitySweepRun(models.Model):
+    """Progress of a ``fixity_sweep`` over every stored blob, so a sweep can span several nights."""
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('complete', 'Complete'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    last_pk = models.BigIntegerField(default=0)
+    checked = models.BigIntegerField(default=0)
+    failures = models.BigIntegerField(default=0)
+    bytes_read = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Fixity sweep {self.id} ({self.status}, {self.checked} checked, {self.failures} failed)"
 
 
 class EvidenceAuditLog(models.Model):
@@ -125,3 +815,248 @@ class EvidenceAuditLog(models.Model):
 
     def __str__(self):
         return f"[{self.timestamp}] {self.user} - {self.action} on evidence {self.evidence.id}"
+
+
+class MetadataExtractionJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    evidence = models.ForeignKey(Evidence, on_delete=models.CASCADE, related_name='metadata_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # Seconds between heartbeat writes while a job runs.
+    HEARTBEAT_INTERVAL = 30
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Metadata job {self.id} for evidence {self.evidence_id} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, evidence):
+        return cls.objects.create(evidence=evidence)
+
+    @classmethod
+    def claim_next(cls, worker):
+        """Atomically move the oldest queued job to ``running`` and return it, or ``None``."""
+        while True:
+            job = cls.objects.filter(status='queued').order_by('created_at', 'id').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = cls.objects.filter(pk=job.pk, status='queued').update(
+                status='running',
+                worker=worker,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=models.F('attempts') + 1,
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    @classmethod
+    def requeue_stale(cls, older_than):
+        """Return jobs whose worker has sent no heartbeat for ``older_than`` to the queue."""
+        return cls.objects.filter(
+            status='running', heartbeat_at__lt=timezone.now() - older_than
+        ).update(status='queued', worker='')
+
+    def heartbeat(self):
+        """Record that the job is still making progress, at most every ``HEARTBEAT_INTERVAL`` seconds."""
+        now = timezone.now()
+        if self.heartbeat_at and (now - self.heartbeat_at).total_seconds() < self.HEARTBEAT_INTERVAL:
+            return
+        self.heartbeat_at = now
+        MetadataExtractionJob.objects.filter(pk=self.pk, status='running', worker=self.worker).update(heartbeat_at=now)
+
+    def run(self, max_attempts=3):
+        evidence = self.evidence
+        try:
+            evidence.extract_metadata_from_storage(heartbeat=self.heartbeat)
+        except Exception as e:
+            self.last_error = str(e)
+            if self.attempts >= max_attempts:
+                self.status = 'failed'
+                Evidence.objects.filter(pk=evidence.pk).update(metadata_status='failed')
+            else:
+                self.status = 'queued'
+        else:
+            self.status = 'done'
+            self.last_error = ''
+            EvidenceAuditLog.log_action(
+                user=None,
+                evidence=evidence,
+                action="Metadata Extracted",
+                details=f"Metadata valid: {evidence.metadata_valid}",
+            )
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'last_error', 'finished_at'])
+        return self.status
+
+
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('finalizing', 'Finalizing'),
+        ('completed', 'Completed'),
+        ('aborted', 'Aborted'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    case = models.ForeignKey('cases.Case', on_delete=models.CASCADE, related_name='upload_sessions')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    original_filename = models.CharField(max_length=255)
+    description = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    next_chunk = models.PositiveIntegerField(default=0)
+    chunk_digests = models.JSONField(default=list, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    evidence = models.OneToOneField(Evidence, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_session')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Upload {self.id} of {self.original_filename} ({self.received_bytes}/{self.total_size} bytes)"
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def staging_path(self):
+        return os.path.join(settings.EVIDENCE_UPLOAD_STAGING_DIR, f"{self.id}.part")
+
+    def expected_chunk_size(self, index):
+        if index < self.total_chunks - 1:
+            return self.chunk_size
+        return self.total_size - index * self.chunk_size
+
+    def write_chunk(self, index, stream, expected_sha256=None, read_size=64 * 1024):
+        """Append chunk ``index`` from ``stream`` to the staging file.
+
+        The staging file is truncated to the acknowledged length first, so a chunk
+        that was cut off mid-transfer can simply be sent again. Each chunk's
+        SHA-256 is persisted so a resumed client can check what the server holds.
+        """
+        if self.status != 'active':
+            raise ValidationError("Upload session is not active")
+        if index != self.next_chunk:
+            raise ValidationError(f"Expected chunk {self.next_chunk}, got {index}")
+
+        expected = self.expected_chunk_size(index)
+        digest = hashlib.sha256()
+        written = 0
+        os.makedirs(settings.EVIDENCE_UPLOAD_STAGING_DIR, exist_ok=True)
+        with open(self.staging_path, 'ab') as staging:
+            staging.truncate(self.received_bytes)
+            staging.seek(self.received_bytes)
+            while written <= expected:
+                data = stream.read(min(read_size, expected + 1 - written))
+                if not data:
+                    break
+                staging.write(data)
+                digest.update(data)
+                written += len(data)
+            if written != expected:
+                staging.truncate(self.received_bytes)
+                raise ValidationError(f"Chunk {index} must be {expected} bytes, got {written}")
+            if expected_sha256 and expected_sha256 != digest.hexdigest():
+                staging.truncate(self.received_bytes)
+                raise ValidationError(f"Chunk {index} checksum mismatch")
+
+        self.chunk_digests = self.chunk_digests + [digest.hexdigest()]
+        self.received_bytes += written
+        self.next_chunk += 1
+        self.save(update_fields=['chunk_digests', 'received_bytes', 'next_chunk', 'updated_at'])
+        return digest.hexdigest()
+
+    def finalize(self, media_type):
+        """Turn the completed staging file into an ``Evidence`` row via the normal ingest path.
+
+        The session is claimed with a conditional update before ingest starts, so
+        a retried or doubled request cannot ingest it a second time; a failed
+        ingest hands it back.
+        """
+        if self.received_bytes != self.total_size:
+            raise ValidationError(
+                f"Upload incomplete: {self.received_bytes} of {self.total_size} bytes received"
+            )
+        claimed = UploadSession.objects.filter(pk=self.pk, status='active').update(
+            status='finalizing', updated_at=timezone.now()
+        )
+        if not claimed:
+            self.refresh_from_db(fields=['status', 'evidence'])
+            raise ValidationError("Upload session is not active")
+        self.status = 'finalizing'
+
+        try:
+            with open(self.staging_path, 'rb') as staging:
+                evidence = Evidence(
+                    case=self.case,
+                    media=File(staging, name=self.original_filename),
+                    description=self.description,
+                    media_type=media_type,
+                    uploaded_by=self.user,
+                    original_filename=self.original_filename,
+                )
+                evidence.save()
+        except Exception:
+            UploadSession.objects.filter(pk=self.pk).update(status='active', updated_at=timezone.now())
+            self.status = 'active'
+            raise
+
+        self.evidence = evidence
+        self.status = 'completed'
+        self.save(update_fields=['evidence', 'status', 'updated_at'])
+        self.discard_staging()
+        return evidence
+
+    def abort(self):
+        # Conditional like finalize(), so an abort cannot pull the staging file
+        # out from under an ingest that has already claimed the session.
+        if UploadSession.objects.filter(pk=self.pk, status='active').update(
+            status='aborted', updated_at=timezone.now()
+        ):
+            self.discard_staging()
+        self.refresh_from_db(fields=['status'])
+
+    def discard_staging(self):
+        try:
+            os.remove(self.staging_path)
+        except FileNotFoundError:
+            pass
+
+
+# Cleanup runs on signals, not in delete(), so queryset deletes and cascades
+# from Case release blob references and remove files too. Files go once the
+# deletion commits, so a rolled back delete leaves them in place.
+
+@receiver(post_delete, sender=Evidence)
+def release_evidence_blob(sender, instance, **kwargs):
+    if instance.blob_id is not None:
+        EvidenceBlob(pk=instance.blob_id).release()
+
+
+@receiver(post_delete, sender=EvidenceBlob)
+@receiver(post_delete, sender=EvidencePreview)
+def delete_stored_file(sender, instance, **kwargs):
+    transaction.on_commit(functools.partial(instance.file.delete, save=False))
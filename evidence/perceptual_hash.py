@@ -0,0 +1,51 @@
+from itertools import combinations
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def dhash(file_obj):
+    """Return the 64-bit difference hash of an image as an int.
+
+    The image is reduced to 9x8 greyscale and each bit records whether a pixel
+    is brighter than its right-hand neighbour, so the hash survives resizing and
+    recompression. JPEGs are decoded at reduced scale through ``draft``.
+    """
+    from PIL import Image, ImageOps
+
+    image = Image.open(file_obj)
+    image.draft('L', (64, 64))
+    image = ImageOps.exif_transpose(image).convert('L')
+    pixels = image.resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def to_hex(value):
+    return f"{value:016x}"
+
+
+def bands(value):
+    """Split a hash into ``BANDS`` 16-bit integers, most significant first."""
+    return [(value >> (BAND_BITS * (BANDS - 1 - i))) & BAND_MASK for i in range(BANDS)]
+
+
+def band_neighbours(band, radius):
+    """Every 16-bit value within ``radius`` bits of ``band``."""
+    values = [band]
+    for r in range(1, radius + 1):
+        for positions in combinations(range(BAND_BITS), r):
+            flipped = band
+            for position in positions:
+                flipped ^= 1 << position
+            values.append(flipped)
+    return values
@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from cases.models import Case
+from ..models import Evidence
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class SyntheticStream(io.RawIOBase):
+    """Seekable stream of ``size`` pseudo-random bytes that never materialises them."""
+
+    def __init__(self, size):
+        self.size = size
+        self.position = 0
+        self.block = os.urandom(1024 * 1024)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        else:
+            self.position = self.size + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def readinto(self, buffer):
+        remaining = min(len(buffer), self.size - self.position)
+        if remaining <= 0:
+            return 0
+        offset = self.position % len(self.block)
+        count = min(remaining, len(self.block) - offset)
+        buffer[:count] = self.block[offset:offset + count]
+        self.position += count
+        return count
+
+
+def make_jpeg(size=(64, 48), exif=None, pattern=None, quality=75):
+    """A JPEG of ``size``: flat red, or a detailed Mandelbrot render when ``pattern`` is ``'scene'``.
+
+    ``exif`` maps EXIF tags to values; a dict value fills the IFD of that tag,
+    e.g. ``ExifTags.IFD.GPSInfo``.
+    """
+    if pattern == 'scene':
+        image = Image.effect_mandelbrot(size, (-2.0, -1.2, 0.8, 1.2), 60).convert('RGB')
+    else:
+        image = Image.new('RGB', size, color=(200, 30, 30))
+    options = {'quality': quality}
+    if exif:
+        options['exif'] = Image.Exif()
+        for tag, value in exif.items():
+            if isinstance(value, dict):
+                options['exif'].get_ifd(tag).update(value)
+            else:
+                options['exif'][tag] = value
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', **options)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class EvidenceTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.investigator = User.objects.create_user(
+            email='investigator@test.com',
+            first_name='Ivy',
+            last_name='Investigator',
+            password='testpass123',
+            role='investigator',
+            is_active=True,
+            verified=True,
+        )
+        self.case = Case.objects.create(
+            case_title='Test Case',
+            case_description='Test Description',
+            case_category='Cybercrime',
+            created_by=self.investigator,
+        )
+
+    def upload(self, content, name='photo.jpg', content_type='image/jpeg', media_type='image'):
+        if isinstance(content, bytes):
+            content = SimpleUploadedFile(name, content, content_type=content_type)
+        evidence = Evidence(
+            case=self.case,
+            media=content,
+            description='Test Evidence',
+            media_type=media_type,
+            uploaded_by=self.investigator,
+            original_filename=name,
+        )
+        evidence.save()
+        return evidence
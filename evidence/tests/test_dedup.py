@@ -0,0 +1,136 @@
+import hashlib
+import io
+import os
+import random
+from unittest import mock
+
+from django.core.files.uploadedfile import UploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from cases.models import Case
+from .. import perceptual_hash
+from ..models import Evidence, EvidenceBlob, EvidencePreview, ImageFingerprint
+from .base import EvidenceTestCase, make_jpeg
+
+
+class UnseekableStream(io.BytesIO):
+    """An upload that can only be read once, like a request body streamed straight through."""
+
+    def seekable(self):
+        return False
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation('seek')
+
+
+class EvidenceBlobDeduplicationTest(EvidenceTestCase):
+    def test_duplicate_uploads_share_one_blob(self):
+        content = make_jpeg()
+        first = self.upload(content)
+        with mock.patch('evidence.ingest.EvidenceIngestPipeline.encrypt') as encrypt:
+            second = self.upload(content, name='copy.jpg')
+        encrypt.assert_not_called()
+        other = self.upload(make_jpeg(size=(32, 32)))
+
+        self.assertEqual(first.blob, second.blob)
+        self.assertEqual(first.media.name, second.media.name)
+        self.assertNotEqual(first.blob, other.blob)
+        self.assertEqual(second.get_decrypted_file().read(), content)
+
+        stats = EvidenceBlob.storage_stats(self.case)
+        self.assertEqual(stats['duplicate_count'], 1)
+        self.assertEqual(stats['saved_bytes'], first.blob.stored_size)
+        self.assertEqual(EvidenceBlob.saved_bytes_by_case(), {self.case.pk: first.blob.stored_size})
+
+        blob_path = first.blob.file.path
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertTrue(os.path.exists(blob_path))
+        with self.captureOnCommitCallbacks(execute=True):
+            Evidence.objects.filter(pk=first.pk).delete()
+        self.assertFalse(os.path.exists(blob_path))
+        self.assertFalse(EvidenceBlob.objects.filter(sha256=hashlib.sha256(content).hexdigest()).exists())
+
+    def test_deleting_a_case_removes_its_blobs_and_files(self):
+        content = make_jpeg()
+        first = self.upload(content)
+        self.upload(content, name='copy.jpg')
+        self.upload(make_jpeg(size=(32, 32)), name='other.jpg')
+        preview = EvidencePreview.get_or_generate(first, 128)
+        paths = [blob.file.path for blob in EvidenceBlob.objects.all()] + [preview.file.path]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.delete()
+
+        self.assertFalse(Evidence.objects.exists())
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    def test_unseekable_uploads_are_hashed_and_encrypted_in_one_pass(self):
+        content = os.urandom(300_000)
+        first = self.upload(content, name='disk.bin', content_type='application/octet-stream')
+        with mock.patch('evidence.ingest.EvidenceIngestPipeline.encrypt') as encrypt:
+            copy = self.upload(UploadedFile(UnseekableStream(content), name='copy.bin', size=len(content)))
+            other = self.upload(UploadedFile(UnseekableStream(content[1:]), name='other.bin', size=len(content) - 1))
+        encrypt.assert_not_called()
+
+        self.assertEqual(copy.blob, first.blob)
+        self.assertEqual(copy.sha256_hash, first.sha256_hash)
+        self.assertNotEqual(other.blob, first.blob)
+        self.assertEqual(b''.join(other.iter_decrypted_chunks()), content[1:])
+        self.assertEqual(EvidenceBlob.objects.count(), 2)
+
+
+@override_settings(EVIDENCE_ASYNC_METADATA=False)
+class ImageFingerprintTest(EvidenceTestCase):
+    def test_resized_recompressed_copy_is_found_across_cases(self):
+        original = self.upload(make_jpeg((640, 480), pattern='scene', quality=90))
+        other_case = Case.objects.create(
+            case_title='Other Case',
+            case_description='Other Description',
+            case_category='Cybercrime',
+            created_by=self.investigator,
+        )
+        self.case = other_case
+        copy = self.upload(make_jpeg((320, 240), pattern='scene', quality=40), name='copy.jpg')
+        unrelated = self.upload(make_jpeg(), name='red.jpg')
+
+        matches = original.fingerprint.similar(max_distance=6)
+        self.assertEqual([match.evidence_id for match, _ in matches], [copy.id])
+        self.assertNotIn(unrelated.id, [match.evidence_id for match, _ in matches])
+
+        self.client.force_login(self.investigator)
+        response = self.client.get(reverse('evidence:similar_api', args=[original.id]), {'distance': 6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['case_id'] for item in response.json()['similar']], [other_case.case_id])
+        self.assertEqual(
+            self.client.get(reverse('evidence:similar_api', args=[original.id]), {'distance': 40}).status_code, 400
+        )
+
+    def test_band_lookup_matches_brute_force(self):
+        rng = random.Random(7)
+        base = rng.getrandbits(64)
+        hashes = [rng.getrandbits(64) for _ in range(200)]
+        for distance in range(1, 11):
+            value = base
+            for bit in rng.sample(range(64), distance):
+                value ^= 1 << bit
+            hashes.append(value)
+
+        evidence = Evidence.objects.bulk_create([
+            Evidence(case=self.case, media=f'fake/{i}', description='Fake', media_type='image')
+            for i in range(len(hashes) + 1)
+        ])
+        fingerprints = ImageFingerprint.objects.bulk_create([
+            ImageFingerprint.from_hash(item, value) for item, value in zip(evidence, [base] + hashes)
+        ])
+
+        for max_distance in (0, 3, 4, 7, 10):
+            expected = sorted(
+                (perceptual_hash.hamming(base, value), item.id)
+                for item, value in zip(evidence[1:], hashes)
+                if perceptual_hash.hamming(base, value) <= max_distance
+            )
+            found = [(distance, match.evidence_id) for match, distance in fingerprints[0].similar(max_distance)]
+            self.assertEqual(found, expected)
@@ -0,0 +1,150 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import ExifTags
+
+from .. import geo
+from ..models import Evidence
+from .base import EvidenceTestCase, User, make_jpeg
+
+
+@override_settings(EVIDENCE_ASYNC_METADATA=False)
+class GeoIndexTest(EvidenceTestCase):
+    def place(self, *coordinates, index=True):
+        evidence = []
+        for i, (latitude, longitude) in enumerate(coordinates):
+            item = Evidence(
+                case=self.case,
+                media=f'fake/{i}',
+                description='Fake',
+                media_type='image',
+                original_filename=f'{i}.jpg',
+                metadata={'exif': {'gps': {'latitude': latitude, 'longitude': longitude}}},
+            )
+            if index:
+                item.populate_indexed_metadata()
+            evidence.append(item)
+        return Evidence.objects.bulk_create(evidence)
+
+    def query(self, **params):
+        self.client.force_login(self.investigator)
+        return self.client.get(reverse('evidence:geo_api'), params)
+
+    def test_exif_and_video_locations_are_indexed(self):
+        gps = {
+            ExifTags.GPS.GPSLatitudeRef: 'S',
+            ExifTags.GPS.GPSLatitude: (33.8568, 0.0, 0.0),
+            ExifTags.GPS.GPSLongitudeRef: 'E',
+            ExifTags.GPS.GPSLongitude: (151.2153, 0.0, 0.0),
+        }
+        photo = self.upload(make_jpeg((32, 32), exif={ExifTags.IFD.GPSInfo: gps}))
+        self.assertAlmostEqual(photo.gps_latitude, -33.8568, places=4)
+        self.assertTrue(photo.geohash.startswith('r3gx2'))
+
+        video = Evidence(metadata={'format': {'location': '+37.3318-122.0312+010.000/'}})
+        video.populate_indexed_metadata()
+        self.assertEqual((video.gps_latitude, video.gps_longitude), (37.3318, -122.0312))
+
+    def test_bbox_and_radius_queries(self):
+        london = (51.5007, -0.1246)
+        self.place(london, (51.5107, -0.1246), (51.5157, -0.1246), (51.5307, -0.1246), (48.8584, 2.2945))
+
+        response = self.query(bbox='-0.2,51.4,0.0,51.6')
+        self.assertEqual(response.json()['count'], 4)
+
+        response = self.query(lat=london[0], lon=london[1], radius_km=2)
+        self.assertEqual(
+            sorted(point['latitude'] for point in response.json()['points']), [51.5007, 51.5107, 51.5157]
+        )
+        self.assertEqual(self.query(bbox='1,2,3').status_code, 400)
+
+    def test_radius_queries_cross_the_antimeridian(self):
+        self.place((10.0, 179.9), (10.0, -179.9), (10.0, -179.0))
+        south, west, north, east = geo.radius_bbox(10.0, 179.9, 50)
+        self.assertGreater(west, east)
+
+        response = self.query(lat=10.0, lon=179.9, radius_km=50)
+        self.assertEqual(sorted(point['longitude'] for point in response.json()['points']), [-179.9, 179.9])
+        distances = geo.filter_radius(Evidence.objects.all(), 10.0, 179.9, 50).values_list('distance_km', flat=True)
+        self.assertAlmostEqual(max(distances), 21.9, places=1)
+
+    def test_large_results_are_clustered(self):
+        self.place(*[(51.5 + i / 1000, -0.12) for i in range(6)], *[(40.7 + i / 1000, -74.0) for i in range(4)])
+        with mock.patch('evidence.views.GEO_POINT_LIMIT', 5):
+            body = self.query(bbox='-180,-90,180,90').json()
+            with mock.patch('evidence.views.GEO_RANGE_CLUSTER_MIN_ROWS', 0):
+                self.assertEqual(self.query(bbox='-180,-90,180,90').json(), body)
+        self.assertEqual(body['count'], 10)
+        self.assertEqual([cluster['count'] for cluster in body['clusters']], [6, 4])
+        self.assertAlmostEqual(body['clusters'][0]['latitude'], 51.5025)
+
+        self.place((10.0, 179.5), (10.0, -179.5), (10.0, 0.0))
+        self.assertEqual(self.query(bbox='179,9,-179,11').json()['count'], 2)
+
+    def test_backfill_command_indexes_existing_rows(self):
+        self.place((51.5007, -0.1246), index=False)
+        call_command('backfill_evidence_index', stdout=io.StringIO())
+        self.assertEqual(Evidence.objects.get().geohash, geo.encode(51.5007, -0.1246))
+
+
+@override_settings(EVIDENCE_ASYNC_METADATA=False)
+class EvidenceFilterTest(EvidenceTestCase):
+    @staticmethod
+    def camera_exif(make, model, software, taken):
+        return {
+            ExifTags.Base.Make: make,
+            ExifTags.Base.Model: model,
+            ExifTags.Base.Software: software,
+            ExifTags.IFD.Exif: {ExifTags.Base.DateTimeOriginal: taken},
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.canon = self.upload(make_jpeg((800, 600), exif=self.camera_exif('Canon', 'EOS R5', 'Adobe Photoshop 25.0', '2024:03:01 09:30:00')))
+        self.pixel = self.upload(make_jpeg(exif=self.camera_exif('Google', 'Pixel 8', 'HDR+ 1.0', '2024:05:20 18:00:00')), name='pixel.jpg')
+        self.notes = self.upload(b'plain notes', name='notes.txt', content_type='text/plain', media_type='text')
+        self.auditor = User.objects.create_user(
+            email='auditor@test.com',
+            first_name='Aud',
+            last_name='Itor',
+            password='testpass123',
+            role='auditor',
+            is_active=True,
+            verified=True,
+        )
+        self.client.force_login(self.auditor)
+
+    def search(self, **params):
+        response = self.client.get(reverse('evidence:search_api'), params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()['results']]
+
+    def test_exif_fields_are_promoted_to_columns(self):
+        self.assertEqual((self.canon.camera_make, self.canon.camera_model), ('Canon', 'EOS R5'))
+        self.assertEqual(self.canon.software, 'Adobe Photoshop 25.0')
+        self.assertEqual((self.canon.pixel_width, self.canon.pixel_height), (800, 600))
+        self.assertEqual(self.canon.file_format, 'JPG')
+        self.assertEqual(timezone.localtime(self.canon.captured_at).strftime('%Y-%m-%d %H:%M'), '2024-03-01 09:30')
+        self.assertEqual(self.notes.file_format, 'TXT')
+        self.assertIsNone(self.notes.captured_at)
+
+    def test_filters_and_sorting(self):
+        self.assertEqual(self.search(camera_make='Canon'), [self.canon.id])
+        self.assertEqual(self.search(software='Adobe'), [self.canon.id])
+        self.assertEqual(self.search(captured_after='2024-04-01T00:00'), [self.pixel.id])
+        self.assertEqual(self.search(min_width=100), [self.canon.id])
+        self.assertEqual(self.search(sort='captured_at', file_format='JPG'), [self.canon.id, self.pixel.id])
+        self.assertEqual(self.client.get(reverse('evidence:search_api'), {'min_width': 'wide'}).status_code, 400)
+
+        response = self.client.get(reverse('auditor:integrity_check'), {'camera_make': 'Google'})
+        self.assertEqual(list(response.context['evidence_list']), [self.pixel])
+        response = self.client.get(reverse('evidence:all_evidence'), {'sort': '-file_size'})
+        self.assertEqual(list(response.context['evidence_list']), [self.canon, self.pixel, self.notes])
+
+    def test_camera_filter_uses_index(self):
+        plan = Evidence.objects.filter(camera_make='Canon', camera_model='EOS R5').explain()
+        self.assertIn('evidence_camera_idx', plan)
@@ -0,0 +1,170 @@
+import hashlib
+import io
+import os
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from custody.models import CustodyLog
+from ..crypto import V2_HEADER
+from .. import merkle
+from ..fixity import RateLimiter
+from ..models import EvidenceAuditLog, FixitySweepRun
+from .base import EvidenceTestCase, User
+
+
+class VerifyIntegrityTest(EvidenceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.analyst = User.objects.create_user(
+            email='analyst@test.com',
+            first_name='Ana',
+            last_name='Analyst',
+            password='testpass123',
+            role='analyst',
+            is_active=True,
+            verified=True,
+        )
+        self.client.force_login(self.analyst)
+
+    def test_verification_rehashes_and_logs_the_result(self):
+        content = os.urandom(2 * 1024 * 1024 + 11)
+        evidence = self.upload(content, name='disk.bin', content_type='application/octet-stream')
+
+        response = self.client.get(reverse('evidence:verify', args=[evidence.id]))
+
+        check = response.context['check']
+        self.assertTrue(check.passed)
+        self.assertEqual(check.size, len(content))
+        self.assertEqual(check.sha256, evidence.sha256_hash)
+        log = CustodyLog.objects.get(evidence=evidence, action='verified')
+        self.assertIn(f'Integrity check passed: {len(content)} bytes', log.details)
+
+    def test_tampered_ciphertext_fails_verification(self):
+        evidence = self.upload(os.urandom(2 * 1024 * 1024), name='disk.bin', content_type='application/octet-stream')
+        with evidence.media.open('rb') as blob:
+            data = bytearray(blob.read())
+        data[len(data) // 2] ^= 0xFF
+        with open(evidence.media.path, 'wb') as blob:
+            blob.write(data)
+
+        response = self.client.get(reverse('evidence:verify', args=[evidence.id]))
+
+        check = response.context['check']
+        self.assertFalse(check.passed)
+        self.assertIn('failed integrity check', check.error)
+        self.assertIn('Integrity check FAILED', CustodyLog.objects.get(evidence=evidence, action='verified').details)
+
+
+class MerkleTreeTest(EvidenceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(3 * merkle.CHUNK_SIZE + 1234)
+        self.evidence = self.upload(self.content, name='disk.bin', content_type='application/octet-stream')
+        self.client.force_login(self.investigator)
+
+    def chunk(self, index):
+        return self.content[index * merkle.CHUNK_SIZE:(index + 1) * merkle.CHUNK_SIZE]
+
+    def test_proofs_verify_for_every_tree_shape(self):
+        for count in range(1, 10):
+            leaves = [merkle.leaf_hash(bytes([i])) for i in range(count)]
+            root = merkle.root(leaves)
+            for index in range(count):
+                path = merkle.proof(leaves, index)
+                self.assertTrue(merkle.verify_proof(leaves[index], path, root))
+                self.assertFalse(merkle.verify_proof(merkle.leaf_hash(b'forged'), path, root))
+
+        data = os.urandom(5 * 4096 + 17)
+        builders = [merkle.MerkleBuilder(workers=workers, chunk_size=4096) for workers in (1, 4)]
+        for builder, step in zip(builders, (1000, 4096)):
+            for start in range(0, len(data), step):
+                builder.update(data[start:start + step])
+        self.assertEqual(builders[0].finish(), builders[1].finish())
+
+    def test_ingest_records_the_root_and_leaves(self):
+        leaves = [merkle.leaf_hash(self.chunk(i)) for i in range(4)]
+        self.assertEqual(self.evidence.merkle_root, merkle.root(leaves).hex())
+        self.assertEqual(self.evidence.merkle_tree.leaf_hashes(), leaves)
+
+    def test_proof_api_lets_a_client_check_a_chunk(self):
+        body = self.client.get(
+            reverse('evidence:merkle_proof_api', args=[self.evidence.id]), {'chunk': 3}
+        ).json()
+        self.assertEqual((body['start'], body['end']), (3 * merkle.CHUNK_SIZE, len(self.content) - 1))
+        path = [(bytes.fromhex(step['hash']), step['side']) for step in body['proof']]
+        self.assertTrue(merkle.verify_proof(merkle.leaf_hash(self.chunk(3)), path, bytes.fromhex(body['root'])))
+
+    def test_verify_api_checks_stored_ranges_and_submitted_clips(self):
+        url = reverse('evidence:merkle_verify_api', args=[self.evidence.id])
+        body = self.client.get(url, {'start': merkle.CHUNK_SIZE + 5, 'end': 2 * merkle.CHUNK_SIZE + 5}).json()
+        self.assertEqual((body['verified'], body['chunks']), (True, [1, 2]))
+
+        for clip, authentic in ((self.chunk(1), True), (self.chunk(1)[:-1] + b'x', False)):
+            response = self.client.post(
+                f'{url}?chunk=1', data=clip, content_type='application/octet-stream'
+            )
+            self.assertEqual(response.json()['authentic'], authentic)
+
+        with self.evidence.media.open('rb') as stored:
+            blob = bytearray(stored.read())
+        blob[V2_HEADER.size + 2 * (merkle.CHUNK_SIZE + 16) + 10] ^= 0xFF
+        with open(self.evidence.media.path, 'wb') as stored:
+            stored.write(blob)
+        self.assertEqual(self.client.get(url, {'start': 0, 'end': len(self.content) - 1}).json()['damaged_chunks'], [2])
+        self.assertTrue(self.client.get(url, {'start': 0, 'end': merkle.CHUNK_SIZE - 1}).json()['verified'])
+        self.assertEqual(CustodyLog.objects.filter(evidence=self.evidence, action='verified').count(), 3)
+
+
+class FixitySweepTest(EvidenceTestCase):
+    def sweep(self, *args):
+        out = io.StringIO()
+        call_command('fixity_sweep', '--rate=0', *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_ingest_records_the_ciphertext_digest(self):
+        evidence = self.upload(os.urandom(50_000), name='disk.bin', content_type='application/octet-stream')
+        with evidence.media.open('rb') as stored:
+            self.assertEqual(evidence.blob.ciphertext_sha256, hashlib.sha256(stored.read()).hexdigest())
+
+    def test_sweep_flags_rotted_blobs_for_the_auditor(self):
+        intact = self.upload(os.urandom(50_000), name='a.bin', content_type='application/octet-stream')
+        rotted = self.upload(os.urandom(50_000), name='b.bin', content_type='application/octet-stream')
+        with open(rotted.media.path, 'r+b') as stored:
+            stored.seek(1000)
+            stored.write(b'\x00' * 8)
+
+        self.assertIn('Checked 2 blob(s), 1 failed', self.sweep())
+
+        intact.blob.refresh_from_db()
+        rotted.blob.refresh_from_db()
+        self.assertEqual((intact.blob.fixity_status, rotted.blob.fixity_status), ('ok', 'mismatch'))
+        self.assertTrue(EvidenceAuditLog.objects.filter(evidence=rotted, action='Fixity Check Failed').exists())
+        self.assertEqual(FixitySweepRun.objects.get().status, 'complete')
+
+        auditor = User.objects.create_user(
+            email='auditor@test.com', first_name='Aud', last_name='Itor', password='testpass123',
+            role='auditor', is_active=True, verified=True,
+        )
+        self.client.force_login(auditor)
+        response = self.client.get(reverse('auditor:integrity_check'))
+        self.assertEqual(response.context['fixity_failures'], 1)
+        self.assertContains(response, 'Stored File Mismatch')
+
+    def test_sweep_resumes_from_its_checkpoint(self):
+        first = self.upload(os.urandom(1000), name='a.bin', content_type='application/octet-stream')
+        self.upload(os.urandom(1000), name='b.bin', content_type='application/octet-stream')
+        FixitySweepRun.objects.create(last_pk=first.blob_id, checked=1)
+
+        self.assertIn('Checked 2 blob(s)', self.sweep())
+        first.blob.refresh_from_db()
+        self.assertIsNone(first.blob.fixity_checked_at)
+
+    def test_rate_limiter_sleeps_to_hold_the_average_rate(self):
+        now = [0.0]
+        sleeps = []
+        limiter = RateLimiter(1000, clock=lambda: now[0], sleep=sleeps.append)
+        limiter.consume(500)
+        now[0] = 0.2
+        limiter.consume(1500)
+        self.assertEqual(sleeps, [0.5, 1.8])
@@ -0,0 +1,259 @@
+import hashlib
+import io
+import os
+import resource
+import tracemalloc
+import unittest
+import zipfile
+from datetime import timedelta
+from unittest import mock
+
+from cryptography.hazmat.primitives import padding
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from custody.models import CustodyLog, StorageLog
+from ..crypto import V2_HEADER, SegmentedBlobReader, SegmentedBlobWriter, SegmentIntegrityError
+from .. import merkle
+from ..batch import BatchEvidenceIngest
+from ..models import Evidence, EvidenceAuditLog, EvidenceBlob, EvidencePreview, ImageFingerprint, MetadataExtractionJob
+from .base import EvidenceTestCase, SyntheticStream, make_jpeg
+
+
+class EvidenceIngestTest(EvidenceTestCase):
+    def test_upload_hashes_and_round_trips_plaintext(self):
+        content = make_jpeg()
+        evidence = self.upload(content)
+
+        self.assertEqual(evidence.sha256_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual(evidence.md5_hash, hashlib.md5(content).hexdigest())
+        self.assertEqual(evidence.file_size, len(content))
+        self.assertEqual(evidence.get_decrypted_file().read(), content)
+
+    def test_metadata_is_extracted_by_the_job_queue(self):
+        evidence = self.upload(make_jpeg())
+        self.assertEqual(evidence.metadata_status, 'pending')
+        self.assertEqual(evidence.metadata, {})
+
+        job = MetadataExtractionJob.claim_next('test-worker')
+        self.assertEqual(job.evidence, evidence)
+        self.assertIsNone(MetadataExtractionJob.claim_next('other-worker'))
+        self.assertEqual(job.run(), 'done')
+
+        evidence.refresh_from_db()
+        self.assertEqual(evidence.metadata_status, 'complete')
+        self.assertEqual(evidence.metadata['file_level']['file_format'], 'JPG')
+        self.assertEqual(evidence.metadata['file_level']['hashes']['sha256'], evidence.sha256_hash)
+        self.assertIn('Warning: No EXIF data found - file may have been stripped', evidence.metadata_issues)
+
+    def test_stale_jobs_are_measured_from_the_last_heartbeat(self):
+        self.upload(make_jpeg())
+        job = MetadataExtractionJob.claim_next('test-worker')
+        long_ago = timezone.now() - timedelta(hours=1)
+        MetadataExtractionJob.objects.filter(pk=job.pk).update(started_at=long_ago)
+        self.assertEqual(MetadataExtractionJob.requeue_stale(timedelta(minutes=10)), 0)
+
+        MetadataExtractionJob.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        self.assertEqual(MetadataExtractionJob.requeue_stale(timedelta(minutes=10)), 1)
+
+    def test_running_jobs_send_heartbeats(self):
+        self.upload(make_jpeg())
+        job = MetadataExtractionJob.claim_next('test-worker')
+        claimed_at = job.heartbeat_at
+        with mock.patch.object(MetadataExtractionJob, 'HEARTBEAT_INTERVAL', 0):
+            job.run()
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, claimed_at)
+
+    def test_legacy_cbc_blobs_are_still_readable(self):
+        content = os.urandom(100_000)
+        evidence = self.upload(make_jpeg())
+        padder = padding.PKCS7(128).padder()
+        encryptor = self.case.encryption_key.get_cipher().encryptor()
+        legacy_blob = encryptor.update(padder.update(content) + padder.finalize()) + encryptor.finalize()
+        evidence.media.save('encrypted_legacy.bin', ContentFile(legacy_blob), save=False)
+
+        self.assertEqual(b''.join(evidence.iter_decrypted_chunks()), content)
+        self.assertEqual(b''.join(evidence.iter_decrypted_range(4000, 70000)), content[4000:70001])
+        self.assertIsNone(evidence.find_corrupted_segments())
+
+
+class EvidencePreviewTest(EvidenceTestCase):
+    def test_worker_stores_encrypted_previews(self):
+        evidence = self.upload(make_jpeg(size=(1600, 1200)))
+        MetadataExtractionJob.claim_next('test-worker').run()
+
+        previews = {preview.size: preview for preview in evidence.previews.all()}
+        self.assertEqual(sorted(previews), [128, 512])
+        self.assertEqual((previews[512].width, previews[512].height), (512, 384))
+        with previews[128].file.open('rb') as stored:
+            self.assertNotEqual(stored.read(3), b'\xff\xd8\xff')
+        self.assertEqual(Image.open(io.BytesIO(previews[128].read())).size, (128, 96))
+
+    def test_preview_endpoint_generates_lazily(self):
+        evidence = self.upload(make_jpeg(size=(800, 600)))
+        self.client.force_login(self.investigator)
+
+        response = self.client.get(reverse('evidence:preview', args=[evidence.id, 128]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (128, 96))
+        self.assertTrue(EvidencePreview.objects.filter(evidence=evidence, size=128).exists())
+
+        self.assertEqual(self.client.get(reverse('evidence:preview', args=[evidence.id, 300])).status_code, 404)
+
+    def test_large_preview_is_audited_once_per_session(self):
+        evidence = self.upload(make_jpeg(size=(800, 600)))
+        self.client.force_login(self.investigator)
+        previews = EvidenceAuditLog.objects.filter(evidence=evidence, action='Evidence Preview Viewed')
+
+        self.client.get(reverse('evidence:preview', args=[evidence.id, 128]))
+        self.assertFalse(previews.exists())
+
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('evidence:preview', args=[evidence.id, 512])).status_code, 200)
+        self.assertEqual(previews.get().details, 'File: photo.jpg, 512px preview')
+        self.assertEqual(previews.get().user, self.investigator)
+
+
+class BatchUploadTest(EvidenceTestCase):
+    def test_batch_of_files_and_archive_is_ingested_in_one_go(self):
+        photos = [make_jpeg(size=(40 + i, 30)) for i in range(3)]
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('phone/DCIM/a.jpg', photos[1])
+            zf.writestr('phone/DCIM/b.jpg', photos[2])
+            zf.writestr('phone/notes.txt', b'call at 9')
+        self.client.force_login(self.investigator)
+
+        with self.settings(EVIDENCE_BATCH_WORKERS=2):
+            response = self.client.post(
+                reverse('evidence:batch_upload', args=[self.case.case_id]),
+                {
+                    'description': 'Seized phone',
+                    'expand_archives': 'on',
+                    'media': [
+                        SimpleUploadedFile('one.jpg', photos[0], content_type='image/jpeg'),
+                        SimpleUploadedFile('dupe.jpg', photos[1], content_type='image/jpeg'),
+                        SimpleUploadedFile('phone.zip', archive.getvalue(), content_type='application/zip'),
+                    ],
+                },
+            )
+        self.assertRedirects(response, reverse('cases:view_case', args=[self.case.case_id]), fetch_redirect_response=False)
+
+        evidence = {item.original_filename: item for item in Evidence.objects.filter(case=self.case)}
+        self.assertEqual(sorted(evidence), ['a.jpg', 'b.jpg', 'dupe.jpg', 'notes.txt', 'one.jpg'])
+        self.assertEqual(evidence['notes.txt'].media_type, 'document')
+        self.assertEqual(evidence['a.jpg'].blob, evidence['dupe.jpg'].blob)
+        self.assertEqual(evidence['a.jpg'].blob.ref_count, 2)
+        self.assertEqual(evidence['b.jpg'].get_decrypted_file().read(), photos[2])
+        self.assertEqual(evidence['one.jpg'].metadata['file_level']['hashes']['sha256'], evidence['one.jpg'].sha256_hash)
+        self.assertEqual(CustodyLog.objects.filter(case=self.case, action='stored').count(), 5)
+        self.assertEqual(StorageLog.objects.filter(storage=self.case.storage, action='upload').count(), 5)
+        self.assertEqual(evidence['a.jpg'].fingerprint.dhash, evidence['dupe.jpg'].fingerprint.dhash)
+        self.assertFalse(ImageFingerprint.objects.filter(evidence=evidence['notes.txt']).exists())
+        self.assertEqual(
+            evidence['notes.txt'].merkle_root, merkle.root([merkle.leaf_hash(b'call at 9')]).hex()
+        )
+
+    def test_failed_batch_leaves_no_blob_files(self):
+        stored = self.upload(make_jpeg())
+        blob_dir = os.path.dirname(stored.blob.file.path)
+        batch = BatchEvidenceIngest(self.case, self.investigator, 'Seized phone', workers=1)
+        with batch:
+            for i in range(2):
+                batch.add_upload(SimpleUploadedFile(f'{i}.jpg', make_jpeg(size=(50 + i, 30)), content_type='image/jpeg'))
+            batch.add_upload(SimpleUploadedFile('again.jpg', make_jpeg(), content_type='image/jpeg'))
+            files = sorted(os.listdir(blob_dir))
+            with mock.patch.object(BatchEvidenceIngest, '_create_evidence', side_effect=RuntimeError('disk full')):
+                with self.assertRaises(RuntimeError):
+                    batch.run()
+
+        self.assertEqual(sorted(os.listdir(blob_dir)), files)
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 1)
+        self.assertEqual(Evidence.objects.count(), 1)
+
+
+
+class SegmentedBlobTest(TestCase):
+    def setUp(self):
+        self.key = os.urandom(32)
+
+    def encrypt(self, content, workers=1, segment_size=4096):
+        out = io.BytesIO()
+        writer = SegmentedBlobWriter(self.key, out, segment_size=segment_size, workers=workers)
+        for start in range(0, len(content), 1000):
+            writer.write(content[start:start + 1000])
+        writer.close()
+        out.seek(0)
+        return out
+
+    def test_round_trip_and_random_access(self):
+        for size in (0, 1, 4096, 4097, 50_000):
+            content = os.urandom(size)
+            for workers in (1, 4):
+                reader = SegmentedBlobReader(self.key, self.encrypt(content, workers), workers=workers)
+                self.assertEqual(reader.plaintext_size, size)
+                self.assertEqual(b''.join(reader.iter_segments()), content)
+                if size:
+                    self.assertEqual(b''.join(reader.iter_range(size // 3, size - 2)), content[size // 3:size - 1])
+
+    def test_reports_corrupted_and_truncated_segments(self):
+        blob = bytearray(self.encrypt(os.urandom(20_000)).getvalue())
+        blob[V2_HEADER.size + 2 * (4096 + 16) + 10] ^= 0xFF
+        reader = SegmentedBlobReader(self.key, io.BytesIO(bytes(blob)))
+        self.assertEqual(reader.corrupted_segments(), [2])
+        with self.assertRaises(SegmentIntegrityError) as raised:
+            b''.join(reader.iter_segments())
+        self.assertEqual(raised.exception.segment_index, 2)
+
+        truncated = self.encrypt(os.urandom(20_000)).getvalue()[:V2_HEADER.size + 3 * (4096 + 16)]
+        reader = SegmentedBlobReader(self.key, io.BytesIO(truncated))
+        self.assertEqual(reader.corrupted_segments(), [2])
+
+
+class EvidenceMemoryTest(EvidenceTestCase):
+    UPLOAD_SIZE = 64 * 1024 * 1024
+    ALLOCATION_BUDGET = 16 * 1024 * 1024
+
+    def test_upload_allocates_far_less_than_its_size(self):
+        # tracemalloc measures this upload alone, where ru_maxrss would hide
+        # it behind the peak of whichever test ran before.
+        stream = io.BufferedReader(SyntheticStream(self.UPLOAD_SIZE))
+        upload = UploadedFile(stream, name='disk.img', size=self.UPLOAD_SIZE)
+
+        tracemalloc.start()
+        try:
+            evidence = self.upload(upload, name='disk.img')
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(evidence.file_size, self.UPLOAD_SIZE)
+        self.assertLess(peak, self.ALLOCATION_BUDGET)
+
+
+@unittest.skipUnless(
+    os.environ.get('EVIDENCE_MEMORY_TESTS'),
+    'Set EVIDENCE_MEMORY_TESTS=1 to run the 2 GB memory regression test',
+)
+class EvidenceMemoryRegressionTest(EvidenceTestCase):
+    UPLOAD_SIZE = 2 * 1024 * 1024 * 1024
+    RSS_BUDGET_KB = 64 * 1024
+
+    def test_large_upload_keeps_peak_rss_bounded(self):
+        stream = io.BufferedReader(SyntheticStream(self.UPLOAD_SIZE))
+        upload = UploadedFile(stream, name='disk.img', size=self.UPLOAD_SIZE)
+
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        evidence = self.upload(upload, name='disk.img')
+        growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+        self.assertEqual(evidence.file_size, self.UPLOAD_SIZE)
+        self.assertEqual(evidence.media.size % 16, 0)
+        self.assertGreater(evidence.media.size, self.UPLOAD_SIZE)
+        self.assertLess(growth, self.RSS_BUDGET_KB)
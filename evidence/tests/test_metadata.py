@@ -0,0 +1,265 @@
+import io
+import struct
+import tracemalloc
+import wave
+import zipfile
+import zlib
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import ExifTags, Image, ImageFile
+
+from ..metadata_extractor import MetadataExtractor
+from ..models import (
+    Evidence,
+    EvidenceAuditLog,
+    MetadataCacheEntry,
+    MetadataExtractionJob,
+    MetadataRevalidationRun,
+)
+from .base import EvidenceTestCase, make_jpeg
+
+
+@override_settings(EVIDENCE_ASYNC_METADATA=False)
+class MetadataCacheTest(EvidenceTestCase):
+    def test_repeat_upload_reuses_cached_metadata(self):
+        first = self.upload(make_jpeg(), name='first.jpg')
+        with mock.patch.object(MetadataExtractor, 'extract_all_metadata') as extract:
+            second = self.upload(make_jpeg(), name='second.jpg')
+        extract.assert_not_called()
+
+        self.assertEqual(second.metadata['file_level']['original_filename'], 'second.jpg')
+        self.assertEqual(second.metadata['exif'], first.metadata['exif'])
+        self.assertEqual((second.metadata_valid, second.metadata_issues), (first.metadata_valid, first.metadata_issues))
+        self.assertEqual(MetadataCacheEntry.objects.get(sha256=first.sha256_hash).hits, 1)
+
+    def test_worker_skips_decryption_for_cached_documents(self):
+        self.upload(b'meeting notes', name='notes.txt', content_type='text/plain', media_type='text')
+        with self.settings(EVIDENCE_ASYNC_METADATA=True):
+            repeat = self.upload(b'meeting notes', name='copy.txt', content_type='text/plain', media_type='text')
+        with mock.patch.object(Evidence, 'iter_decrypted_chunks') as decrypt:
+            MetadataExtractionJob.claim_next('test-worker').run()
+        decrypt.assert_not_called()
+        repeat.refresh_from_db()
+        self.assertEqual(repeat.metadata_status, 'complete')
+        self.assertEqual(repeat.metadata['file_level']['original_filename'], 'copy.txt')
+
+    def test_version_bump_invalidates_and_size_is_bounded(self):
+        self.upload(make_jpeg(), name='first.jpg')
+        with mock.patch('evidence.metadata_extractor.EXTRACTOR_VERSION', '999'):
+            with mock.patch.object(
+                MetadataExtractor, 'extract_all_metadata', wraps=MetadataExtractor.extract_all_metadata
+            ) as extract:
+                self.upload(make_jpeg(), name='second.jpg')
+            extract.assert_called_once()
+            self.assertEqual(list(MetadataCacheEntry.objects.values_list('extractor_version', flat=True)), ['999'])
+
+            with self.settings(EVIDENCE_METADATA_CACHE_SIZE=2):
+                recent = self.upload(make_jpeg(size=(10, 10)), name='a.jpg')
+                self.upload(make_jpeg(size=(20, 20)), name='b.jpg')
+                MetadataCacheEntry.lookup(recent.sha256_hash, 'again.jpg')
+                self.upload(make_jpeg(size=(30, 30)), name='c.jpg')
+            self.assertEqual(MetadataCacheEntry.objects.count(), 2)
+            self.assertTrue(MetadataCacheEntry.objects.filter(sha256=recent.sha256_hash).exists())
+
+
+class RevalidateMetadataCommandTest(EvidenceTestCase):
+    def setUp(self):
+        super().setUp()
+        edited = {
+            'file_level': {'hashes': {'sha256': 'a' * 64}, 'file_format': 'JPG'},
+            'authenticity': {'status': 'Signs of Editing Detected', 'signs_of_editing': ['Edited with Photoshop']},
+        }
+        clean = {'file_level': {'hashes': {'sha256': 'b' * 64}, 'file_format': 'JPG'}, 'authenticity': {}}
+        self.evidence = Evidence.objects.bulk_create([
+            Evidence(case=self.case, media=f'fake/{i}', description='Fake', media_type='image',
+                     metadata=edited if i % 2 else clean, metadata_valid=True, metadata_issues=[])
+            for i in range(6)
+        ])
+
+    def revalidate(self, *args):
+        out = io.StringIO()
+        call_command('revalidate_evidence_metadata', '--batch-size=2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_reports_without_writing(self):
+        output = self.revalidate('--dry-run', '--workers=1')
+        self.assertIn('3 would change', output)
+        self.assertIn('Editing sign: Edited with Photoshop', output)
+        self.assertEqual(Evidence.objects.filter(metadata_valid=False).count(), 0)
+        self.assertFalse(MetadataRevalidationRun.objects.exists())
+
+    def test_updates_in_a_process_pool_and_logs_changes(self):
+        self.revalidate('--workers=2')
+        invalid = Evidence.objects.filter(metadata_valid=False)
+        self.assertEqual([item.id for item in invalid], [item.id for item in self.evidence[1::2]])
+        self.assertEqual(set(invalid.values_list('media_status', flat=True)), {'Invalid'})
+        self.assertIn('Editing sign: Edited with Photoshop', invalid[0].metadata_issues)
+        self.assertEqual(EvidenceAuditLog.objects.filter(action='Metadata Revalidated').count(), 3)
+        run = MetadataRevalidationRun.objects.get()
+        self.assertEqual((run.status, run.processed, run.changed), ('complete', 6, 3))
+
+    def test_resumes_from_checkpoint(self):
+        MetadataRevalidationRun.objects.create(last_pk=self.evidence[3].pk, processed=4)
+        output = self.revalidate('--workers=1')
+        self.assertIn('Resuming run', output)
+        self.assertEqual(
+            list(Evidence.objects.filter(metadata_valid=False).values_list('pk', flat=True)), [self.evidence[5].pk]
+        )
+        self.assertEqual(MetadataRevalidationRun.objects.get().processed, 6)
+
+
+class MetadataExtractorTest(TestCase):
+    def make_image(self, image_format):
+        exif = Image.Exif()
+        exif[0x010F] = 'Canon'
+        exif[0x0110] = 'EOS R5'
+        exif[0x0132] = '2024:03:01 10:00:00'
+        exif.get_ifd(ExifTags.IFD.Exif)[0x9003] = '2024:03:01 09:00:00'
+        exif.get_ifd(ExifTags.IFD.GPSInfo).update({1: 'S', 2: (33.0, 52.0, 4.0), 3: 'E', 4: (151.0, 12.0, 36.0)})
+        buffer = io.BytesIO()
+        Image.new('RGB', (320, 240), color=(10, 120, 200)).save(buffer, format=image_format, exif=exif)
+        return buffer.getvalue()
+
+    def test_exif_is_read_from_headers_without_decoding_pixels(self):
+        for image_format in ('JPEG', 'PNG', 'WEBP'):
+            data = self.make_image(image_format)
+            with mock.patch.object(ImageFile.ImageFile, 'load', side_effect=AssertionError('pixels decoded')):
+                metadata = MetadataExtractor.extract_all_metadata(io.BytesIO(data), f'photo.{image_format.lower()}')
+
+            exif = metadata['exif']
+            self.assertNotIn('error', exif, image_format)
+            self.assertEqual(exif['camera'], {'make': 'Canon', 'model': 'EOS R5'})
+            self.assertEqual(exif['basic']['date_time_original'], '2024:03:01 09:00:00')
+            self.assertAlmostEqual(exif['gps']['latitude'], -(33 + 52 / 60 + 4 / 3600))
+            self.assertEqual(exif['image_properties']['size'], '(320, 240)')
+            self.assertEqual(metadata['authenticity']['thumbnail_check'], {'embedded_thumbnail': False})
+
+
+class PixelCheckTest(EvidenceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.truncated = make_jpeg((640, 480), pattern='scene')[:-4000]
+
+    def assert_flagged(self, evidence):
+        evidence.refresh_from_db()
+        self.assertFalse(evidence.metadata_valid)
+        self.assertEqual(evidence.media_status, 'Invalid')
+        self.assertTrue(any(issue.startswith('Image data could not be decoded') for issue in evidence.metadata_issues))
+        self.assertFalse(evidence.previews.exists())
+
+    def test_worker_flags_images_whose_pixels_do_not_decode(self):
+        evidence = self.upload(self.truncated)
+        MetadataExtractionJob.claim_next('test-worker').run()
+        self.assert_flagged(evidence)
+
+        # Revalidation recomputes issues from the stored metadata, so the flag survives it.
+        call_command('revalidate_evidence_metadata', stdout=io.StringIO())
+        self.assert_flagged(evidence)
+
+    @override_settings(EVIDENCE_ASYNC_METADATA=False)
+    def test_synchronous_ingest_flags_images_whose_pixels_do_not_decode(self):
+        self.assert_flagged(self.upload(self.truncated))
+        self.assertTrue(self.upload(make_jpeg(), name='intact.jpg').previews.exists())
+
+
+def box(box_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class FormatExtractorTest(TestCase):
+    def extract(self, data, name):
+        stream = CountingStream(data)
+        metadata = MetadataExtractor.extract_all_metadata(stream, name, hashes={'sha256': 'x', 'md5': 'y'}, file_size=len(data))
+        return metadata, stream.bytes_read
+
+    def test_mp4_atoms_are_read_without_the_media_data(self):
+        mvhd = box(b'mvhd', bytes(4) + struct.pack('>IIII', 3_786_912_000, 3_786_912_000, 1000, 93_500) + bytes(80))
+        tkhd = box(b'tkhd', bytes(4) + bytes(72) + struct.pack('>II', 1920 << 16, 1080 << 16))
+        hdlr = box(b'hdlr', bytes(8) + b'vide' + bytes(12))
+        location = box(b'\xa9xyz', struct.pack('>HH', 17, 0) + b'-33.8688+151.2093')
+        moov = box(b'moov', mvhd + box(b'trak', tkhd + box(b'mdia', hdlr)) + box(b'udta', location))
+        data = box(b'ftyp', b'isom' + bytes(4) + b'isommp41') + moov + box(b'mdat', bytes(8 * 1024 * 1024))
+
+        metadata, bytes_read = self.extract(data, 'clip.mp4')
+
+        self.assertEqual(metadata['file_level']['file_format'], 'MP4')
+        self.assertEqual(metadata['format']['creation_time'], '2024-01-01T00:00:00+00:00')
+        self.assertEqual(metadata['format']['duration_seconds'], 93.5)
+        self.assertEqual((metadata['format']['video_width'], metadata['format']['video_height']), (1920, 1080))
+        self.assertEqual(metadata['format']['location'], '-33.8688+151.2093')
+        self.assertLess(bytes_read, 4096)
+
+    def test_wav_pdf_docx_and_text(self):
+        wav = io.BytesIO()
+        with wave.open(wav, 'wb') as writer:
+            writer.setnchannels(2)
+            writer.setsampwidth(2)
+            writer.setframerate(8000)
+            writer.writeframes(bytes(8000 * 4 * 3))
+        metadata, _ = self.extract(wav.getvalue(), 'call.wav')
+        self.assertEqual(metadata['file_level']['file_format'], 'WAV')
+        self.assertEqual(metadata['format']['duration_seconds'], 3.0)
+        self.assertEqual(metadata['format']['channels'], 2)
+
+        from reportlab.pdfgen import canvas
+        pdf = io.BytesIO()
+        document = canvas.Canvas(pdf)
+        document.setAuthor('Det. Smith')
+        document.setTitle('Witness statement')
+        document.showPage()
+        document.save()
+        metadata, _ = self.extract(pdf.getvalue(), 'statement.pdf')
+        self.assertEqual(metadata['file_level']['file_format'], 'PDF')
+        self.assertEqual(metadata['format']['author'], 'Det. Smith')
+        self.assertEqual(metadata['format']['title'], 'Witness statement')
+        self.assertEqual(metadata['format']['incremental_updates'], 0)
+
+        docx = io.BytesIO()
+        with zipfile.ZipFile(docx, 'w') as archive:
+            archive.writestr('[Content_Types].xml', '<Types/>')
+            archive.writestr('word/document.xml', '<document/>')
+            archive.writestr('docProps/core.xml', (
+                '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:creator>J. Doe</dc:creator>'
+                '<cp:lastModifiedBy>R. Roe</cp:lastModifiedBy></cp:coreProperties>'
+            ))
+        metadata, _ = self.extract(docx.getvalue(), 'report.docx')
+        self.assertEqual(metadata['format']['container'], 'DOCX')
+        self.assertEqual(metadata['format']['creator'], 'J. Doe')
+        self.assertEqual(metadata['format']['last_modified_by'], 'R. Roe')
+
+        metadata, _ = self.extract('line one\r\nline two\r\ncafé'.encode(), 'notes.txt')
+        self.assertEqual(metadata['file_level']['file_format'], 'TXT')
+        self.assertEqual(metadata['format'], {'encoding': 'utf-8', 'characters': 24, 'lines': 3, 'line_endings': 'CRLF'})
+
+    def test_pdf_xref_stream_that_inflates_past_the_limit_is_not_expanded(self):
+        rows = zlib.compress(bytes(256 * 1024 * 1024), 9)
+        xref = (
+            b'1 0 obj\n<< /Type /XRef /Size 2 /W [1 2 1] /Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 4 >> '
+            b'/Length %d >>\nstream\n' % len(rows) + rows + b'\nendstream\nendobj\n'
+        )
+        data = b'%PDF-1.5\n' + xref + b'startxref\n9\n%%EOF\n'
+
+        tracemalloc.start()
+        try:
+            metadata, _ = self.extract(data, 'bomb.pdf')
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(metadata['format']['xref_type'], 'stream')
+        self.assertEqual(metadata['format']['revisions'], 1)
+        self.assertLess(peak, 64 * 1024 * 1024)
@@ -0,0 +1,66 @@
+import os
+
+from django.urls import reverse
+
+from ..views import _parse_range_header
+from ..models import EvidenceAuditLog
+from .base import EvidenceTestCase
+
+
+class EvidenceFileStreamingTest(EvidenceTestCase):
+    def test_download_streams_plaintext_with_content_length(self):
+        content = os.urandom(3 * 1024 * 1024 + 5)
+        evidence = self.upload(content, name='clip.bin', content_type='application/octet-stream')
+        self.client.force_login(self.investigator)
+
+        response = self.client.get(reverse('evidence:download_file', args=[evidence.id]))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Length'], str(len(content)))
+        self.assertEqual(b''.join(response.streaming_content), content)
+
+    def test_range_requests_decrypt_only_the_requested_bytes(self):
+        content = os.urandom(2 * 1024 * 1024 + 37)
+        evidence = self.upload(content, name='clip.mp4', content_type='video/mp4')
+        self.client.force_login(self.investigator)
+        url = reverse('evidence:view_file', args=[evidence.id])
+
+        for header, start, end in [
+            ('bytes=0-99', 0, 99),
+            ('bytes=1048575-1048600', 1048575, 1048600),
+            ('bytes=2000000-', 2000000, len(content) - 1),
+            ('bytes=-10', len(content) - 10, len(content) - 1),
+        ]:
+            response = self.client.get(url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{len(content)}')
+            self.assertEqual(b''.join(response.streaming_content), content[start:end + 1])
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(content)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_ranges_at_any_offset_are_audited_once_per_session(self):
+        content = os.urandom(100_000)
+        evidence = self.upload(content, name='clip.mp4', content_type='video/mp4')
+        self.client.force_login(self.investigator)
+        url = reverse('evidence:view_file', args=[evidence.id])
+        views = EvidenceAuditLog.objects.filter(evidence=evidence, action='Evidence Viewed')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=1-')
+        self.assertEqual(b''.join(response.streaming_content), content[1:])
+        self.assertEqual(views.get().details, f'File: clip.mp4, bytes 1-{len(content) - 1}')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=50000-')
+        b''.join(response.streaming_content)
+        self.assertEqual(views.count(), 1)
+
+        self.client.logout()
+        self.client.force_login(self.investigator)
+        response = self.client.get(url, HTTP_RANGE=f'bytes=-{len(content) * 2}')
+        self.assertEqual(b''.join(response.streaming_content), content)
+        self.assertEqual(views.count(), 2)
+        self.assertEqual(views.latest('id').details, f'File: clip.mp4, bytes 0-{len(content) - 1}')
+
+    def test_suffix_range_of_empty_file_is_not_satisfiable(self):
+        with self.assertRaises(ValueError):
+            _parse_range_header('bytes=-10', 0)
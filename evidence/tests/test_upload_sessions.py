@@ -0,0 +1,83 @@
+import hashlib
+import os
+
+from django.test import override_settings
+from django.urls import reverse
+
+from ..models import Evidence, EvidenceAuditLog, UploadSession
+from .base import EvidenceTestCase, MEDIA_ROOT
+
+
+@override_settings(EVIDENCE_UPLOAD_CHUNK_SIZE=100_000, EVIDENCE_UPLOAD_STAGING_DIR=os.path.join(MEDIA_ROOT, 'staging'))
+class ResumableUploadTest(EvidenceTestCase):
+    def put_chunk(self, upload_id, index, data, digest=None):
+        return self.client.put(
+            reverse('evidence:upload_session_chunk', args=[upload_id, index]),
+            data,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=digest or hashlib.sha256(data).hexdigest(),
+        )
+
+    def test_chunks_can_be_retried_and_resumed(self):
+        content = os.urandom(250_000)
+        self.client.force_login(self.investigator)
+
+        response = self.client.post(
+            reverse('evidence:create_upload_session', args=[self.case.case_id]),
+            {'filename': 'disk.img', 'size': len(content), 'description': 'Disk image'},
+        )
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.json()['upload_id']
+        self.assertEqual(response.json()['total_chunks'], 3)
+
+        self.assertEqual(self.put_chunk(upload_id, 0, content[:100_000]).status_code, 200)
+        # A retried chunk the server already holds is acknowledged, a different one is refused.
+        self.assertEqual(self.put_chunk(upload_id, 0, content[:100_000]).status_code, 200)
+        self.assertEqual(self.put_chunk(upload_id, 0, os.urandom(100_000)).status_code, 409)
+        # A truncated transfer or a corrupted chunk is rejected without advancing the session.
+        self.assertEqual(self.put_chunk(upload_id, 1, content[100_000:150_000]).status_code, 409)
+        self.assertEqual(
+            self.put_chunk(upload_id, 1, content[100_000:200_000], digest='0' * 64).status_code, 409
+        )
+
+        state = self.client.get(reverse('evidence:upload_session', args=[upload_id])).json()
+        self.assertEqual((state['next_chunk'], state['received_bytes']), (1, 100_000))
+
+        self.assertEqual(self.put_chunk(upload_id, 1, content[100_000:200_000]).status_code, 200)
+        self.assertEqual(self.put_chunk(upload_id, 2, content[200_000:]).status_code, 200)
+
+        response = self.client.post(reverse('evidence:complete_upload_session', args=[upload_id]))
+        self.assertEqual(response.status_code, 200)
+
+        evidence = Evidence.objects.get(id=response.json()['evidence_id'])
+        self.assertEqual(evidence.sha256_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual(b''.join(evidence.iter_decrypted_chunks()), content)
+        self.assertTrue(evidence.audit_logs.filter(action='Evidence Uploaded').exists())
+        session = UploadSession.objects.get(id=upload_id)
+        self.assertEqual(session.status, 'completed')
+        self.assertFalse(os.path.exists(session.staging_path))
+
+    def test_completing_twice_creates_one_evidence(self):
+        content = os.urandom(150_000)
+        self.client.force_login(self.investigator)
+        upload_id = self.client.post(
+            reverse('evidence:create_upload_session', args=[self.case.case_id]),
+            {'filename': 'disk.img', 'size': len(content), 'description': 'Disk image'},
+        ).json()['upload_id']
+        self.put_chunk(upload_id, 0, content[:100_000])
+        self.put_chunk(upload_id, 1, content[100_000:])
+        url = reverse('evidence:complete_upload_session', args=[upload_id])
+
+        # A request arriving while another one is still ingesting is refused.
+        UploadSession.objects.filter(id=upload_id).update(status='finalizing')
+        self.assertEqual(self.client.post(url).status_code, 409)
+        UploadSession.objects.filter(id=upload_id).update(status='active')
+
+        first = self.client.post(url)
+        second = self.client.post(url)
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertEqual(first.json()['evidence_id'], second.json()['evidence_id'])
+        self.assertEqual(Evidence.objects.filter(case=self.case).count(), 1)
+        self.assertEqual(
+            EvidenceAuditLog.objects.filter(action='Evidence Uploaded', evidence__case=self.case).count(), 1
+        )
@@ -5,13 +5,24 @@ app_name = "evidence"
 
 urlpatterns = [
     path('upload/<str:case_id>/', views.upload_evidence, name='upload'),
+    path('upload/<str:case_id>/batch/', views.batch_upload_evidence, name='batch_upload'),
+    path('uploads/case/<str:case_id>/', views.create_upload_session, name='create_upload_session'),
+    path('uploads/<uuid:upload_id>/', views.upload_session_status, name='upload_session'),
+    path('uploads/<uuid:upload_id>/chunks/<int:index>/', views.upload_session_chunk, name='upload_session_chunk'),
+    path('uploads/<uuid:upload_id>/complete/', views.complete_upload_session, name='complete_upload_session'),
     path('view/<int:evidence_id>/', views.view_evidence, name='view'),
     path('file/<int:evidence_id>/', views.view_evidence_file, name='view_file'),
+    path('preview/<int:evidence_id>/<int:size>/', views.evidence_preview, name='preview'),
     path('download/<int:evidence_id>/', views.download_evidence_file, name='download_file'),
     path('audit/<int:evidence_id>/', views.audit_evidence, name='audit'),
     path('analyze/<int:evidence_id>/', views.analyze_evidence, name='analyze'),
     path('verify/<int:evidence_id>/', views.verify_evidence_integrity, name='verify'),
     path('api/metadata/<int:evidence_id>/', views.evidence_metadata_api, name='metadata_api'),
+    path('api/similar/<int:evidence_id>/', views.similar_evidence_api, name='similar_api'),
+    path('api/merkle/<int:evidence_id>/proof/', views.merkle_proof_api, name='merkle_proof_api'),
+    path('api/merkle/<int:evidence_id>/verify/', views.merkle_verify_api, name='merkle_verify_api'),
+    path('api/search/', views.evidence_search_api, name='search_api'),
+    path('api/geo/', views.evidence_geo_api, name='geo_api'),
     path('api/case/<str:case_id>/', views.case_evidence_list_api, name='case_list_api'),
     path('all/', views.all_evidence, name='all_evidence'),
     path('my/', views.my_evidence, name='my_evidence'),
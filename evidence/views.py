@@ -1,16 +1,67 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.core.exceptions import ValidationError
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse, FileResponse, HttpResponseForbidden
+from django.http import (
+    Http404,
+    JsonResponse,
+    HttpResponse,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
 from django.db.models import Q
 from cases.permissions import role_required, can_upload_evidence
 from cases.models import Case
-from .models import Evidence, EvidenceAuditLog
-from .forms import EvidenceUploadForm
-from custody.models import CaseStorage, EvidenceStorage, CustodyLog
+from .models import Evidence, EvidenceAuditLog, EvidencePreview, ImageFingerprint, UploadSession
+from .forms import BatchEvidenceUploadForm, EvidenceFilterForm, EvidenceUploadForm, detect_media_type
+from . import geo, merkle
+from .batch import BatchEvidenceIngest, detect_archive
+from custody.models import CaseStorage, EvidenceStorage, CustodyLog, StorageLog
+import itertools
 import json
+import math
 import mimetypes
+import os
+import re
+
+from PIL import UnidentifiedImageError
+
+
+def _record_evidence_upload(user, case, evidence):
+    EvidenceAuditLog.log_action(
+        user=user,
+        evidence=evidence,
+        action="Evidence Uploaded",
+        details=f"File: {evidence.original_filename}, SHA256: {evidence.sha256_hash}",
+    )
+
+    case_storage = getattr(case, "storage", None)
+    if case_storage:
+        storage_location = case_storage.storage_locations.first()
+        if storage_location:
+            EvidenceStorage.objects.create(
+                evidence=evidence, storage_location=storage_location
+            )
+
+            StorageLog.log_action(
+                case_storage,
+                user,
+                "upload",
+                f"Evidence {evidence.original_filename} uploaded to {case_storage.storage_name}",
+            )
+
+            CustodyLog.log_action(
+                case=case,
+                evidence=evidence,
+                user=user,
+                action="stored",
+                details=f"Evidence {evidence.original_filename} stored in {case_storage.storage_name}",
+                to_location=storage_location,
+            )
 
 
 @login_required
@@ -28,40 +79,14 @@ def upload_evidence(request, case_id):
             evidence.media_type = form.cleaned_data.get("media_type", "other")
             evidence.save()
 
-            EvidenceAuditLog.log_action(
-                user=request.user,
-                evidence=evidence,
-                action="Evidence Uploaded",
-                details=f"File: {evidence.original_filename}, SHA256: {evidence.sha256_hash}",
-            )
+            _record_evidence_upload(request.user, case, evidence)
 
-            case_storage = getattr(case, "storage", None)
-            if case_storage:
-                storage_location = case_storage.storage_locations.first()
-                if storage_location:
-                    EvidenceStorage.objects.create(
-                        evidence=evidence, storage_location=storage_location
-                    )
-
-                    from custody.models import StorageLog
-
-                    StorageLog.log_action(
-                        case_storage,
-                        request.user,
-                        "upload",
-                        f"Evidence {evidence.original_filename} uploaded to {case_storage.storage_name}",
-                    )
-
-                    CustodyLog.log_action(
-                        case=case,
-                        evidence=evidence,
-                        user=request.user,
-                        action="stored",
-                        details=f"Evidence {evidence.original_filename} stored in {case_storage.storage_name}",
-                        to_location=storage_location,
-                    )
-
-            if not evidence.metadata_valid:
+            if evidence.metadata_status == "pending":
+                messages.success(
+                    request,
+                    "Evidence uploaded successfully. Metadata extraction has been queued",
+                )
+            elif not evidence.metadata_valid:
                 messages.warning(
                     request,
                     f'Evidence uploaded but metadata validation failed: {", ".join(evidence.metadata_issues)}',
@@ -76,8 +101,197 @@ def upload_evidence(request, case_id):
         form = EvidenceUploadForm()
 
     return render(
-        request, "evidence/upload_evidence.html", {"form": form, "case": case}
+        request,
+        "evidence/upload_evidence.html",
+        {
+            "form": form,
+            "case": case,
+            "max_upload_size": settings.EVIDENCE_MAX_UPLOAD_SIZE,
+            "upload_chunk_size": settings.EVIDENCE_UPLOAD_CHUNK_SIZE,
+        },
+    )
+
+
+@login_required
+@can_upload_evidence
+def batch_upload_evidence(request, case_id):
+    case = get_object_or_404(Case, case_id=case_id)
+
+    if request.method == "POST":
+        form = BatchEvidenceUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                with BatchEvidenceIngest(
+                    case, request.user, form.cleaned_data["description"]
+                ) as batch:
+                    for uploaded_file in form.cleaned_data["media"]:
+                        if form.cleaned_data["expand_archives"] and detect_archive(uploaded_file):
+                            batch.add_archive(uploaded_file)
+                        else:
+                            batch.add_upload(uploaded_file)
+                    evidence = batch.run()
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                invalid = sum(1 for item in evidence if not item.metadata_valid)
+                if invalid:
+                    messages.warning(
+                        request,
+                        f"{len(evidence)} evidence files uploaded; {invalid} failed metadata validation",
+                    )
+                else:
+                    messages.success(request, f"{len(evidence)} evidence files uploaded successfully")
+                return redirect("cases:view_case", case_id=case.case_id)
+    else:
+        form = BatchEvidenceUploadForm()
+
+    return render(
+        request,
+        "evidence/batch_upload_evidence.html",
+        {
+            "form": form,
+            "case": case,
+            "max_upload_size": settings.EVIDENCE_MAX_UPLOAD_SIZE,
+            "max_files": settings.EVIDENCE_BATCH_MAX_FILES,
+        },
+    )
+
+
+def _upload_session_state(session):
+    return {
+        "upload_id": str(session.id),
+        "status": session.status,
+        "total_size": session.total_size,
+        "chunk_size": session.chunk_size,
+        "total_chunks": session.total_chunks,
+        "received_bytes": session.received_bytes,
+        "next_chunk": session.next_chunk,
+        "chunk_digests": session.chunk_digests,
+    }
+
+
+def _get_upload_session(request, upload_id):
+    session = get_object_or_404(UploadSession, id=upload_id)
+    if session.user != request.user and not request.user.is_superuser:
+        return None
+    return session
+
+
+@login_required
+@require_http_methods(["POST"])
+@can_upload_evidence
+def create_upload_session(request, case_id):
+    case = get_object_or_404(Case, case_id=case_id)
+
+    filename = request.POST.get("filename", "").strip()
+    description = request.POST.get("description", "").strip()
+    try:
+        total_size = int(request.POST.get("size", ""))
+    except ValueError:
+        return JsonResponse({"error": "A numeric file size is required"}, status=400)
+
+    if not filename or not description:
+        return JsonResponse({"error": "Filename and description are required"}, status=400)
+    if total_size < 0 or total_size > settings.EVIDENCE_MAX_UPLOAD_SIZE:
+        return JsonResponse({"error": "File size is outside the permitted range"}, status=400)
+
+    session = UploadSession.objects.create(
+        case=case,
+        user=request.user,
+        original_filename=os.path.basename(filename),
+        description=description[:255],
+        content_type=request.POST.get("content_type", "")[:100],
+        total_size=total_size,
+        chunk_size=settings.EVIDENCE_UPLOAD_CHUNK_SIZE,
     )
+    return JsonResponse(_upload_session_state(session), status=201)
+
+
+@login_required
+@require_http_methods(["GET", "DELETE"])
+@can_upload_evidence
+def upload_session_status(request, upload_id):
+    session = _get_upload_session(request, upload_id)
+    if session is None:
+        return HttpResponseForbidden("You do not own this upload session.")
+
+    if request.method == "DELETE" and session.status == "active":
+        session.abort()
+    return JsonResponse(_upload_session_state(session))
+
+
+@login_required
+@require_http_methods(["PUT"])
+@can_upload_evidence
+def upload_session_chunk(request, upload_id, index):
+    session = _get_upload_session(request, upload_id)
+    if session is None:
+        return HttpResponseForbidden("You do not own this upload session.")
+
+    claimed_digest = request.headers.get("X-Chunk-SHA256", "").lower()
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if index < session.next_chunk:
+            # The client never saw our acknowledgement; accept the retry if it is the same data.
+            if claimed_digest and claimed_digest != session.chunk_digests[index]:
+                return JsonResponse({"error": f"Chunk {index} differs from the stored chunk"}, status=409)
+            return JsonResponse(_upload_session_state(session))
+
+        try:
+            session.write_chunk(index, request, expected_sha256=claimed_digest)
+        except ValidationError as e:
+            return JsonResponse({"error": " ".join(e.messages), **_upload_session_state(session)}, status=409)
+
+    return JsonResponse(_upload_session_state(session))
+
+
+@login_required
+@require_http_methods(["POST"])
+@can_upload_evidence
+def complete_upload_session(request, upload_id):
+    session = _get_upload_session(request, upload_id)
+    if session is None:
+        return HttpResponseForbidden("You do not own this upload session.")
+
+    try:
+        evidence = session.finalize(
+            detect_media_type(session.content_type, session.original_filename)
+        )
+    except ValidationError as e:
+        if session.status != "completed":
+            return JsonResponse({"error": " ".join(e.messages), **_upload_session_state(session)}, status=409)
+        # A retry of a completion that already succeeded gets the same answer.
+        evidence = session.evidence
+    else:
+        _record_evidence_upload(request.user, session.case, evidence)
+
+    return JsonResponse(
+        {
+            **_upload_session_state(session),
+            "evidence_id": evidence.id,
+            "sha256_hash": evidence.sha256_hash,
+            "md5_hash": evidence.md5_hash,
+            "redirect_url": reverse("cases:view_case", args=[session.case.case_id]),
+        }
+    )
+
+
+def _similar_evidence(user, evidence, max_distance=6):
+    """Near-duplicate images of ``evidence`` that ``user`` may see, nearest first."""
+    fingerprint = getattr(evidence, 'fingerprint', None) if evidence.media_type == 'image' else None
+    if fingerprint is None:
+        return []
+    queryset = ImageFingerprint.objects.all()
+    if user.role == 'regular_user' and not user.is_superuser:
+        queryset = queryset.filter(evidence__case__created_by=user)
+    return [
+        {
+            "evidence": match.evidence,
+            "distance": distance,
+            "identical": match.evidence.sha256_hash == evidence.sha256_hash,
+        }
+        for match, distance in fingerprint.similar(max_distance, queryset=queryset)
+    ]
 
 
 @login_required
@@ -112,7 +326,12 @@ def view_evidence(request, evidence_id):
     return render(
         request,
         "evidence/view_evidence.html",
-        {"evidence": evidence, "audit_logs": audit_logs, "has_analysis": has_analysis},
+        {
+            "evidence": evidence,
+            "audit_logs": audit_logs,
+            "has_analysis": has_analysis,
+            "similar_evidence": _similar_evidence(request.user, evidence),
+        },
     )
 
 
@@ -194,6 +413,297 @@ def case_evidence_list_api(request, case_id):
     return JsonResponse({"evidence": data})
 
 
+@login_required
+@require_http_methods(["GET"])
+@role_required("investigator", "analyst", "admin", "auditor")
+def evidence_search_api(request):
+    filter_form = EvidenceFilterForm(request.GET)
+    if not filter_form.is_valid():
+        return JsonResponse({"errors": filter_form.errors}, status=400)
+    try:
+        limit = min(int(request.GET.get("limit", 100)), 500)
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        return JsonResponse({"error": "limit and offset must be integers"}, status=400)
+
+    evidence_list = filter_form.filter(Evidence.objects.select_related("case"))
+    results = evidence_list.values(
+        "id",
+        "case__case_id",
+        "original_filename",
+        "media_type",
+        "file_format",
+        "file_size",
+        "captured_at",
+        "camera_make",
+        "camera_model",
+        "camera_serial",
+        "software",
+        "pixel_width",
+        "pixel_height",
+        "date_uploaded",
+    )[offset:offset + limit]
+    return JsonResponse(
+        {
+            "count": evidence_list.count(),
+            "results": [
+                {
+                    **{key: value for key, value in item.items() if key != "case__case_id"},
+                    "case_id": item["case__case_id"],
+                }
+                for item in results
+            ],
+        }
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+@role_required("investigator", "analyst", "admin", "auditor")
+def similar_evidence_api(request, evidence_id):
+    evidence = get_object_or_404(Evidence, id=evidence_id)
+
+    try:
+        max_distance = int(request.GET.get("distance", 6))
+    except ValueError:
+        return JsonResponse({"error": "distance must be an integer"}, status=400)
+    if not 0 <= max_distance <= ImageFingerprint.MAX_DISTANCE:
+        return JsonResponse(
+            {"error": f"distance must be between 0 and {ImageFingerprint.MAX_DISTANCE}"}, status=400
+        )
+
+    fingerprint = getattr(evidence, "fingerprint", None)
+    matches = _similar_evidence(request.user, evidence, max_distance)
+    return JsonResponse(
+        {
+            "id": evidence.id,
+            "dhash": fingerprint.dhash if fingerprint else None,
+            "max_distance": max_distance,
+            "similar": [
+                {
+                    "id": match["evidence"].id,
+                    "case_id": match["evidence"].case.case_id,
+                    "original_filename": match["evidence"].original_filename,
+                    "sha256_hash": match["evidence"].sha256_hash,
+                    "distance": match["distance"],
+                    "identical": match["identical"],
+                }
+                for match in matches
+            ],
+        }
+    )
+
+
+def _merkle_tree(evidence):
+    tree = getattr(evidence, "merkle_tree", None)
+    if tree is None or not evidence.merkle_root:
+        return None, JsonResponse({"error": "No Merkle tree is recorded for this evidence"}, status=404)
+    return tree, None
+
+
+def _int_param(params, name):
+    try:
+        return int(params[name]), None
+    except KeyError:
+        return None, JsonResponse({"error": f"{name} is required"}, status=400)
+    except ValueError:
+        return None, JsonResponse({"error": f"{name} must be an integer"}, status=400)
+
+
+@login_required
+@require_http_methods(["GET"])
+@role_required("investigator", "analyst", "admin", "auditor")
+def merkle_proof_api(request, evidence_id):
+    """Inclusion proof for one chunk, checkable against the root without the rest of the file."""
+    evidence = get_object_or_404(Evidence, id=evidence_id)
+    tree, error = _merkle_tree(evidence)
+    if error:
+        return error
+    index, error = _int_param(request.GET, "chunk")
+    if error:
+        return error
+    leaves = tree.leaf_hashes()
+    if not 0 <= index < len(leaves):
+        return JsonResponse({"error": f"chunk must be between 0 and {len(leaves) - 1}"}, status=400)
+
+    start = index * tree.chunk_size
+    return JsonResponse(
+        {
+            "id": evidence.id,
+            "root": evidence.merkle_root,
+            "chunk_size": tree.chunk_size,
+            "leaf_count": len(leaves),
+            "chunk": index,
+            "start": start,
+            "end": max(start, min(start + tree.chunk_size, evidence.file_size) - 1),
+            "leaf": leaves[index].hex(),
+            "proof": [{"hash": sibling.hex(), "side": side} for sibling, side in merkle.proof(leaves, index)],
+        }
+    )
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+@role_required("investigator", "analyst", "admin", "auditor")
+def merkle_verify_api(request, evidence_id):
+    """Verify part of an evidence file against its Merkle root.
+
+    GET with ``start`` and ``end`` decrypts only the chunks covering that byte
+    range of the stored content and reports any that are damaged. POST with a
+    ``chunk`` index and the chunk's bytes as the request body checks that an
+    extracted clip is authentic.
+    """
+    evidence = get_object_or_404(Evidence, id=evidence_id)
+    tree, error = _merkle_tree(evidence)
+    if error:
+        return error
+
+    if request.method == "POST":
+        index, error = _int_param(request.GET, "chunk")
+        if error:
+            return error
+        leaves = tree.leaf_hashes()
+        if not 0 <= index < len(leaves):
+            return JsonResponse({"error": f"chunk must be between 0 and {len(leaves) - 1}"}, status=400)
+        leaf = merkle.leaf_hash(request.body)
+        authentic = merkle.verify_proof(
+            leaf, merkle.proof(leaves, index), bytes.fromhex(evidence.merkle_root)
+        )
+        return JsonResponse({"id": evidence.id, "chunk": index, "leaf": leaf.hex(), "authentic": authentic})
+
+    start, error = _int_param(request.GET, "start")
+    if error:
+        return error
+    end, error = _int_param(request.GET, "end")
+    if error:
+        return error
+    if not 0 <= start <= end < (evidence.file_size or 0):
+        return JsonResponse({"error": "start and end must be a byte range within the evidence"}, status=400)
+
+    try:
+        damaged = evidence.verify_chunks(start, end)
+    except ValueError as exc:
+        return JsonResponse({"id": evidence.id, "verified": False, "error": str(exc)}, status=409)
+
+    span = merkle.chunk_span(start, end, tree.chunk_size)
+    CustodyLog.log_action(
+        evidence=evidence,
+        case=evidence.case,
+        user=request.user,
+        action="verified",
+        details=(
+            f"Merkle check of bytes {start}-{end} (chunks {span.start}-{span.stop - 1}) "
+            f"{'passed' if not damaged else f'FAILED at chunks {damaged}'}. "
+            f"Verified by {request.user.get_full_name()}"
+        ),
+    )
+    return JsonResponse(
+        {
+            "id": evidence.id,
+            "root": evidence.merkle_root,
+            "chunks": [span.start, span.stop - 1],
+            "verified": not damaged,
+            "damaged_chunks": damaged,
+        }
+    )
+
+
+GEO_POINT_LIMIT = 500
+GEO_MAX_CLUSTERS = 256
+GEO_RANGE_CLUSTER_MIN_ROWS = 50_000
+
+
+def _parse_floats(value, count):
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != count or not all(math.isfinite(part) for part in parts):
+        raise ValueError
+    return parts
+
+
+@login_required
+@require_http_methods(["GET"])
+@role_required("investigator", "analyst", "admin", "auditor")
+def evidence_geo_api(request):
+    """Geotagged evidence in a box (``bbox=west,south,east,north``) or circle
+    (``lat``, ``lon``, ``radius_km``). Up to ``GEO_POINT_LIMIT`` matches are
+    returned as points; larger result sets are clustered by geohash cell.
+    """
+    evidence_list = Evidence.objects.filter(geohash__isnull=False)
+    if request.GET.get("case"):
+        evidence_list = evidence_list.filter(case__case_id=request.GET["case"])
+
+    try:
+        if "bbox" in request.GET:
+            west, south, east, north = _parse_floats(request.GET["bbox"], 4)
+            if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+                raise ValueError
+            evidence_list = geo.filter_bbox(evidence_list, south, west, north, east)
+            spans = geo.split_bbox(south, west, north, east)
+        else:
+            latitude, longitude, radius_km = (
+                float(request.GET["lat"]), float(request.GET["lon"]), float(request.GET["radius_km"])
+            )
+            if not geo.valid_coordinates(latitude, longitude) or not 0 < radius_km <= 20000:
+                raise ValueError
+            evidence_list = geo.filter_radius(evidence_list, latitude, longitude, radius_km)
+            spans = geo.split_bbox(*geo.radius_bbox(latitude, longitude, radius_km))
+        precision = request.GET.get("precision")
+        if precision:
+            precision = int(precision)
+        else:
+            precision = min(geo.precision_for(*span, GEO_MAX_CLUSTERS // len(spans)) for span in spans)
+        if not 1 <= precision <= geo.MAX_PRECISION:
+            raise ValueError
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {"error": "Provide bbox=west,south,east,north or lat, lon and radius_km, and a precision of 1-12"},
+            status=400,
+        )
+
+    count = evidence_list.count()
+    if count <= GEO_POINT_LIMIT:
+        points = evidence_list.values(
+            "id", "case__case_id", "original_filename", "media_type", "gps_latitude", "gps_longitude"
+        )
+        return JsonResponse(
+            {
+                "count": count,
+                "points": [
+                    {
+                        "id": point["id"],
+                        "case_id": point["case__case_id"],
+                        "original_filename": point["original_filename"],
+                        "media_type": point["media_type"],
+                        "latitude": point["gps_latitude"],
+                        "longitude": point["gps_longitude"],
+                    }
+                    for point in points
+                ],
+            }
+        )
+
+    cells = None
+    cell_count = sum(geo.cell_count(*span, precision) for span in spans)
+    if count > GEO_RANGE_CLUSTER_MIN_ROWS and cell_count <= geo.MAX_COVER_CELLS:
+        cells = sorted({cell for span in spans for cell in geo.cover(*span, precision=precision)})
+    clusters = geo.cluster(evidence_list, precision, cells)
+    return JsonResponse(
+        {
+            "count": count,
+            "precision": precision,
+            "clusters": [
+                {
+                    "geohash": item["cell"],
+                    "count": item["count"],
+                    "latitude": item["latitude"],
+                    "longitude": item["longitude"],
+                }
+                for item in clusters
+            ],
+        }
+    )
+
+
 @login_required
 @role_required("analyst")
 def analyze_evidence(request, evidence_id):
@@ -251,16 +761,127 @@ def analyze_evidence(request, evidence_id):
 @role_required("analyst", "admin", "custodian")
 def verify_evidence_integrity(request, evidence_id):
     evidence = get_object_or_404(Evidence, id=evidence_id)
+    check = evidence.verify_integrity()
 
     CustodyLog.log_action(
         evidence=evidence,
         case=evidence.case,
         user=request.user,
         action="verified",
-        details=f"Evidence integrity verified by {request.user.get_full_name()}",
+        details=f"{check.summary()}. Verified by {request.user.get_full_name()}",
     )
 
-    return render(request, "evidence/verify_evidence.html", {"evidence": evidence})
+    return render(request, "evidence/verify_evidence.html", {"evidence": evidence, "check": check})
+
+
+def _parse_range_header(range_header, size):
+    """Return ``(start, end)`` for a single ``bytes=`` range, or ``None`` if unusable.
+
+    Raises ``ValueError`` when the range is well-formed but cannot be satisfied.
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header or "")
+    if not match or size is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _decrypted_file_response(request, evidence, disposition):
+    """Stream the decrypted evidence, returning ``(response, (start, end) or None)``."""
+    content_type, _ = mimetypes.guess_type(evidence.original_filename)
+    if content_type is None:
+        content_type = "application/octet-stream"
+
+    size = evidence.plaintext_size
+    try:
+        byte_range = _parse_range_header(request.META.get("HTTP_RANGE"), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response, None
+
+    if byte_range:
+        start, end = byte_range
+        chunks = evidence.iter_decrypted_range(start, end)
+    else:
+        chunks = evidence.iter_decrypted_chunks()
+
+    # Pull the first chunk eagerly so storage or key errors surface before the
+    # response starts; the rest is decrypted as the client reads it.
+    first_chunk = next(chunks, b"")
+
+    response = StreamingHttpResponse(
+        itertools.chain([first_chunk], chunks), content_type=content_type
+    )
+    if byte_range:
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    elif size is not None:
+        response["Content-Length"] = str(size)
+    if size is not None:
+        response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = (
+        f'{disposition}; filename="{evidence.original_filename}"'
+    )
+    return response, byte_range
+
+
+def _is_new_view(request, response, evidence, session_key="viewed_evidence"):
+    """Whether serving ``response`` is the first view of ``evidence`` in this session.
+
+    Players re-request ranges while seeking, so every response that serves
+    content counts, whatever its offset, but repeats within a user's session
+    are logged once.
+    """
+    if response.status_code not in (200, 206):
+        return False
+    viewed = request.session.get(session_key, [])
+    if evidence.pk in viewed:
+        return False
+    request.session[session_key] = viewed + [evidence.pk]
+    return True
+
+
+def _log_view(request, evidence, action, details):
+    EvidenceAuditLog.log_action(user=request.user, evidence=evidence, action=action, details=details)
+    evidence_storage = getattr(evidence, "storage", None)
+    if evidence_storage:
+        evidence_storage.record_access(request.user)
+
+
+@login_required
+@role_required("investigator", "analyst", "admin", "regular_user")
+def evidence_preview(request, evidence_id, size):
+    evidence = get_object_or_404(Evidence.objects.select_related("case"), id=evidence_id)
+
+    if request.user.role == 'regular_user' and request.user != evidence.case.created_by:
+        return HttpResponseForbidden("You are not allowed to view this evidence file!")
+    if size not in EvidencePreview.SIZES or evidence.media_type != "image":
+        raise Http404("No preview available")
+
+    try:
+        preview = EvidencePreview.get_or_generate(evidence, size)
+    except (UnidentifiedImageError, OSError):
+        raise Http404("No preview available")
+
+    response = HttpResponse(preview.read(), content_type="image/jpeg")
+    response["Cache-Control"] = "private, max-age=3600"
+    # Thumbnails fill evidence listings; the large preview shows the content.
+    if size == max(EvidencePreview.SIZES) and _is_new_view(request, response, evidence, "previewed_evidence"):
+        _log_view(request, evidence, "Evidence Preview Viewed", f"File: {evidence.original_filename}, {size}px preview")
+    return response
 
 
 @login_required
@@ -278,28 +899,13 @@ def view_evidence_file(request, evidence_id):
         return HttpResponseForbidden("Auditors cannot view evidence content. Please use the audit view.")
     
     try:
-        decrypted_file = evidence.get_decrypted_file()
-
-        content_type, _ = mimetypes.guess_type(evidence.original_filename)
-        if content_type is None:
-            content_type = "application/octet-stream"
-
-        response = FileResponse(decrypted_file, content_type=content_type)
-
-        response["Content-Disposition"] = (
-            f'inline; filename="{evidence.original_filename}"'
-        )
+        response, byte_range = _decrypted_file_response(request, evidence, "inline")
 
-        EvidenceAuditLog.log_action(
-            user=request.user,
-            evidence=evidence,
-            action="Evidence Viewed",
-            details=f"File: {evidence.original_filename}",
-        )
-
-        evidence_storage = getattr(evidence, "storage", None)
-        if evidence_storage:
-            evidence_storage.record_access(request.user)
+        if _is_new_view(request, response, evidence):
+            details = f"File: {evidence.original_filename}"
+            if byte_range:
+                details += f", bytes {byte_range[0]}-{byte_range[1]}"
+            _log_view(request, evidence, "Evidence Viewed", details)
 
         return response
     except Exception as e:
@@ -321,17 +927,7 @@ def download_evidence_file(request, evidence_id):
         return HttpResponseForbidden("Auditors cannot download evidence content.")
     
     try:
-        decrypted_file = evidence.get_decrypted_file()
-
-        content_type, _ = mimetypes.guess_type(evidence.original_filename)
-        if content_type is None:
-            content_type = "application/octet-stream"
-
-        response = FileResponse(decrypted_file, content_type=content_type)
-
-        response["Content-Disposition"] = (
-            f'attachment; filename="{evidence.original_filename}"'
-        )
+        response, _ = _decrypted_file_response(request, evidence, "attachment")
 
         EvidenceAuditLog.log_action(
             user=request.user,
@@ -361,12 +957,13 @@ def download_evidence_file(request, evidence_id):
 @login_required
 @role_required("admin", "auditor", "analyst")
 def all_evidence(request):
-    evidence_list = Evidence.objects.select_related('case', 'uploaded_by').all().order_by("-date_uploaded")
+    filter_form = EvidenceFilterForm(request.GET)
+    evidence_list = filter_form.filter(Evidence.objects.select_related('case', 'uploaded_by'))
     
     return render(
         request,
         "evidence/all_evidence.html",
-        {"evidence_list": evidence_list, "is_superuser": request.user.is_superuser}
+        {"evidence_list": evidence_list, "filter_form": filter_form, "is_superuser": request.user.is_superuser}
     )
 
 
@@ -172,7 +172,7 @@ def analyst_dashboard(request):
         'submitted_reports': submitted_reports,
         'total_submitted': total_submitted,
         'pending_review': pending_review[:10],
-        'cases_in_analysis': cases_in_analysis[:10],
+        'cases_in_analysis': Case.decrypt_many(cases_in_analysis[:10]),
         'recent_evidence': recent_evidence,
     }
     return render(request, 'reports/analyst_dashboard.html', context)
@@ -209,7 +209,7 @@ def user_case_reports(request):
     ).select_related('case', 'evidence', 'created_by').order_by('-created_at')
     
     context = {
-        'cases': cases,
+        'cases': Case.decrypt_many(cases, fields=['case_title']),
         'reports': reports,
     }
     return render(request, 'reports/user_case_reports.html', context)
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from .models import Posting, SearchDocument, SearchTerm
+
+
+@admin.register(SearchTerm)
+class SearchTermAdmin(admin.ModelAdmin):
+    list_display = ['id', 'digest', 'document_count']
+    search_fields = ['digest']
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'object_id', 'case', 'length']
+    list_filter = ['kind']
+
+
+@admin.register(Posting)
+class PostingAdmin(admin.ModelAdmin):
+    list_display = ['id', 'term', 'document', 'frequency']
+    raw_id_fields = ['term', 'document']
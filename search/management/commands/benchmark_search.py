@@ -0,0 +1,82 @@
+import itertools
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from cases.models import Case
+from search.models import Posting, SearchDocument, SearchTerm
+from search.tokenizer import term_digest
+
+
+class Command(BaseCommand):
+    help = "Time search queries against a synthetic index of Zipf-distributed words (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--documents", type=int, default=20000)
+        parser.add_argument("--terms-per-document", type=int, default=100)
+        parser.add_argument("--vocabulary", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        vocabulary = options["vocabulary"]
+        cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary + 1)))
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            user = get_user_model().objects.create_user(
+                email="benchmark-search@example.invalid",
+                first_name="Benchmark",
+                last_name="User",
+                password=None,
+                role="regular_user",
+            )
+            case = Case.objects.create(
+                case_title="Benchmark", case_description="", case_category="Cybercrime", created_by=user
+            )
+            terms = SearchTerm.objects.bulk_create(
+                SearchTerm(digest=term_digest(f"w{rank}")) for rank in range(vocabulary)
+            )
+            documents = SearchDocument.objects.bulk_create(
+                SearchDocument(kind="report", object_id=n, case=case, length=options["terms_per_document"])
+                for n in range(options["documents"])
+            )
+            postings = 0
+            batch = []
+            for document in documents:
+                words = rng.choices(range(vocabulary), cum_weights=cum_weights, k=options["terms_per_document"])
+                for rank, frequency in Counter(words).items():
+                    batch.append(Posting(term=terms[rank], document=document, frequency=frequency))
+                if len(batch) >= 50000:
+                    postings += len(Posting.objects.bulk_create(batch))
+                    batch = []
+            postings += len(Posting.objects.bulk_create(batch))
+            counts = Posting.objects.filter(term=OuterRef("pk")).order_by().values("term").annotate(n=Count("pk")).values("n")
+            SearchTerm.objects.update(document_count=Coalesce(Subquery(counts), 0))
+            self.stdout.write(
+                f"Built {options['documents']} documents, {postings} postings in {time.perf_counter() - started:.1f}s"
+            )
+
+            queries = [
+                ("rare word", "w20000"),
+                ("two mid-frequency words", "w300 w700"),
+                ("common + rare word", "w0 w5000"),
+                ("three common words", "w0 w1 w2"),
+                ("absent word", "w0 nosuchword"),
+            ]
+            self.stdout.write(f"{'query':<26}{'terms':>18}{'hits':>7}{'best ms':>10}")
+            for label, text in queries:
+                timings = []
+                for _ in range(5):
+                    started = time.perf_counter()
+                    hits = SearchDocument.search(text)
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(f"{label:<26}{text:>18}{len(hits):>7}{min(timings) * 1000:>10.1f}")
+
+            transaction.set_rollback(True)
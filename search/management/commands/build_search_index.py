@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from cases.models import Case
+from reports.models import AnalysisReport
+from search.models import Posting, SearchDocument, SearchTerm, report_text
+
+
+class Command(BaseCommand):
+    help = "Index the descriptions of all cases and the text of all analysis reports for search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Drop the index first, e.g. after changing CASE_BLIND_INDEX_KEY or SECRET_KEY",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            Posting.objects.all().delete()
+            SearchDocument.objects.all().delete()
+            SearchTerm.objects.all().delete()
+
+        # Indexing is incremental, so documents that are already current cost
+        # one read of their postings and no writes.
+        cases = Case.objects.order_by("pk")
+        indexed = 0
+        last_pk = 0
+        while True:
+            batch = Case.decrypt_many(cases.filter(pk__gt=last_pk)[: options["batch_size"]], ["case_description"])
+            if not batch:
+                break
+            for case in batch:
+                SearchDocument.index("case", case.pk, case.pk, case.get_description())
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Indexed {indexed} case(s)")
+
+        reports = 0
+        for report in AnalysisReport.objects.order_by("pk").iterator():
+            SearchDocument.index("report", report.pk, report.case_id, report_text(report))
+            reports += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} case(s) and {reports} report(s)"))
@@ -0,0 +1,192 @@
+import math
+
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from cases.fields import Ciphertext
+from cases.models import Case
+from reports.models import AnalysisReport
+
+from . import tokenizer
+
+# BM25 parameters: term frequency saturation and document length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class SearchTerm(models.Model):
+    """A keyed hash of one normalized word or number, with the number of documents containing it."""
+
+    digest = models.CharField(max_length=64, unique=True)
+    document_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Term {self.digest[:12]} in {self.document_count} document(s)"
+
+
+class SearchDocument(models.Model):
+    KIND_CHOICES = [
+        ("case", "Case description"),
+        ("report", "Analysis report"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="search_documents")
+    length = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["kind", "object_id"]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_id} ({self.length} terms)"
+
+    @classmethod
+    def index(cls, kind, object_id, case_id, text):
+        """Bring the postings of one document in line with ``text``.
+
+        Only terms that were added, removed or changed frequency are written, so
+        editing a sentence of a long report touches a handful of rows.
+        """
+        frequencies = tokenizer.document_terms(text)
+        with transaction.atomic():
+            document, created = cls.objects.get_or_create(
+                kind=kind, object_id=object_id, defaults={"case_id": case_id}
+            )
+            current = {} if created else dict(document.postings.values_list("term__digest", "frequency"))
+
+            removed = current.keys() - frequencies.keys()
+            if removed:
+                terms = SearchTerm.objects.filter(digest__in=removed)
+                Posting.objects.filter(document=document, term__in=terms).delete()
+                terms.update(document_count=F("document_count") - 1)
+
+            added = frequencies.keys() - current.keys()
+            if added:
+                SearchTerm.objects.bulk_create([SearchTerm(digest=d) for d in added], ignore_conflicts=True)
+                term_ids = dict(SearchTerm.objects.filter(digest__in=added).values_list("digest", "id"))
+                Posting.objects.bulk_create(
+                    Posting(term_id=term_ids[d], document=document, frequency=frequencies[d]) for d in added
+                )
+                SearchTerm.objects.filter(id__in=term_ids.values()).update(document_count=F("document_count") + 1)
+
+            changed = {}
+            for d in frequencies.keys() & current.keys():
+                if frequencies[d] != current[d]:
+                    changed.setdefault(frequencies[d], []).append(d)
+            for frequency, digests in changed.items():
+                Posting.objects.filter(document=document, term__digest__in=digests).update(frequency=frequency)
+
+            length = sum(frequencies.values())
+            if document.length != length or document.case_id != case_id:
+                document.length = length
+                document.case_id = case_id
+                document.save(update_fields=["length", "case"])
+        return document
+
+    @classmethod
+    def remove(cls, documents):
+        for document in documents:
+            SearchTerm.objects.filter(postings__document=document).update(document_count=F("document_count") - 1)
+            document.delete()
+
+    @classmethod
+    def search(cls, text, documents=None, limit=50):
+        """Documents containing every term of ``text``, as ``(document, score)`` with the best BM25 score first.
+
+        Candidates come from the postings of the rarest query term, so a query
+        costs about as much as that term's posting list however common the
+        others are. ``documents`` restricts the results, e.g. to cases a user
+        may see.
+        """
+        digests = tokenizer.query_terms(text)
+        if not digests:
+            return []
+        terms = list(SearchTerm.objects.filter(digest__in=digests, document_count__gt=0).order_by("document_count"))
+        if len(terms) < len(digests):
+            return []
+
+        stats = cls.objects.aggregate(total=Count("id"), average_length=Avg("length"))
+        idf = {
+            term.id: math.log(1 + (stats["total"] - term.document_count + 0.5) / (term.document_count + 0.5))
+            for term in terms
+        }
+        term_weight = models.Case(
+            *(When(term_id=term_id, then=Value(weight)) for term_id, weight in idf.items()),
+            output_field=FloatField(),
+        )
+        frequency = Cast("frequency", FloatField())
+        length_norm = Value(BM25_K1 * (1 - BM25_B)) + Value(
+            BM25_K1 * BM25_B / max(stats["average_length"] or 1, 1)
+        ) * Cast("document__length", FloatField())
+
+        postings = Posting.objects.filter(
+            term__in=terms,
+            document__in=Posting.objects.filter(term=terms[0]).values("document"),
+        )
+        if documents is not None:
+            postings = postings.filter(document__in=documents.values("pk"))
+        rows = list(
+            postings.values("document")
+            .annotate(
+                matched=Count("term"),
+                score=Sum(term_weight * frequency * Value(BM25_K1 + 1) / (frequency + length_norm)),
+            )
+            .filter(matched=len(terms))
+            .order_by("-score", "document")[:limit]
+        )
+        found = cls.objects.in_bulk([row["document"] for row in rows])
+        return [(found[row["document"]], row["score"]) for row in rows]
+
+
+class Posting(models.Model):
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name="postings")
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name="postings")
+    frequency = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ["term", "document"]
+
+    def __str__(self):
+        return f"{self.term} in {self.document} x{self.frequency}"
+
+
+REPORT_TEXT_FIELDS = ["title", "content", "findings", "recommendations"]
+
+
+def report_text(report):
+    return "\n".join(getattr(report, name) or "" for name in REPORT_TEXT_FIELDS)
+
+
+@receiver(pre_save, sender=Case)
+def note_case_description(sender, instance, update_fields=None, **kwargs):
+    # The description is encrypted during save, so its plaintext is only
+    # available now, and only if it was assigned since the case was loaded.
+    description = instance.case_description
+    if not isinstance(description, Ciphertext) and (update_fields is None or "case_description" in update_fields):
+        instance._search_description = description
+
+
+@receiver(post_save, sender=Case)
+def index_case_description(sender, instance, **kwargs):
+    if "_search_description" in instance.__dict__:
+        SearchDocument.index("case", instance.pk, instance.pk, instance.__dict__.pop("_search_description"))
+
+
+@receiver(post_save, sender=AnalysisReport)
+def index_analysis_report(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & {*REPORT_TEXT_FIELDS, "case"}:
+        SearchDocument.index("report", instance.pk, instance.case_id, report_text(instance))
+
+
+@receiver(pre_delete, sender=Case)
+def unindex_case(sender, instance, **kwargs):
+    SearchDocument.remove(SearchDocument.objects.filter(case=instance))
+
+
+@receiver(pre_delete, sender=AnalysisReport)
+def unindex_analysis_report(sender, instance, **kwargs):
+    SearchDocument.remove(SearchDocument.objects.filter(kind="report", object_id=instance.pk))
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from cases.models import Case
+from reports.models import AnalysisReport
+
+from .models import Posting, SearchDocument, SearchTerm
+from .tokenizer import query_terms
+
+User = get_user_model()
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(
+            email='creator@test.com',
+            first_name='Cara',
+            last_name='Creator',
+            password='testpass123',
+            role='regular_user',
+            is_active=True,
+            verified=True,
+        )
+        self.case = Case.objects.create(
+            case_title='Extortion',
+            case_description='The caller used the alias Night Owl and the number +1 (555) 010-4477.',
+            case_category='Cybercrime',
+            created_by=self.creator,
+        )
+        self.other = Case.objects.create(
+            case_title='Fraud',
+            case_description='Invoices were sent from an account linked to Night Hawk.',
+            case_category='Fraud and Financial Crimes',
+            created_by=self.creator,
+        )
+        self.report = AnalysisReport.objects.create(
+            case=self.other,
+            title='Call records',
+            content='Night Owl called 555.010.4477 three times. Night Owl, night owl.',
+        )
+
+    def hits(self, text, documents=None):
+        return [(document.kind, document.object_id) for document, _ in SearchDocument.search(text, documents)]
+
+    def test_terms_are_matched_and_ranked(self):
+        self.assertEqual(self.hits('night owl'), [('report', self.report.pk), ('case', self.case.pk)])
+        self.assertEqual(self.hits('NIGHT hawk'), [('case', self.other.pk)])
+        self.assertEqual(self.hits('night owl hawk'), [])
+        both = {('case', self.case.pk), ('report', self.report.pk)}
+        self.assertEqual(set(self.hits('555-010-4477')), both)
+        self.assertEqual(set(self.hits('+1 555 010 4477')), {('case', self.case.pk)})
+        self.assertEqual(set(self.hits('010 4477')), both)
+        self.assertEqual(self.hits('night owl', SearchDocument.objects.filter(kind='case')), [('case', self.case.pk)])
+        self.assertFalse(SearchTerm.objects.filter(digest='owl').exists())
+
+    def test_index_follows_edits_and_deletes(self):
+        case = Case.objects.get(pk=self.case.pk)
+        case.case_status = 'Under Review'
+        case.save()
+        case.case_description = 'The caller used the alias Grey Fox.'
+        case.save()
+        self.assertEqual(self.hits('grey fox'), [('case', self.case.pk)])
+        self.assertEqual(self.hits('night owl'), [('report', self.report.pk)])
+
+        self.report.delete()
+        self.assertEqual(self.hits('night owl'), [])
+        self.assertEqual(
+            SearchTerm.objects.get(digest__in=query_terms('night')).document_count,
+            Posting.objects.filter(term__digest__in=query_terms('night')).count(),
+        )
+
+    def test_investigators_only_see_assigned_cases(self):
+        investigator = User.objects.create_user(
+            email='investigator@test.com',
+            first_name='Ivy',
+            last_name='Investigator',
+            password='testpass123',
+            role='investigator',
+            is_active=True,
+            verified=True,
+        )
+        self.case.assigned_investigators.add(investigator)
+        self.client.force_login(investigator)
+        response = self.client.get(reverse('search:search'), {'q': 'night owl'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['object'] for result in response.context['results']], [self.case])
@@ -0,0 +1,54 @@
+"""Turns case and report text into the keyed-hash terms stored in the search index.
+
+Words are NFKC-normalized and casefolded, as for the case title blind index.
+Runs of 7 to 15 digits broken up by spaces, dots, dashes, slashes or brackets
+are also indexed as one number, so a phone number matches however it was
+written. Documents index every trailing part of at least 7 digits, so a search
+without the country or area code still finds the number.
+"""
+
+import re
+from collections import Counter
+
+from cases.blind_index import digest, normalize
+
+WORD_PATTERN = re.compile(r"\w+")
+NUMBER_PATTERN = re.compile(r"\+?\d[\d\s().\-/]*\d")
+MIN_NUMBER_DIGITS = 7
+MAX_NUMBER_DIGITS = 15
+
+
+def _numbers(text):
+    for match in NUMBER_PATTERN.finditer(text):
+        digits = re.sub(r"\D", "", match.group())
+        if MIN_NUMBER_DIGITS <= len(digits) <= MAX_NUMBER_DIGITS:
+            yield match, digits
+
+
+def term_digest(term):
+    return digest("search", term)
+
+
+def document_terms(text):
+    """``{term digest: occurrences}`` for a document's text."""
+    text = normalize(text or "")
+    terms = Counter(WORD_PATTERN.findall(text))
+    for _, digits in _numbers(text):
+        for start in range(len(digits) - MIN_NUMBER_DIGITS + 1):
+            terms["#" + digits[start:]] += 1
+    return {term_digest(term): count for term, count in terms.items()}
+
+
+def query_terms(text):
+    """The distinct term digests a document must contain to match ``text``.
+
+    A number in the query is matched only as a whole, not by its digit groups.
+    """
+    text = normalize(text or "")
+    terms = set()
+    remainder = text
+    for match, digits in _numbers(text):
+        terms.add("#" + digits)
+        remainder = remainder.replace(match.group(), " ")
+    terms.update(WORD_PATTERN.findall(remainder))
+    return {term_digest(term) for term in terms}
@@ -0,0 +1,30 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from cases.models import Case
+from cases.permissions import role_required
+from reports.models import AnalysisReport
+
+from .models import SearchDocument
+
+
+@login_required
+@role_required("analyst", "investigator", "admin", "auditor")
+def search(request):
+    query = request.GET.get("q", "").strip()
+    results = []
+    if query:
+        documents = SearchDocument.objects.all()
+        if request.user.role == "investigator" and not request.user.is_superuser:
+            documents = documents.filter(case__in=Case.objects.filter(assigned_investigators=request.user))
+        hits = SearchDocument.search(query, documents)
+
+        ids = {kind: [document.object_id for document, _ in hits if document.kind == kind] for kind, _ in SearchDocument.KIND_CHOICES}
+        cases = {case.pk: case for case in Case.decrypt_many(Case.objects.filter(pk__in=ids["case"]))}
+        reports = AnalysisReport.objects.select_related("case").in_bulk(ids["report"])
+        for document, score in hits:
+            target = (cases if document.kind == "case" else reports).get(document.object_id)
+            if target is not None:
+                results.append({"kind": document.kind, "label": document.get_kind_display(), "object": target, "score": score})
+
+    return render(request, "search/search.html", {"query": query, "results": results})